@@ -0,0 +1,124 @@
+"""
+Event loop and client glue for each benchmarked backend. Backends are only
+imported when selected, so a missing optional dependency only skips that
+backend.
+"""
+from gremlinclient.testing import FakeGremlinServer
+
+
+class Backend(object):
+    """
+    A client implementation driven by its event loop, with a fake Gremlin
+    Server listening on the same loop.
+    """
+    name = None
+
+    def __init__(self):
+        #: Module providing ``submit``, ``create_connection`` and ``Pool``
+        self.client = None
+        #: Keyword arguments passed to every client call
+        self.kwargs = {}
+        self.server = FakeGremlinServer()
+
+    def future(self):
+        raise NotImplementedError
+
+    def run(self, factory):
+        """
+        Run the loop until the future returned by ``factory`` is done.
+
+        :returns: The future's result
+        """
+        raise NotImplementedError
+
+    def versions(self):
+        return {}
+
+
+class TornadoBackend(Backend):
+    name = "tornado"
+
+    def __init__(self):
+        super(TornadoBackend, self).__init__()
+        import tornado
+        from tornado.concurrent import Future
+        from tornado.ioloop import IOLoop
+        from gremlinclient import tornado_client
+        from gremlinclient.testing.tornado_server import listen
+        self._tornado = tornado
+        self._future_class = Future
+        self._loop = IOLoop.current()
+        self.client = tornado_client
+        listen(self.server)
+
+    def future(self):
+        return self._future_class()
+
+    def run(self, factory):
+        return self._loop.run_sync(factory)
+
+    def versions(self):
+        return {"tornado": self._tornado.version}
+
+
+class AsyncioBackend(Backend):
+    """
+    The Tornado client on an asyncio event loop, with asyncio futures.
+    """
+    name = "asyncio"
+
+    def __init__(self):
+        super(AsyncioBackend, self).__init__()
+        import asyncio
+        import tornado
+        from tornado.platform.asyncio import AsyncIOMainLoop
+        from gremlinclient import tornado_client
+        from gremlinclient.testing.tornado_server import listen
+        AsyncIOMainLoop().install()
+        self._tornado = tornado
+        self._loop = asyncio.get_event_loop()
+        self._future_class = asyncio.Future
+        self.client = tornado_client
+        self.kwargs = {"loop": self._loop, "future_class": asyncio.Future}
+        listen(self.server)
+
+    def future(self):
+        return self._future_class(loop=self._loop)
+
+    def run(self, factory):
+        return self._loop.run_until_complete(factory())
+
+    def versions(self):
+        return {"tornado": self._tornado.version}
+
+
+class AiohttpBackend(Backend):
+    name = "aiohttp"
+
+    def __init__(self):
+        super(AiohttpBackend, self).__init__()
+        import asyncio
+        import aiohttp
+        from gremlinclient import aiohttp_client
+        from gremlinclient.testing.aiohttp_server import listen
+        self._aiohttp = aiohttp
+        self._loop = asyncio.get_event_loop()
+        self._future_class = asyncio.Future
+        self.client = aiohttp_client
+        self.kwargs = {"loop": self._loop}
+        self._loop.run_until_complete(listen(self.server, loop=self._loop))
+
+    def future(self):
+        return self._future_class(loop=self._loop)
+
+    def run(self, factory):
+        return self._loop.run_until_complete(factory())
+
+    def versions(self):
+        return {"aiohttp": self._aiohttp.__version__}
+
+
+BACKENDS = {
+    "tornado": TornadoBackend,
+    "asyncio": AsyncioBackend,
+    "aiohttp": AiohttpBackend}
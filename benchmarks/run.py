@@ -0,0 +1,241 @@
+"""
+Client benchmarks against the in-process fake Gremlin Server.
+
+Measures requests per second, latency percentiles and memory allocated per
+request for each backend, scenario, concurrency, result size and number of
+206 frames per response. Results are written as JSON so runs can be
+compared between releases::
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --compare baseline.json
+
+Each backend runs in its own process. The fake server shares the client's
+event loop, so latencies include its (small) share of the work.
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import subprocess
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import gremlinclient
+from gremlinclient.connection import _now
+
+from benchmarks.backends import BACKENDS
+from benchmarks.scenarios import SCENARIOS, SCRIPT, run_requests
+
+
+def percentile(latencies, q):
+    """
+    Nearest rank percentile of sorted latencies
+
+    :param list latencies: Sorted latencies
+    :param float q: Percentile, between 0 and 100
+    """
+    if not latencies:
+        return None
+    rank = int(round(q / 100.0 * (len(latencies) - 1)))
+    return latencies[rank]
+
+
+def bench(backend, scenario_class, concurrency, size, chunks, requests,
+          warmup, mem_requests):
+    backend.server.frame_size = max(1, -(-size // chunks))
+    backend.server.script(SCRIPT, list(range(size)))
+    scenario = scenario_class(backend, concurrency)
+    backend.run(scenario.setup)
+    try:
+        if warmup:
+            backend.run(lambda: run_requests(scenario, warmup))
+        gc.collect()
+        start = _now()
+        latencies = backend.run(lambda: run_requests(scenario, requests))
+        elapsed = _now() - start
+        memory = {}
+        if tracemalloc is not None and mem_requests:
+            # separate pass, tracing slows everything down
+            gc.collect()
+            tracemalloc.start()
+            backend.run(lambda: run_requests(scenario, mem_requests))
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory = {"peak_bytes_per_request": peak // mem_requests,
+                      "retained_bytes_per_request": current // mem_requests}
+    finally:
+        scenario.teardown()
+    latencies.sort()
+    result = {"backend": backend.name,
+              "scenario": scenario_class.name,
+              "concurrency": concurrency,
+              "result_size": size,
+              "chunks": chunks,
+              "requests": requests,
+              "elapsed": elapsed,
+              "rps": requests / elapsed,
+              "p50": percentile(latencies, 50),
+              "p90": percentile(latencies, 90),
+              "p99": percentile(latencies, 99),
+              "max": latencies[-1]}
+    result.update(memory)
+    return result
+
+
+def run_backend(args):
+    backend = BACKENDS[args.backend]()
+    backend.server.latency = args.latency
+    results = []
+    for scenario in args.scenarios:
+        for concurrency in args.concurrency:
+            for size in args.sizes:
+                for chunks in args.chunks:
+                    if chunks > max(size, 1):
+                        continue
+                    result = bench(backend, SCENARIOS[scenario], concurrency,
+                                   size, chunks, args.requests, args.warmup,
+                                   args.mem_requests)
+                    results.append(result)
+                    print(format_result(result), file=sys.stderr)
+    return {"versions": backend.versions(), "results": results}
+
+
+def run_all(args):
+    # One process per backend: they install different event loops, and
+    # memory stays comparable
+    report = {"meta": meta(args), "results": [], "skipped": {}}
+    for name in args.backends:
+        argv = [sys.executable, "-m", "benchmarks.run", "--backend", name]
+        argv.extend(forward_args(args))
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE)
+        out, _ = proc.communicate()
+        if proc.returncode:
+            report["skipped"][name] = "exit status {}".format(
+                proc.returncode)
+            continue
+        data = json.loads(out.decode("utf-8"))
+        report["meta"]["versions"].update(data["versions"])
+        report["results"].extend(data["results"])
+    return report
+
+
+def meta(args):
+    return {"date": datetime.datetime.utcnow().isoformat() + "Z",
+            "gremlinclient": gremlinclient.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "server_latency": args.latency,
+            "versions": {}}
+
+
+def forward_args(args):
+    return ["--scenarios", ",".join(args.scenarios),
+            "--concurrency", ",".join(map(str, args.concurrency)),
+            "--sizes", ",".join(map(str, args.sizes)),
+            "--chunks", ",".join(map(str, args.chunks)),
+            "--requests", str(args.requests),
+            "--warmup", str(args.warmup),
+            "--mem-requests", str(args.mem_requests),
+            "--latency", str(args.latency)]
+
+
+def key(result):
+    return (result["backend"], result["scenario"], result["concurrency"],
+            result["result_size"], result["chunks"])
+
+
+def format_result(result):
+    return ("{backend:8} {scenario:13} c={concurrency:<4} "
+            "size={result_size:<6} chunks={chunks:<3} "
+            "{rps:9.1f} req/s  p50={p50_ms:7.3f}ms  "
+            "p99={p99_ms:7.3f}ms  peak={peak}B/req").format(
+                p50_ms=result["p50"] * 1000, p99_ms=result["p99"] * 1000,
+                peak=result.get("peak_bytes_per_request", "-"), **result)
+
+
+def compare(report, baseline, threshold):
+    """
+    Print the change of each result against a previous report.
+
+    :returns: Number of results whose throughput dropped by more than
+        ``threshold``, or whose p99 grew by more than ``threshold``
+    """
+    previous = dict((key(r), r) for r in baseline["results"])
+    regressions = 0
+    for result in report["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        rps = result["rps"] / old["rps"] - 1
+        p99 = result["p99"] / old["p99"] - 1 if old["p99"] else 0.0
+        regressed = rps < -threshold or p99 > threshold
+        regressions += regressed
+        print("{} {} {} {} {}: rps {:+.1%} p99 {:+.1%}{}".format(
+            *key(result) + (rps, p99, "  REGRESSION" if regressed else "")),
+            file=sys.stderr)
+    return regressions
+
+
+def int_list(value):
+    return [int(v) for v in value.split(",")]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        help="Run a single backend in this process and "
+                             "write its raw results to stdout")
+    parser.add_argument("--backends", default="tornado,asyncio,aiohttp",
+                        type=lambda v: v.split(","))
+    parser.add_argument("--scenarios", default=",".join(sorted(SCENARIOS)),
+                        type=lambda v: v.split(","))
+    parser.add_argument("--concurrency", default="1,16,64", type=int_list)
+    parser.add_argument("--sizes", default="1,100,1000", type=int_list,
+                        help="Result items per response")
+    parser.add_argument("--chunks", default="1,4", type=int_list,
+                        help="Frames per response")
+    parser.add_argument("--requests", default=1000, type=int)
+    parser.add_argument("--warmup", default=100, type=int)
+    parser.add_argument("--mem-requests", default=200, type=int,
+                        help="Requests traced with tracemalloc, 0 to skip")
+    parser.add_argument("--latency", default=0.0, type=float,
+                        help="Seconds the fake server waits per response")
+    parser.add_argument("--output", help="Write the JSON report to a file")
+    parser.add_argument("--compare", help="Previous JSON report")
+    parser.add_argument("--threshold", default=0.1, type=float,
+                        help="Relative change reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.backend:
+        json.dump(run_backend(args), sys.stdout)
+        return 0
+    report = run_all(args)
+    data = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(data)
+    else:
+        print(data)
+    for name, reason in sorted(report["skipped"].items()):
+        print("Skipped {}: {}".format(name, reason), file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
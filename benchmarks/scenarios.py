@@ -0,0 +1,161 @@
+"""
+Request patterns measured by the benchmarks. They only use the futures
+returned by the client, so the same code drives every backend.
+"""
+import functools
+
+from gremlinclient.connection import _now
+
+
+SCRIPT = "bench"
+
+
+def _then(backend, future, callback):
+    # Future resolving to callback(result), or to the result of the future
+    # callback returns
+    chained = backend.future()
+
+    def on_result(value):
+        if hasattr(value, "add_done_callback"):
+            value.add_done_callback(on_done)
+        else:
+            chained.set_result(value)
+
+    def on_done(f):
+        try:
+            result = f.result()
+        except Exception as e:
+            chained.set_exception(e)
+        else:
+            on_result(result)
+
+    def on_source(f):
+        try:
+            value = callback(f.result())
+        except Exception as e:
+            chained.set_exception(e)
+        else:
+            on_result(value)
+
+    future.add_done_callback(on_source)
+    return chained
+
+
+class Scenario(object):
+    """
+    One way of sending a request. :py:meth:`request` returns a future
+    resolving once the whole response was read and the connection released.
+    """
+    name = None
+
+    def __init__(self, backend, concurrency):
+        self.backend = backend
+        self.concurrency = concurrency
+
+    def setup(self):
+        """
+        :returns: Future resolved once the scenario is ready
+        """
+        future = self.backend.future()
+        future.set_result(None)
+        return future
+
+    def request(self):
+        raise NotImplementedError
+
+    def teardown(self):
+        pass
+
+
+class Submit(Scenario):
+    """Module level ``submit``, on its default pool"""
+    name = "submit"
+
+    def request(self):
+        client = self.backend.client
+        stream = client.submit(self.backend.server.url, SCRIPT,
+                               **self.backend.kwargs)
+        return _then(self.backend, stream, lambda s: s.read_all())
+
+
+class ConnectSend(Scenario):
+    """``create_connection`` and ``send``, then close"""
+    name = "connect_send"
+
+    def request(self):
+        client = self.backend.client
+        future_conn = client.create_connection(self.backend.server.url,
+                                               **self.backend.kwargs)
+
+        def send(conn):
+            def close(messages):
+                conn.close()
+                return messages
+            return _then(self.backend, conn.send(SCRIPT).read_all(), close)
+
+        return _then(self.backend, future_conn, send)
+
+
+class PoolSend(Scenario):
+    """``Pool.acquire`` and ``send``, then release"""
+    name = "pool_send"
+
+    def setup(self):
+        self.pool = self.backend.client.Pool(self.backend.server.url,
+                                             maxsize=self.concurrency,
+                                             minsize=self.concurrency,
+                                             **self.backend.kwargs)
+        return self.pool.warm()
+
+    def request(self):
+        pool = self.pool
+
+        def send(conn):
+            def release(messages):
+                pool.release(conn)
+                return messages
+            return _then(self.backend, conn.send(SCRIPT).read_all(), release)
+
+        return _then(self.backend, pool.acquire(), send)
+
+    def teardown(self):
+        self.pool.close()
+
+
+SCENARIOS = dict((cls.name, cls) for cls in (Submit, ConnectSend, PoolSend))
+
+
+def run_requests(scenario, total):
+    """
+    Send ``total`` requests keeping ``scenario.concurrency`` in flight.
+
+    :returns: Future resolving to the latency of each request in seconds
+    """
+    future = scenario.backend.future()
+    latencies = []
+    state = {"started": 0, "finished": 0}
+
+    def launch():
+        while (state["started"] < total and
+               state["started"] - state["finished"] < scenario.concurrency):
+            state["started"] += 1
+            scenario.request().add_done_callback(
+                functools.partial(on_done, _now()))
+
+    def on_done(start, f):
+        state["finished"] += 1
+        if future.done():
+            return
+        try:
+            f.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        latencies.append(_now() - start)
+        if state["finished"] == total:
+            future.set_result(latencies)
+        else:
+            launch()
+
+    launch()
+    return future
@@ -1,3 +1,4 @@
+from gremlinclient.cluster import ClusterPool
 from gremlinclient.connection import Stream
 from gremlinclient.graph import GraphDatabase
 from gremlinclient.pool import Pool
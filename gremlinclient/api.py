@@ -1,23 +1,78 @@
-def _submit(url,
+import weakref
+
+
+#: Seconds the module level ``submit`` waits for a connection when its
+#: pool is full, e.g. because streams that were never read to the end
+#: still hold every connection
+DEFAULT_ACQUIRE_TIMEOUT = 30
+
+
+class _DefaultPools(object):
+    """
+    Process wide registry of the pools behind the module level ``submit``,
+    one per url, credentials and event loop. Pools are weakly keyed by
+    their loop, and forgotten once the loop is closed.
+    """
+    def __init__(self):
+        # loop -> {key: pool}
+        self._pools = weakref.WeakKeyDictionary()
+
+    def get(self, loop, key, factory):
+        # pools hold their loop, drop them explicitly once it is closed
+        for closed in [l for l in self._pools.keys() if _loop_closed(l)]:
+            del self._pools[closed]
+        pools = self._pools.get(loop)
+        if pools is None:
+            pools = self._pools[loop] = {}
+        pool = pools.get(key)
+        if pool is None or pool.closed:
+            pool = pools[key] = factory()
+        return pool
+
+    def pools(self):
+        """
+        :returns: list of ``(key, pool)`` pairs
+        """
+        return [item for pools in list(self._pools.values())
+                for item in pools.items()]
+
+    def pop_all(self):
+        """
+        Forget every pool, for the caller to close them.
+
+        :returns: list of ``(key, pool)`` pairs
+        """
+        pools = self.pools()
+        self._pools = weakref.WeakKeyDictionary()
+        return pools
+
+
+def _loop_closed(loop):
+    # asyncio loops, and tornado >= 5 IOLoops wrapping one
+    loop = getattr(loop, "asyncio_loop", loop)
+    is_closed = getattr(loop, "is_closed", None)
+    if is_closed is not None:
+        return is_closed()
+    # tornado < 5 PollIOLoop
+    return getattr(loop, "_closing", False)
+
+
+def _submit(pool,
             gremlin,
-            graph,
             bindings=None,
             lang="gremlin-groovy",
             aliases=None,
             op="eval",
             processor="",
-            timeout=None,
             session=None,
-            loop=None,
-            username="",
-            password="",
-            future_class=None):
+            acquire_timeout=None):
     """
-    Submit a script to the Gremlin Server.
+    Submit a script to the Gremlin Server on a pooled connection. The pool
+    must force release, so the connection goes back to the pool once the
+    stream was read or closed.
 
-    :param str url: url for Gremlin Server.
+    :param gremlinclient.pool.Pool pool: Pool to acquire a connection from
     :param str gremlin: Gremlin script to submit to server.
-    :param class graph: GraphDatabase object used to make connection.
     :param dict bindings: A mapping of bindings for Gremlin script.
     :param str lang: Language of scripts submitted to the server.
         "gremlin-groovy" by default
@@ -25,36 +80,31 @@ def _submit(url,
         objects to different variable names in the current request
     :param str op: Gremlin Server op argument. "eval" by default.
     :param str processor: Gremlin Server processor argument. "" by default.
-    :param float timeout: timeout for establishing connection (optional).
-        Values ``0`` or ``None`` mean no timeout
     :param str session: Session id (optional). Typically a uuid
-    :param loop: If param is ``None``, :py:meth:`tornado.ioloop.IOLoop.current`
-        is used for getting default event loop (optional)
-    :param str username: Username for SASL auth
-    :param str password: Password for SASL auth
-    :param class future_class: type of Future -
-        :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
-        :py:class:`tornado.concurrent.Future`
+    :param float acquire_timeout: Seconds to wait for a connection when the
+        pool is full (optional)
 
     :returns: :py:class:`gremlinclient.connection.Stream` object:
     """
-    future_class = graph.future_class
-    future = future_class()
-    future_conn = graph.connect(force_close=True)
+    future = pool.future_class()
 
-    def on_connect(f):
+    def on_acquire(f):
         try:
             conn = f.result()
         except Exception as e:
             future.set_exception(e)
-        else:
+            return
+        try:
             stream = conn.send(gremlin, bindings=bindings, lang=lang,
                                aliases=aliases, op=op, processor=processor,
-                               session=session, timeout=timeout)
+                               session=session)
+        except Exception as e:
+            pool.release(conn)
+            future.set_exception(e)
+        else:
             future.set_result(stream)
 
-    future_conn.add_done_callback(on_connect)
-
+    pool.acquire(timeout=acquire_timeout).add_done_callback(on_acquire)
     return future
 
 
@@ -0,0 +1,247 @@
+import itertools
+
+from gremlinclient.connection import _now
+from gremlinclient.log import pool_logger
+from gremlinclient.retry import RetryPolicy
+
+
+# Adds a chunk of vertices and edges passed as the ``_items`` binding.
+# Items with "out" and "in" keys are edges between existing vertex ids.
+BULK_SCRIPT = """_n = 0
+for (_item in _items) {
+  def _element
+  if (_item.containsKey('out')) {
+    _element = g.V(_item['out']).next().addEdge(
+      _item['label'], g.V(_item['in']).next())
+  } else if (_item.containsKey('id')) {
+    _element = graph.addVertex(T.label, _item['label'] ?: 'vertex',
+                               T.id, _item['id'])
+  } else {
+    _element = graph.addVertex(T.label, _item['label'] ?: 'vertex')
+  }
+  _item['properties']?.each { _k, _v -> _element.property(_k, _v) }
+  _n++
+}
+_n"""
+
+
+class BulkStats(object):
+    """
+    Progress of a :py:meth:`BulkLoader.load` run.
+    """
+    def __init__(self):
+        #: Items loaded
+        self.items = 0
+        #: Chunks loaded
+        self.chunks = 0
+        #: Chunk retries after a failure
+        self.retries = 0
+        #: Items in chunks that still failed after all retries
+        self.failed = 0
+        #: Errors of the chunks that failed after all retries
+        self.errors = []
+        self._started = _now()
+        self._finished = None
+
+    @property
+    def elapsed(self):
+        """
+        Seconds since the load started, until it finished
+
+        :returns: float
+        """
+        return (self._finished or _now()) - self._started
+
+    @property
+    def rate(self):
+        """
+        Items loaded per second
+
+        :returns: float
+        """
+        elapsed = self.elapsed
+        if not elapsed:
+            return 0.0
+        return self.items / elapsed
+
+    def as_dict(self):
+        return {"items": self.items,
+                "chunks": self.chunks,
+                "retries": self.retries,
+                "failed": self.failed,
+                "elapsed": self.elapsed,
+                "rate": self.rate}
+
+    def _finish(self):
+        self._finished = _now()
+
+
+class BulkLoader(object):
+    """
+    Loads a stream of vertices and edges through a pool. Items are grouped
+    into chunks sent as a single parameterised script, and at most
+    ``concurrency`` chunks are in flight at once: the item iterator is only
+    advanced when there is room for another chunk.
+
+    Vertices are dicts with an optional ``"label"``, ``"id"`` and
+    ``"properties"`` mapping. Edges also have ``"out"`` and ``"in"`` ids of
+    existing vertices.
+
+    Failed chunks are retried as allowed by
+    :py:meth:`gremlinclient.retry.RetryPolicy.should_retry`: always if the
+    chunk never reached the server, otherwise only for transient errors
+    and if ``idempotent`` is set. Other failures are counted in the stats
+    right away.
+
+    :param gremlinclient.pool.Pool pool: Pool used to send chunks
+    :param int chunk_size: Items per script. 500 by default
+    :param int concurrency: Maximum number of chunks in flight. 4 by
+        default
+    :param int retries: Times a failed chunk is sent again. 3 by default
+    :param float retry_delay: Seconds before the first retry, doubling
+        after each one. 0.5 by default
+    :param str script: Script loading the ``_items`` binding (optional).
+        Defaults to :py:data:`BULK_SCRIPT`
+    :param progress: Callable receiving the
+        :py:class:`gremlinclient.bulk.BulkStats` after each chunk
+        (optional). If it raises, the load fails with its error
+    :param bool idempotent: Chunks may safely be loaded twice, so they can
+        be sent again after they reached the server. False by default:
+        :py:data:`BULK_SCRIPT` would add the vertices again
+    :param gremlinclient.retry.RetryPolicy retry_policy: Overrides
+        ``retries`` and ``retry_delay`` (optional)
+    """
+    def __init__(self, pool, chunk_size=500, concurrency=4, retries=3,
+                 retry_delay=0.5, script=BULK_SCRIPT, progress=None,
+                 idempotent=False, retry_policy=None):
+        self._pool = pool
+        self._chunk_size = chunk_size
+        self._concurrency = concurrency
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                retries=retries, backoff=retry_delay,
+                max_backoff=retry_delay * 2 ** retries, jitter=False)
+        self._retry_policy = retry_policy
+        self._idempotent = idempotent
+        self._script = script
+        self._progress = progress
+
+    def load(self, items):
+        """
+        Load all items.
+
+        :param items: Iterable of vertex and edge dicts
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to the
+            :py:class:`gremlinclient.bulk.BulkStats` once every chunk was
+            loaded or failed
+        """
+        future = self._pool.future_class()
+        stats = BulkStats()
+        chunks = self._chunks(items)
+        state = {"inflight": 0, "exhausted": False, "filling": False}
+
+        def fill():
+            # Reentrant calls from chunks completing immediately are picked
+            # up by the loop below
+            if state["filling"] or future.done():
+                return
+            state["filling"] = True
+            try:
+                while (state["inflight"] < self._concurrency and
+                       not state["exhausted"]):
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration:
+                        state["exhausted"] = True
+                    else:
+                        state["inflight"] += 1
+                        send(chunk, 0)
+            except Exception as e:
+                stats._finish()
+                future.set_exception(e)
+                return
+            finally:
+                state["filling"] = False
+            if state["exhausted"] and not state["inflight"]:
+                stats._finish()
+                future.set_result(stats)
+
+        def send(chunk, attempt):
+            self._send(chunk, lambda error, sent: on_chunk(
+                chunk, attempt, error, sent))
+
+        def on_chunk(chunk, attempt, error, sent):
+            policy = self._retry_policy
+            if error is not None:
+                if (not self._pool.closed and not future.done() and
+                        policy.should_retry(error, attempt, sent,
+                                            self._idempotent)):
+                    stats.retries += 1
+                    delay = policy.delay(attempt)
+                    pool_logger.warning(
+                        "Bulk chunk failed, retrying in {} seconds: {}".format(
+                            delay, error))
+                    self._pool.graph.call_later(delay, send, chunk,
+                                                attempt + 1)
+                    return
+                stats.failed += len(chunk)
+                stats.errors.append(error)
+            else:
+                stats.items += len(chunk)
+                stats.chunks += 1
+            state["inflight"] -= 1
+            if self._progress is not None:
+                try:
+                    self._progress(stats)
+                except Exception as e:
+                    if not future.done():
+                        stats._finish()
+                        future.set_exception(e)
+                    return
+            fill()
+
+        fill()
+        return future
+
+    def _chunks(self, items):
+        items = iter(items)
+        while True:
+            chunk = list(itertools.islice(items, self._chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _send(self, chunk, callback):
+        # Send one chunk on a pooled connection and read the whole response.
+        # callback receives the error, if any, and whether the chunk was
+        # written to the server.
+        def on_acquire(f):
+            try:
+                conn = f.result()
+            except Exception as e:
+                callback(e, False)
+                return
+
+            def on_read(f):
+                if not conn._force_release:
+                    self._pool.release(conn)
+                try:
+                    f.result()
+                except Exception as e:
+                    callback(e, True)
+                else:
+                    callback(None, True)
+
+            try:
+                stream = conn.send(self._script, bindings={"_items": chunk})
+            except Exception as e:
+                # no stream to release it
+                self._pool.release(conn)
+                callback(e, False)
+            else:
+                stream.read_all().add_done_callback(on_read)
+
+        self._pool.acquire().add_done_callback(on_acquire)
@@ -0,0 +1,377 @@
+import collections
+import copy
+import hashlib
+import json
+
+from gremlinclient.connection import Session, _now
+from gremlinclient.response import _copy_future
+
+
+def _request_session(conn, processor, session):
+    # The processor and session a request is sent with on conn. A Session
+    # always uses its own.
+    if isinstance(conn, Session):
+        return "session", conn._session
+    if session is None:
+        session = conn._session
+    return processor, session
+
+
+def _send(conn, gremlin, bindings, lang, aliases, op, processor, session,
+          timeout, handler):
+    if isinstance(conn, Session):
+        return conn.send(gremlin, bindings=bindings, lang=lang,
+                         aliases=aliases, op=op, timeout=timeout,
+                         handler=handler)
+    return conn.send(gremlin, bindings=bindings, lang=lang, aliases=aliases,
+                     op=op, processor=processor, session=session,
+                     timeout=timeout, handler=handler)
+
+
+def make_key(gremlin, bindings=None, lang="gremlin-groovy", aliases=None,
+             op="eval", processor="", session=None, prefix=""):
+    """
+    Canonical cache key of a request. Equal scripts with equal bindings
+    and aliases get the same key, whatever the order of the mappings.
+    Requests of different sessions get different keys.
+
+    :param str prefix: Prepended to the hash, so the entry can be dropped
+        with :py:meth:`ResultCache.invalidate_prefix`. "" by default
+
+    :returns: str
+    """
+    canonical = json.dumps([gremlin, bindings or {}, lang, aliases or {},
+                            op, processor, session],
+                           sort_keys=True, separators=(",", ":"),
+                           default=repr)
+    return prefix + hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class CachedStream(object):
+    """
+    Stream-like view of a fully read response, returned by
+    :py:meth:`ResultCache.send`. Supports :py:meth:`read` and
+    :py:meth:`read_all` like :py:class:`gremlinclient.connection.Stream`.
+
+    :param future: Future resolving to the list of messages
+    :param class future_class: type of Future -
+        :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+        :py:class:`tornado.concurrent.Future`
+    """
+    def __init__(self, future, future_class):
+        self._messages = future
+        self._future_class = future_class
+        self._index = 0
+
+    def read(self):
+        """
+        Read the next message, ``None`` once all were read.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future`
+        """
+        future = self._future_class()
+
+        def on_messages(f):
+            try:
+                messages = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                if self._index < len(messages):
+                    self._index += 1
+                    future.set_result(messages[self._index - 1])
+                else:
+                    future.set_result(None)
+
+        self._on_messages(on_messages)
+        return future
+
+    def read_all(self):
+        """
+        Read all remaining messages.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a list of
+            messages
+        """
+        future = self._future_class()
+
+        def on_messages(f):
+            try:
+                messages = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                remaining = messages[self._index:]
+                self._index = len(messages)
+                future.set_result(remaining)
+
+        self._on_messages(on_messages)
+        return future
+
+    def _on_messages(self, callback):
+        if self._messages.done():
+            callback(self._messages)
+        else:
+            self._messages.add_done_callback(callback)
+
+
+class ResultCache(object):
+    """
+    Client side cache of fully read responses, for idempotent read scripts.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry
+    is evicted once ``maxsize`` entries are stored. Failed requests are
+    never cached, and neither are requests with a handler unless given an
+    explicit key. After a write, drop stale entries with
+    :py:meth:`invalidate`, :py:meth:`invalidate_prefix` or
+    :py:meth:`invalidate_tag`.
+
+    :param int maxsize: Maximum number of cached responses. 1024 by default
+    :param float ttl: Seconds an entry stays valid. 60 by default
+    :param bool copy: Hand out deep copies of cached messages, so callers
+        modifying results don't change the entry. True by default; pass
+        False to share them if results are treated as read only
+    :param clock: Callable returning the current time in seconds
+        (optional). A monotonic clock by default
+    """
+    def __init__(self, maxsize=1024, ttl=60, copy=True, clock=None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._copy = copy
+        self._clock = clock or _now
+        # key -> (expiry, messages, tags), least recently used first
+        self._entries = collections.OrderedDict()
+        # tag -> keys
+        self._tags = collections.defaultdict(set)
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        """
+        :returns: int
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        :returns: int
+        """
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def get(self, key):
+        """
+        Cached messages for ``key``, or ``None``
+
+        :param str key: Cache key
+        :returns: list
+        """
+        messages = self._lookup(key)
+        if messages is not None and self._copy:
+            messages = copy.deepcopy(messages)
+        return messages
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            self._remove(key)
+            return None
+        # mark as most recently used
+        del self._entries[key]
+        self._entries[key] = entry
+        return entry[1]
+
+    def set(self, key, messages, ttl=None, tags=()):
+        """
+        Store the messages of a response.
+
+        :param str key: Cache key
+        :param list messages: Messages read from the response
+        :param float ttl: Seconds the entry stays valid. The cache's ttl by
+            default
+        :param tags: Tags used with :py:meth:`invalidate_tag`
+        """
+        if key in self._entries:
+            self._remove(key)
+        if ttl is None:
+            ttl = self._ttl
+        tags = frozenset(tags)
+        if self._copy:
+            messages = copy.deepcopy(messages)
+        self._entries[key] = (self._clock() + ttl, messages, tags)
+        for tag in tags:
+            self._tags[tag].add(key)
+        while len(self._entries) > self._maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key):
+        """
+        Drop one entry
+
+        :param str key: Cache key
+        """
+        if key in self._entries:
+            self._remove(key)
+
+    def invalidate_prefix(self, prefix):
+        """
+        Drop all entries whose key starts with ``prefix``. Useful with
+        explicit, structured keys such as ``"person:42:"``, or with the
+        ``prefix`` given to :py:meth:`send`
+
+        :param str prefix: Key prefix
+        """
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._remove(key)
+
+    def invalidate_tag(self, tag):
+        """
+        Drop all entries stored with ``tag``
+
+        :param tag: Tag given to :py:meth:`send` or :py:meth:`set`
+        """
+        for key in list(self._tags.get(tag, ())):
+            self._remove(key)
+
+    def clear(self):
+        """
+        Drop all entries
+        """
+        self._entries.clear()
+        self._tags.clear()
+
+    def send(self, conn, gremlin, bindings=None, lang="gremlin-groovy",
+             aliases=None, op="eval", processor="", session=None,
+             timeout=None, handler=None, key=None, ttl=None, tags=(),
+             prefix=""):
+        """
+        Send a message using a connection, unless a cached response exists.
+        On a miss the response is read in full and cached if it succeeds.
+        Requests with a handler and no ``key`` bypass the cache, since the
+        handler's results can't be told apart.
+
+        :param gremlinclient.connection.Connection conn: Connection used on
+            a miss. A :py:class:`gremlinclient.connection.Session` sends with
+            its own processor and session
+        :param str gremlin: Gremlin script to submit to server.
+        :param dict bindings: A mapping of bindings for Gremlin script.
+        :param str lang: Language of scripts submitted to the server.
+            "gremlin-groovy" by default
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str op: Gremlin Server op argument. "eval" by default.
+        :param str processor: Gremlin Server processor argument. "" by
+            default.
+        :param str session: Session id (optional). Typically a uuid
+        :param float timeout: Deadline in seconds for reading the whole
+            response (optional). Values ``0`` or ``None`` mean no deadline
+        :param handler: Handler function to process server response
+        :param str key: Cache key. :py:func:`make_key` of the request by
+            default
+        :param float ttl: Seconds the entry stays valid. The cache's ttl by
+            default
+        :param tags: Tags used with :py:meth:`invalidate_tag`
+        :param str prefix: Prefix of the default key. "" by default
+
+        :returns: :py:class:`gremlinclient.cache.CachedStream` object
+        """
+        future_class = conn._future_class
+        future = future_class()
+        processor, session = _request_session(conn, processor, session)
+        if key is None and handler is not None:
+            _send(conn, gremlin, bindings, lang, aliases, op, processor,
+                  session, timeout, handler).read_all().add_done_callback(
+                lambda f: _copy_future(f, future))
+            return CachedStream(future, future_class)
+        if key is None:
+            key = make_key(gremlin, bindings, lang, aliases, op, processor,
+                           session, prefix)
+        messages = self.get(key)
+        if messages is not None:
+            self._hits += 1
+            conn._finish()
+            future.set_result(messages)
+            return CachedStream(future, future_class)
+        self._misses += 1
+        stream = _send(conn, gremlin, bindings, lang, aliases, op, processor,
+                       session, timeout, handler)
+
+        def on_read(f):
+            try:
+                messages = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                self.set(key, messages, ttl=ttl, tags=tags)
+                future.set_result(messages)
+
+        stream.read_all().add_done_callback(on_read)
+        return CachedStream(future, future_class)
+
+    def submit(self, graph, gremlin, bindings=None, lang="gremlin-groovy",
+               aliases=None, op="eval", processor="", session=None,
+               timeout=None, key=None, ttl=None, tags=(), prefix=""):
+        """
+        Submit a script to the Gremlin Server, unless a cached response
+        exists. A connection is only opened on a miss.
+
+        :param gremlinclient.graph.GraphDatabase graph: Graph used to
+            connect on a miss
+        :param str gremlin: Gremlin script to submit to server.
+
+        Other parameters are the same as :py:meth:`send`.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a
+            :py:class:`gremlinclient.cache.CachedStream`
+        """
+        if key is None:
+            key = make_key(gremlin, bindings, lang, aliases, op, processor,
+                           session, prefix)
+        future_class = graph.future_class
+        future = future_class()
+        messages = self.get(key)
+        if messages is not None:
+            self._hits += 1
+            cached = future_class()
+            cached.set_result(messages)
+            future.set_result(CachedStream(cached, future_class))
+            return future
+
+        def on_connect(f):
+            try:
+                conn = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(self.send(
+                    conn, gremlin, bindings=bindings, lang=lang,
+                    aliases=aliases, op=op, processor=processor,
+                    session=session, timeout=timeout, key=key, ttl=ttl,
+                    tags=tags))
+
+        graph.connect(force_close=True).add_done_callback(on_connect)
+        return future
+
+    def _remove(self, key):
+        expiry, messages, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
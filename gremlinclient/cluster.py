@@ -0,0 +1,270 @@
+from gremlinclient.connection import _now
+from gremlinclient.exceptions import NoHostAvailableError, PoolError
+from gremlinclient.log import pool_logger
+
+
+LEAST_OUTSTANDING = "least_outstanding"
+LATENCY = "latency"
+
+
+class Host(object):
+    """
+    State of one Gremlin Server in a
+    :py:class:`gremlinclient.cluster.ClusterPool`.
+
+    :param str url: url for Gremlin Server.
+    :param gremlinclient.pool.Pool pool: Pool of connections to the host
+    """
+    # weight of the latest sample in the latency moving average
+    ALPHA = 0.3
+
+    def __init__(self, url, pool):
+        self._url = url
+        self._pool = pool
+        self._failures = 0
+        self._retry_at = 0
+        self._probing = False
+        self._latency = None
+        pool.add_listener(self._on_pool_event)
+
+    @property
+    def url(self):
+        """
+        :returns: str
+        """
+        return self._url
+
+    @property
+    def pool(self):
+        """
+        :returns: :py:class:`gremlinclient.pool.Pool`
+        """
+        return self._pool
+
+    @property
+    def up(self):
+        """
+        False after a connection failure, until a probe succeeds
+
+        :returns: bool
+        """
+        return not self._failures
+
+    @property
+    def failures(self):
+        """
+        Consecutive connection failures
+
+        :returns: int
+        """
+        return self._failures
+
+    @property
+    def latency(self):
+        """
+        Moving average of the time connections to this host are held, in
+        seconds. ``None`` until a connection was released
+
+        :returns: float
+        """
+        return self._latency
+
+    @property
+    def outstanding(self):
+        """
+        Acquisitions from this host not yet released
+
+        :returns: int
+        """
+        return self._pool.outstanding
+
+    def available(self, now):
+        return self.up or (not self._probing and now >= self._retry_at)
+
+    def as_dict(self):
+        return {"up": self.up,
+                "failures": self._failures,
+                "retry_in": max(0.0, self._retry_at - _now()),
+                "latency": self._latency,
+                "outstanding": self.outstanding,
+                "pool": self._pool.stats.as_dict()}
+
+    def _mark_up(self):
+        if self._failures:
+            pool_logger.info("Host {} is back up".format(self._url))
+        self._failures = 0
+        self._retry_at = 0
+
+    def _mark_down(self, backoff, max_backoff):
+        self._failures += 1
+        delay = min(backoff * 2 ** (self._failures - 1), max_backoff)
+        self._retry_at = _now() + delay
+        pool_logger.warning(
+            "Host {} marked down, retrying in {} seconds".format(
+                self._url, delay))
+
+    def _on_pool_event(self, pool, event, value):
+        if event == "release":
+            if self._latency is None:
+                self._latency = value
+            else:
+                self._latency += self.ALPHA * (value - self._latency)
+
+
+class ClusterPool(object):
+    """
+    Balances connections over several Gremlin Servers, one
+    :py:class:`gremlinclient.pool.Pool` per server.
+
+    Hosts that fail to provide a connection are marked down and skipped.
+    Once their backoff expired, a single acquire probes the host again; the
+    backoff doubles after each failed probe.
+
+    :param list pools: :py:class:`gremlinclient.pool.Pool` objects, one per
+        host
+    :param str strategy: ``"least_outstanding"`` picks the host with the
+        fewest unreleased acquisitions. ``"latency"`` weights that count by
+        how long the host's connections are held. Ties go round robin.
+        "least_outstanding" by default
+    :param float backoff: Seconds a host stays down after its first
+        failure. 1 by default
+    :param float max_backoff: Upper bound for the backoff in seconds.
+        60 by default
+    """
+    def __init__(self, pools, strategy=LEAST_OUTSTANDING, backoff=1,
+                 max_backoff=60):
+        if strategy not in (LEAST_OUTSTANDING, LATENCY):
+            raise ValueError("Unknown strategy.")
+        if not pools:
+            raise ValueError("ClusterPool needs at least one pool.")
+        self._hosts = [Host(pool.graph.url, pool) for pool in pools]
+        self._strategy = strategy
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._future_class = pools[0].future_class
+        self._next = 0
+        self._closed = False
+
+    @property
+    def hosts(self):
+        """
+        :returns: list of :py:class:`gremlinclient.cluster.Host`
+        """
+        return list(self._hosts)
+
+    @property
+    def closed(self):
+        """
+        Check if pool has been closed
+
+        :returns: bool
+        """
+        return self._closed
+
+    @property
+    def future_class(self):
+        """
+        :return: :py:class:`type`
+            Concrete class of the future instances created by this pool
+        """
+        return self._future_class
+
+    def stats(self):
+        """
+        Per host stats
+
+        :returns: dict mapping each url to a dict of stats
+        """
+        return dict((host.url, host.as_dict()) for host in self._hosts)
+
+    def acquire(self, timeout=None, priority=0):
+        """
+        Acquire a connection from the best available host, failing over to
+        the next host if a connection can't be opened.
+
+        :param float timeout: Seconds to wait for a connection when the
+            chosen host's pool is full (optional)
+        :param int priority: When the pool is full, waiters with lower
+            values are served first. 0 by default
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future`
+        """
+        future = self._future_class()
+        if self._closed:
+            future.set_exception(RuntimeError("ClusterPool has been closed"))
+        else:
+            self._acquire(future, timeout, priority, set(), None)
+        return future
+
+    def release(self, conn):
+        """
+        Release a connection back to the pool of its host.
+
+        :param gremlinclient.connection.Connection: The connection to be
+            released
+        """
+        for host in self._hosts:
+            if conn in host.pool._acquired:
+                return host.pool.release(conn)
+        return conn.close()
+
+    def close(self):
+        """
+        Close the pool of every host
+        """
+        for host in self._hosts:
+            host.pool.close()
+        self._closed = True
+
+    def _acquire(self, future, timeout, priority, tried, error):
+        host = self._select(tried)
+        if host is None:
+            message = "No Gremlin Server host is available"
+            if error is not None:
+                message = "{}: {}".format(message, error)
+            future.set_exception(NoHostAvailableError(message))
+            return
+        tried.add(host)
+        probing = not host.up
+        if probing:
+            host._probing = True
+
+        def cb(f):
+            if probing:
+                host._probing = False
+            try:
+                conn = f.result()
+            except PoolError as e:
+                # the host is healthy but busy
+                future.set_exception(e)
+            except Exception as e:
+                host._mark_down(self._backoff, self._max_backoff)
+                self._acquire(future, timeout, priority, tried, e)
+            else:
+                host._mark_up()
+                future.set_result(conn)
+
+        host.pool.acquire(timeout, priority).add_done_callback(cb)
+
+    def _select(self, tried):
+        now = _now()
+        # rotate the hosts so ties are broken round robin
+        self._next = (self._next + 1) % len(self._hosts)
+        hosts = self._hosts[self._next:] + self._hosts[:self._next]
+        candidates = [host for host in hosts
+                      if host not in tried and host.available(now)]
+        if not candidates:
+            return None
+        if self._strategy == LATENCY:
+            return min(candidates, key=lambda host: (
+                (host.outstanding + 1) * (host.latency or 0)))
+        return min(candidates, key=lambda host: host.outstanding)
+
+    def __enter__(self):
+        raise RuntimeError(
+                "context manager should use some variation of yield/yield from")
+
+    def __exit__(self, *args):
+        pass  # pragma: no cover
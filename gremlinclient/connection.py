@@ -1,15 +1,178 @@
 import base64
 import collections
+import functools
+import time
 import uuid
+
+from gremlinclient.exceptions import (
+    GremlinConnectionError, RequestTimeoutError, error_for_status)
+from gremlinclient.ids import RequestIdGenerator
+from gremlinclient.log import connection_logger
+from gremlinclient.parameterize import Parameterizer
+from gremlinclient.response import _copy_future
+from gremlinclient.serializer import JSONSerializer, get_serializer
+
 try:
-    import ujson as json
-except ImportError:
-    import json
+    StopAsyncIteration
+except NameError:
+    class StopAsyncIteration(Exception):
+        pass
+
+
+class Message(object):
+    """
+    A response message. Keeps the decoded frame and reads ``status_code``,
+    ``data``, ``message`` and ``metadata`` from it on access, instead of
+    copying them into a new object per frame. Behaves like the
+    ``(status_code, data, message, metadata)`` tuple it replaces: it can be
+    unpacked, indexed and compared to tuples.
+
+    :param int status_code: Status code of the response
+    :param list data: Result items
+    :param str message: Status message
+    :param dict metadata: Result meta, ``None`` if skipped
+    """
+    __slots__ = ("_frame",)
+
+    _fields = ("status_code", "data", "message", "metadata")
+
+    def __init__(self, status_code, data, message, metadata):
+        self._frame = {
+            "status": {"code": status_code, "message": message},
+            "result": {"data": data, "meta": metadata}
+        }
+
+    @classmethod
+    def _from_frame(cls, frame):
+        self = cls.__new__(cls)
+        self._frame = frame
+        return self
+
+    @property
+    def status_code(self):
+        """
+        :returns: int
+        """
+        return self._frame["status"]["code"]
+
+    @property
+    def data(self):
+        """
+        :returns: list
+        """
+        return self._frame["result"]["data"]
+
+    @property
+    def message(self):
+        """
+        :returns: str
+        """
+        return self._frame["status"]["message"]
+
+    @property
+    def metadata(self):
+        """
+        :returns: dict
+        """
+        return self._frame["result"].get("meta")
+
+    def _asdict(self):
+        return collections.OrderedDict(zip(self._fields, self))
+
+    def __iter__(self):
+        status = self._frame["status"]
+        result = self._frame["result"]
+        return iter((status["code"], result["data"], status["message"],
+                     result.get("meta")))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (Message, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __reduce__(self):
+        return (Message, tuple(self))
+
+    def __repr__(self):
+        return ("Message(status_code={!r}, data={!r}, message={!r}, "
+                "metadata={!r})").format(*self)
+
+
+#: Result of one script of :py:meth:`Connection.send_batch`. ``data`` is the
+#: list of results, ``error`` the exception the script failed with or None
+BatchResult = collections.namedtuple("BatchResult", ["data", "error"])
+
 
+# Runs each merged script in its own closure, binding its variables from its
+# indexed bindings, and reports a [data, error] pair per script
+_BATCH_SCRIPT = """_batch = [{closures}]
+_batch.collect {{ _f ->
+  def _r
+  try {{
+    def _v = _f()
+    if (_v instanceof Iterator) {{ _v = _v.toList() }}
+    else if (_v instanceof Collection) {{ _v = new ArrayList(_v) }}
+    else {{ _v = [_v] }}
+    _r = [_v, null]
+  }} catch (Throwable _e) {{
+    _r = [null, _e.toString()]
+  }}
+  _r
+}}"""
 
-Message = collections.namedtuple(
-    "Message",
-    ["status_code", "data", "message", "metadata"])
+
+def _merge_batch(items):
+    # Merge (gremlin, bindings) pairs into one script with indexed bindings
+    closures = []
+    bindings = {}
+    for i, (gremlin, item_bindings) in enumerate(items):
+        name = "_b{}".format(i)
+        bindings[name] = item_bindings or {}
+        params = "".join("def {0} = {1}['{0}']; ".format(key, name)
+                         for key in sorted(bindings[name]))
+        closures.append("{{ -> {0}\n{1}\n}}".format(params, gremlin))
+    return _BATCH_SCRIPT.format(closures=", ".join(closures)), bindings
+
+
+def _batch_items(items):
+    # Accept bare scripts as well as (gremlin, bindings) pairs
+    return [tuple(item) if isinstance(item, (tuple, list)) else (item, None)
+            for item in items]
+
+
+def _message_data(messages):
+    data = []
+    for message in messages:
+        if message.data is not None:
+            data.extend(message.data)
+    return data
+
+
+# Used by send(parameterize=True) on connections without a parameterizer
+_default_parameterizer = Parameterizer()
+
+
+# Monotonic clock where available
+_now = getattr(time, "monotonic", time.time)
+
+
+# Frames at least this big are decoded in the decode executor, if any
+DECODE_THRESHOLD = 1024 * 1024
 
 
 class Connection(object):
@@ -33,10 +196,36 @@ class Connection(object):
     :param gremlinclient.pool.Pool pool: Connection pool. None by default
     :param bool force_release: If possible, force release to pool after read.
     :param str session: Session id (optional). Typically a uuid
+    :param bool multiplex: Share the websocket between concurrent requests.
+        Incoming frames are routed to their stream by ``requestId``.
+    :param gremlinclient.serializer.Serializer serializer: Serializer for
+        requests and responses. JSON by default
+    :param decode_executor: :py:class:`concurrent.futures.Executor` used to
+        decode large response frames off the event loop (optional)
+    :param int decode_threshold: Minimum frame size in bytes decoded with
+        ``decode_executor``
+    :param gremlinclient.tracing.Tracer tracer: Receives timing hooks for
+        every request (optional)
+    :param gremlinclient.parameterize.Parameterizer parameterizer: If set,
+        literals of Groovy scripts sent are moved to bindings (optional)
+    :param float request_timeout: Default deadline in seconds for reading a
+        whole response (optional)
+    :param gremlinclient.graph.GraphDatabase graph: Graph that opened the
+        connection, used to schedule deadlines (optional)
+    :param request_ids: Callable returning a new request id, such as a
+        :py:class:`gremlinclient.ids.RequestIdGenerator` (optional)
+    :param bool skip_meta: Leave the result meta out of responses, so
+        ``Message.metadata`` is ``None``. GraphBinary frames skip it without
+        decoding it, JSON frames are parsed whole and it is dropped
+        afterwards. False by default
     """
     def __init__(self, conn, future_class, timeout=None, username="",
                  password="", loop=None, force_close=False,
-                 pool=None, force_release=False, session=None):
+                 pool=None, force_release=False, session=None,
+                 multiplex=False, serializer=None, decode_executor=None,
+                 decode_threshold=DECODE_THRESHOLD, tracer=None,
+                 parameterizer=None, request_timeout=None, graph=None,
+                 request_ids=None, skip_meta=False):
         self._conn = conn
         self._future_class = future_class
         self._closed = False
@@ -50,12 +239,47 @@ class Connection(object):
         if not self._pool:
             force_release = False
         self._force_release = force_release
+        self._multiplex = multiplex
+        self._created = _now()
+        if serializer is None:
+            serializer = JSONSerializer()
+        self._serializer = serializer
+        self._envelope = serializer.envelope()
+        if request_ids is None:
+            request_ids = RequestIdGenerator()
+        self._request_ids = request_ids
+        if skip_meta:
+            self._deserialize = functools.partial(
+                serializer.deserialize_message, skip_meta=True)
+        else:
+            self._deserialize = serializer.deserialize_message
+        self._decode_executor = decode_executor
+        self._decode_threshold = decode_threshold
+        self._tracer = tracer
+        self._parameterizer = parameterizer
+        self._request_timeout = request_timeout
+        self._graph = graph
+        # request id -> buffered frames for each in flight request
+        self._inboxes = {}
+        # ids of multiplexed requests whose remaining frames are dropped
+        self._abandoned = set()
+        # request id -> future waiting on the next frame
+        self._waiting = {}
+        self._reading = False
 
     def release(self):
         """Release connection to associated pool."""
         if self._pool:
             return self._pool.release(self)
 
+    def _finish(self):
+        # Close or release as a fully read Stream would, for responses
+        # served without using the connection
+        if self._force_close:
+            self.close()
+        elif self._force_release:
+            self.release()
+
     @property
     def conn(self):
         """Read only property for websocket connection.
@@ -71,17 +295,44 @@ class Connection(object):
         """
         return self._closed or self._conn.closed
 
+    @property
+    def created(self):
+        """Readonly property. Time the connection was created, in seconds
+        from an arbitrary monotonic clock.
+        :returns: float
+        """
+        return self._created
+
+    @property
+    def multiplex(self):
+        """Readonly property. Return True if concurrent requests share
+        this connection.
+        :returns: bool
+        """
+        return self._multiplex
+
+    @property
+    def inflight(self):
+        """Readonly property. Number of multiplexed requests that have not
+        received their final response.
+        :returns: int
+        """
+        return len(self._inboxes)
+
     def close(self):
         """Close the underlying websocket connection, detach from pool,
         and set to close.
         """
         self._closed = True
         self._pool = None
+        self._fail_waiting(GremlinConnectionError("Connection has been closed"))
+        self._inboxes = {}
         return self._conn.close()
 
     def send(self, gremlin, bindings=None, lang="gremlin-groovy",
                aliases=None, op="eval", processor="", session=None,
-               timeout=None, handler=None, request_id=None):
+               timeout=None, handler=None, request_id=None,
+               parameterize=None):
         """
         Send a script to the Gremlin Server.
 
@@ -93,20 +344,167 @@ class Connection(object):
             objects to different variable names in the current request
         :param str op: Gremlin Server op argument. "eval" by default.
         :param str processor: Gremlin Server processor argument. "" by default.
-        :param float timeout: timeout for establishing connection (optional).
-            Values ``0`` or ``None`` mean no timeout
+        :param float timeout: Deadline in seconds for reading the whole
+            response, also sent to the server as ``scriptEvaluationTimeout``
+            (optional). Defaults to the connection's ``request_timeout``.
+            Values ``0`` or ``None`` mean no deadline
         :param str session: Session id (optional). Typically a uuid
         :param loop: If param is ``None``, `tornado.ioloop.IOLoop.current`
             is used for getting default event loop (optional)
+        :param bool parameterize: Move the literals of a Groovy script to
+            bindings so the server can reuse the compiled script. Defaults
+            to the connection's setting
 
         :returns: :py:class:`gremlinclient.connection.Stream` object
         """
+        parameterizer = self._parameterizer
+        if parameterize is not None:
+            parameterizer = parameterize and (
+                parameterizer or _default_parameterizer)
+        if (parameterizer is not None and lang == "gremlin-groovy" and
+                op == "eval"):
+            gremlin, bindings = parameterizer(gremlin, bindings)
+        return self._send(gremlin, bindings, lang, aliases, op, processor,
+                          session, timeout, handler, request_id,
+                          self._force_close, self._force_release)
+
+    def send_batch(self, items, lang="gremlin-groovy", aliases=None,
+                   op="eval", processor="", session=None, timeout=None):
+        """
+        Send many small scripts in as few round trips as possible. On a
+        multiplexed connection all requests are written at once and their
+        responses collected by ``requestId``. Otherwise Groovy scripts are
+        merged into a single script, each running in its own closure with
+        its own indexed bindings. Scripts in other languages are sent one
+        after the other.
+
+        :param list items: ``(gremlin, bindings)`` pairs or bare scripts
+        :param str lang: Language of scripts submitted to the server.
+            "gremlin-groovy" by default
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str op: Gremlin Server op argument. "eval" by default.
+        :param str processor: Gremlin Server processor argument. "" by default.
+        :param str session: Session id (optional). Typically a uuid
+        :param float timeout: Deadline in seconds for reading the whole
+            response (optional). Values ``0`` or ``None`` mean no deadline
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a list of
+            :py:class:`BatchResult`, in submission order
+        """
+        items = _batch_items(items)
+        future = self._future_class()
+        results = [None] * len(items)
+        if not items:
+            future.set_result(results)
+            return future
+
+        def send(gremlin, bindings):
+            stream = self._send(gremlin, bindings, lang, aliases, op,
+                                processor, session, timeout, None, None,
+                                False, False)
+            return stream.read_all()
+
+        def done():
+            self._finish()
+            future.set_result(results)
+
+        if self._multiplex:
+            remaining = [len(items)]
+
+            def on_read(i, f):
+                try:
+                    results[i] = BatchResult(_message_data(f.result()), None)
+                except Exception as e:
+                    results[i] = BatchResult(None, e)
+                remaining[0] -= 1
+                if not remaining[0]:
+                    done()
+
+            for i, (gremlin, bindings) in enumerate(items):
+                send(gremlin, bindings).add_done_callback(
+                    lambda f, i=i: on_read(i, f))
+        elif lang == "gremlin-groovy":
+            gremlin, bindings = _merge_batch(items)
+
+            def on_merged(f):
+                try:
+                    pairs = _message_data(f.result())
+                    if len(pairs) != len(items):
+                        raise RuntimeError(
+                            "Batch of {} scripts returned {} results".format(
+                                len(items), len(pairs)))
+                except Exception as e:
+                    results[:] = [BatchResult(None, e)] * len(items)
+                else:
+                    for i, (data, error) in enumerate(pairs):
+                        if error is not None:
+                            results[i] = BatchResult(None,
+                                                     RuntimeError(error))
+                        else:
+                            results[i] = BatchResult(data, None)
+                done()
+
+            send(gremlin, bindings).add_done_callback(on_merged)
+        else:
+            index = [0]
+
+            def on_read(f):
+                # Loop while reads complete immediately to avoid deep
+                # recursion
+                while True:
+                    i = index[0]
+                    try:
+                        results[i] = BatchResult(_message_data(f.result()),
+                                                 None)
+                    except Exception as e:
+                        results[i] = BatchResult(None, e)
+                    index[0] += 1
+                    if index[0] == len(items):
+                        done()
+                        return
+                    f = send(*items[index[0]])
+                    if not f.done():
+                        f.add_done_callback(on_read)
+                        return
+
+            f = send(*items[0])
+            if f.done():
+                on_read(f)
+            else:
+                f.add_done_callback(on_read)
+        return future
+
+    def ping(self, script="1"):
+        """
+        Check that the connection is usable by evaluating a trivial script.
+        Never closes or releases the connection.
+
+        :param str script: Script to evaluate. "1" by default
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future`
+        """
+        stream = self._send(script, None, "gremlin-groovy", None, "eval", "",
+                            None, None, None, None, False, False)
+        return stream.read_all()
+
+    def _send(self, gremlin, bindings, lang, aliases, op, processor, session,
+              timeout, handler, request_id, force_close, force_release):
         if session is None:
             session = self._session
         if timeout is None:
-            timeout = self._timeout
+            timeout = self._request_timeout
         if aliases is None:
             aliases = {}
+        if request_id is None:
+            request_id = self._request_ids()
+        tracer = self._tracer
+        if tracer is not None:
+            tracer.on_prepare(request_id)
         message = self._prepare_message(gremlin,
                                         bindings,
                                         lang,
@@ -114,44 +512,51 @@ class Connection(object):
                                         op,
                                         processor,
                                         session,
-                                        request_id)
+                                        request_id,
+                                        timeout)
+        if self._multiplex:
+            self._inboxes[request_id] = collections.deque()
 
         self.conn.send(message, binary=True)
+        if tracer is not None:
+            tracer.on_write(request_id, len(message))
 
-        return Stream(self,
-                      session,
-                      processor,
-                      handler,
-                      self._loop,
-                      self._username,
-                      self._password,
-                      self._force_close,
-                      self._force_release,
-                      self._future_class)
+        stream = Stream(self,
+                        session,
+                        processor,
+                        handler,
+                        self._loop,
+                        self._username,
+                        self._password,
+                        force_close,
+                        force_release,
+                        self._future_class,
+                        request_id=request_id)
+        if timeout and self._graph is not None:
+            stream._start_deadline(self._graph, timeout)
+        return stream
 
     def _prepare_message(self, gremlin, bindings, lang, aliases, op, processor,
-                         session, request_id):
+                         session, request_id, timeout=None):
         if request_id is None:
-            request_id = str(uuid.uuid4())
-        message = {
-            "requestId": request_id,
-            "op": op,
-            "processor": processor,
-            "args": {
-                "gremlin": gremlin,
-                "bindings": bindings,
-                "language":  lang,
-                "aliases": aliases
-            }
-        }
-        message = self._finalize_message(message, processor, session)
-        return message
+            request_id = self._request_ids()
+        session = self._check_session(processor, session)
+        evaluation_timeout = None
+        if timeout and op == "eval":
+            # let the server stop evaluating once the client gave up
+            evaluation_timeout = int(timeout * 1000)
+        return self._envelope.request(
+            request_id, op, processor, gremlin, bindings, lang, aliases,
+            session=session, evaluation_timeout=evaluation_timeout)
 
-    def _authenticate(self, username, password, processor, session):
+    def _authenticate(self, username, password, processor, session,
+                      request_id=None):
+        if request_id is None:
+            request_id = self._request_ids()
         auth = b"".join([b"\x00", username.encode("utf-8"),
                          b"\x00", password.encode("utf-8")])
         message = {
-            "requestId": str(uuid.uuid4()),
+            "requestId": request_id,
             "op": "authentication",
             "processor": "",
             "args": {
@@ -162,22 +567,139 @@ class Connection(object):
         self.conn.send(message, binary=True)
 
     def _finalize_message(self, message, processor, session):
-        if processor == "session":
-            if session is None:
-                raise RuntimeError("session processor requires a session id")
-            else:
-                message["args"].update({"session": session})
-        message = json.dumps(message)
-        return self._set_message_header(message, "application/json")
+        session = self._check_session(processor, session)
+        if session is not None:
+            message["args"].update({"session": session})
+        return self._serializer.serialize_message(message)
+
+    @staticmethod
+    def _check_session(processor, session):
+        # Only the session processor sends the session id
+        if processor != "session":
+            return None
+        if session is None:
+            raise RuntimeError("session processor requires a session id")
+        return session
 
     @staticmethod
     def _set_message_header(message, mime_type):
-        if mime_type == "application/json":
-            mime_len = b"\x10"
-            mime_type = b"application/json"
+        header = get_serializer(mime_type).header
+        return b"".join([header, message.encode("utf-8")])
+
+    def _decode(self, future_data, future):
+        # Decode the frame held by future_data and resolve future with the
+        # message. Large frames are handed to the decode executor.
+        try:
+            data = future_data.result()
+            if data is None:
+                raise GremlinConnectionError("Connection has been closed")
+            if (self._decode_executor is not None and
+                    len(data) >= self._decode_threshold):
+                future_decode = self._conn.run_in_executor(
+                    self._decode_executor, self._deserialize, data)
+                future_decode.add_done_callback(
+                    lambda f: _copy_future(f, future))
+                return
+            message = self._deserialize(data)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(message)
+
+    def _receive(self, request_id, callback):
+        """Get a future for the next decoded frame of request ``request_id``.
+        Without multiplexing this is simply the next frame on the socket.
+        """
+        future = self._future_class()
+        future.add_done_callback(callback)
+        if not self._multiplex:
+            future_resp = self._conn.receive()
+            future_resp.add_done_callback(lambda f: self._decode(f, future))
+            return future
+        inbox = self._inboxes.get(request_id)
+        if inbox is None:
+            future.set_exception(
+                RuntimeError("Unknown request id: {}".format(request_id)))
+        elif inbox:
+            message = inbox.popleft()
+            if self._is_final(message):
+                del self._inboxes[request_id]
+            future.set_result(message)
         else:
-            raise ValueError("Unknown mime type.")
-        return b"".join([mime_len, mime_type, message.encode("utf-8")])
+            self._waiting[request_id] = future
+            self._read_frame()
+        return future
+
+    def _read_frame(self):
+        # Only one reader per socket, and only while a stream is waiting.
+        # Frames for streams that aren't currently reading are buffered.
+        if self._reading or not self._waiting or self.closed:
+            return
+        self._reading = True
+        future_resp = self._conn.receive()
+        future_resp.add_done_callback(self._on_frame)
+
+    def _on_frame(self, f):
+        future = self._future_class()
+        future.add_done_callback(self._route)
+        self._decode(f, future)
+
+    def _route(self, f):
+        self._reading = False
+        try:
+            message = f.result()
+        except Exception as e:
+            self._fail_waiting(e)
+            return
+        request_id = message["requestId"]
+        future = self._waiting.pop(request_id, None)
+        if future is not None:
+            if self._is_final(message):
+                self._inboxes.pop(request_id, None)
+            future.set_result(message)
+        elif request_id in self._inboxes:
+            self._inboxes[request_id].append(message)
+        elif request_id in self._abandoned:
+            if self._is_final(message):
+                self._abandoned.discard(request_id)
+        else:
+            connection_logger.warning(
+                "Discarded frame for unknown request: {}".format(request_id))
+        self._read_frame()
+
+    def _abandon(self, request_id, force_close, force_release):
+        # Give up on a request whose deadline passed or whose stream was
+        # closed. A multiplexed socket
+        # stays usable: the request's remaining frames are dropped as they
+        # arrive. Otherwise frames may still be on their way, so the socket
+        # is closed; a pool discards it when it is released.
+        if self._multiplex and not self.closed:
+            if self._inboxes.pop(request_id, None) is not None:
+                self._abandoned.add(request_id)
+            self._waiting.pop(request_id, None)
+            if force_close:
+                self.close()
+            elif force_release:
+                self.release()
+            return
+        self._closed = True
+        self._fail_waiting(
+            GremlinConnectionError("Connection has been closed"))
+        self._inboxes = {}
+        self._conn.close()
+        if force_release and not force_close:
+            self.release()
+        elif force_close:
+            self._pool = None
+
+    def _fail_waiting(self, exc):
+        waiting, self._waiting = self._waiting, {}
+        for future in waiting.values():
+            future.set_exception(exc)
+
+    @staticmethod
+    def _is_final(message):
+        return message["status"]["code"] not in (206, 407)
 
 
 class Session(Connection):
@@ -209,7 +731,8 @@ class Session(Connection):
             self._session = str(uuid.uuid4())
 
     def send(self, gremlin, bindings=None, lang="gremlin-groovy",
-             aliases=None, op="eval", timeout=None, handler=None):
+             aliases=None, op="eval", timeout=None, handler=None,
+             parameterize=None):
         """
         send a script to the Gremlin Server using sessions.
 
@@ -220,10 +743,12 @@ class Session(Connection):
         :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
             objects to different variable names in the current request
         :param str op: Gremlin Server op argument. "eval" by default.
-        :param float timeout: timeout for establishing connection (optional).
-            Values ``0`` or ``None`` mean no timeout
+        :param float timeout: Deadline in seconds for reading the whole
+            response (optional). Values ``0`` or ``None`` mean no deadline
         :param loop: If param is ``None``, `tornado.ioloop.IOLoop.current`
             is used for getting default event loop (optional)
+        :param bool parameterize: Move the literals of a Groovy script to
+            bindings. Defaults to the connection's setting
 
         :returns: :py:class:`gremlinclient.connection.Stream` object
         """
@@ -235,13 +760,16 @@ class Session(Connection):
                                          timeout=timeout,
                                          processor="session",
                                          session=self._session,
-                                         handler=handler)
+                                         handler=handler,
+                                         parameterize=parameterize)
 
-    def _authenticate(self, username, password, processor, session):
+    def _authenticate(self, username, password, processor, session,
+                      request_id=None):
         super(Session, self)._authenticate(username,
                                            password,
                                            "session",
-                                            self._session)
+                                           self._session,
+                                           request_id=request_id)
 
 
 class Stream(object):
@@ -265,11 +793,26 @@ class Stream(object):
     :param class future_class: type of Future -
         :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
         :py:class:`tornado.concurrent.Future`
+    :param str request_id: Id of the request this stream reads responses for
+    :param int buffer_size: Number of result items to read ahead when
+        iterating over items.
+
+    Besides reading whole response messages with :py:meth:`read`, a stream
+    can be consumed one result item at a time, either with ``async for``
+    (PEP 492) or with :py:attr:`fetch_next` and :py:meth:`next_item`::
+
+        while (yield stream.fetch_next):
+            item = stream.next_item()
+
+    Frames are read ahead until ``buffer_size`` items are buffered, after
+    which the stream stops reading from the socket until the consumer
+    catches up. Don't mix item iteration and :py:meth:`read` on one stream.
     """
 
     def __init__(self, conn, session, processor, handler,
                  loop, username, password, force_close,
-                 force_release, future_class):
+                 force_release, future_class, request_id=None,
+                 buffer_size=1024):
         self._conn = conn
         self._session = session
         self._processor = processor
@@ -280,13 +823,119 @@ class Stream(object):
         self._force_release = force_release
         self._loop = loop
         self._future_class = future_class or Future
+        self._request_id = request_id
         self._handlers = []
         if handler is not None:
             self._handlers.append(handler)
+        self._buffer_size = buffer_size
+        self._items = collections.deque()
+        self._item_waiters = []
+        self._frame = None
+        self._exhausted = False
+        self._error = None
+        # whether the first frame was reported to the tracer
+        self._traced = False
+        # deadline timer, the read it cancels and the error once expired
+        self._graph = None
+        self._timer = None
+        self._pending = None
+        self._expired = None
 
     def add_handler(self, handler):
         self._handlers.append(handler)
 
+    @property
+    def fetch_next(self):
+        """
+        Wait until a result item is available.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to ``True`` if
+            :py:meth:`next_item` will return an item, ``False`` if the stream
+            is exhausted.
+        """
+        future = self._future_class()
+        if not self._resolve_waiter(future):
+            self._item_waiters.append(future)
+        self._fill()
+        return future
+
+    def next_item(self):
+        """
+        Pop the next buffered result item. Use after
+        :py:attr:`fetch_next` resolves to ``True``.
+
+        :returns: A result item, or the processed message if the stream
+            has handlers. ``None`` if nothing is buffered.
+        """
+        if not self._items:
+            return None
+        item = self._items.popleft()
+        self._fill()
+        return item
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._future_class()
+
+        def on_fetch(f):
+            try:
+                has_next = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                if has_next:
+                    future.set_result(self.next_item())
+                else:
+                    future.set_exception(StopAsyncIteration())
+
+        self.fetch_next.add_done_callback(on_fetch)
+        return future
+
+    def _fill(self):
+        # Keep at most one frame read outstanding, and stop reading once
+        # the buffer is full so a slow consumer throttles the socket.
+        if (self._frame is not None or self._exhausted or
+                len(self._items) >= self._buffer_size):
+            return
+        self._frame = self.read()
+        self._frame.add_done_callback(self._on_fill)
+
+    def _on_fill(self, f):
+        self._frame = None
+        try:
+            message = f.result()
+        except Exception as e:
+            self._exhausted = True
+            self._error = e
+        else:
+            if message is None:
+                self._exhausted = True
+            elif isinstance(message, Message):
+                self._items.extend(message.data or ())
+            else:
+                # handlers replace the message with their own result
+                self._items.append(message)
+        waiters, self._item_waiters = self._item_waiters, []
+        for waiter in waiters:
+            if not self._resolve_waiter(waiter):
+                self._item_waiters.append(waiter)
+        self._fill()
+
+    def _resolve_waiter(self, future):
+        if self._items:
+            future.set_result(True)
+        elif self._error is not None:
+            future.set_exception(self._error)
+        elif self._exhausted:
+            future.set_result(False)
+        else:
+            return False
+        return True
+
     def read(self):
         """
         Read a message from the response stream.
@@ -296,10 +945,13 @@ class Stream(object):
             :py:class:`tornado.concurrent.Future`
         """
         future = self._future_class()
-        if self._closed:
+        if self._expired is not None:
+            future.set_exception(self._expired)
+        elif self._closed:
             future.set_result(None)
         elif self._conn.closed:
-            future.set_exception(RuntimeError("Connection has been closed"))
+            self._finish(future, error=GremlinConnectionError(
+                "Connection has been closed"), discard=True)
         else:
             try:
                 future = self._read(future)
@@ -307,96 +959,173 @@ class Stream(object):
                 future.set_exception(e)
         return future
 
+    def read_all(self):
+        """
+        Read all remaining messages from the response stream.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a list of
+            messages
+        """
+        future = self._future_class()
+        messages = []
+
+        def on_read(f):
+            # Loop while reads complete immediately to avoid deep recursion
+            while True:
+                try:
+                    message = f.result()
+                except Exception as e:
+                    future.set_exception(e)
+                    return
+                if message is None:
+                    future.set_result(messages)
+                    return
+                messages.append(message)
+                f = self.read()
+                if not f.done():
+                    f.add_done_callback(on_read)
+                    return
+
+        f = self.read()
+        if f.done():
+            on_read(f)
+        else:
+            f.add_done_callback(on_read)
+        return future
+
     def _read(self, future):
+        tracer = self._conn._tracer
+        self._pending = future
+
         def parser(f):
-            terminate = True
+            if self._expired is not None:
+                # the read was already failed by the deadline or close
+                return
             try:
-                result = f.result()
-                # result can be none if conn is closed...test that
+                message = f.result()
             except Exception as e:
-                future.set_exception(e)
-            else:
-                message = json.loads(result.decode("utf-8"))
-                message = Message(message["status"]["code"],
-                                  message["result"]["data"],
-                                  message["status"]["message"],
-                                  message["result"]["meta"])
-                status_code = message.status_code
-                if status_code in [200, 206, 204]:
-                    try:
-                        message = self._process(message)
-                    except Exception as e:
-                        exc = e
-                        if self._force_close:
-                            # throws error asyncio.Cancelled ...
-                            future_close = self._conn.close()
-                            future_close.add_done_callback(
-                                lambda f: future.set_exception(exc))
-                        elif self._force_release:
-                            future_release = self._conn.release()
-                            future_release.add_done_callback(
-                                lambda f: future.set_exception(exc))
-                        else:
-                            future.set_exception(exc)
-                    else:
-                        if status_code == 206:
-                            terminate = False
-                            future.set_result(message)
-                        elif self._force_close:
-                            future_close = self._conn.close()
-                            future_close.add_done_callback(
-                                lambda f: future.set_result(message))
-                        elif self._force_release:
-                            future_release = self._conn.release()
-                            future_release.add_done_callback(
-                                lambda f: future.set_result(message))
-                        else:
-                            future.set_result(message)
-                elif status_code == 407:
-                    terminate = False
-                    try:
-                        self._conn._authenticate(
-                            self._username, self._password, self._processor,
-                            self._session)
-                    except Exception as e:
-                        future.set_exception(e)
+                self._finish(future, error=e, discard=True)
+                return
+            status = message["status"]
+            status_code = status["code"]
+            if tracer is not None:
+                self._trace_frame(tracer, status_code)
+            if status_code in [200, 206, 204]:
+                try:
+                    message = self._process(message)
+                except Exception as e:
+                    self._finish(future, error=e)
+                else:
+                    if status_code == 206:
+                        future.set_result(message)
                     else:
-                        future_read = self.read()
-                        def cb(f):
-                            try:
-                                result = f.result()
-                            except Exception as e:
-                                future.set_exception(e)
-                            else:
-                                future.set_result(result)
-                        future_read.add_done_callback(cb)
-                elif self._force_close:
-                    future_close = self._conn.close()
-                    future_close.add_done_callback(
-                        lambda f: future.set_exception(
-                            RuntimeError("{0} {1}".format(
-                                message.status_code, message.message))))
-                elif self._force_release:
-                    future_release = self._conn.release()
-                    future_release.add_done_callback(
-                        lambda f: future.set_exception(
-                            RuntimeError("{0} {1}".format(
-                                message.status_code, message.message))))
+                        self._finish(future, message=message)
+            elif status_code == 407:
+                try:
+                    self._conn._authenticate(
+                        self._username, self._password, self._processor,
+                        self._session, request_id=self._request_id)
+                except Exception as e:
+                    self._finish(future, error=e, discard=True)
                 else:
-                    future.set_exception(
-                        RuntimeError("{0} {1}".format(
-                            message.status_code, message.message)))
-            finally:
-                if terminate:
-                    self._closed = True
-                    self._conn = None
-
-        future_resp = self._conn.conn.receive(callback=parser)
+                    self.read().add_done_callback(
+                        lambda f: _copy_future(f, future))
+            else:
+                self._finish(future, error=error_for_status(
+                    status_code, status["message"]))
+
+        future_resp = self._conn._receive(self._request_id, parser)
         return future
 
+    def _finish(self, future, message=None, error=None, discard=False):
+        # End the stream, close or release the connection as requested,
+        # then resolve future. The stream is marked done first: callbacks
+        # may run synchronously and read again.
+        conn = self._conn
+        self._cancel_deadline()
+        self._closed = True
+        self._conn = None
+        if conn._tracer is not None:
+            conn._tracer.on_complete(self._request_id, error)
+        if discard and not conn.conn.closed:
+            # the socket failed or may still hold frames of this response:
+            # close it so a pool drops the connection on release
+            conn.conn.close()
+        if self._force_close:
+            done = conn.close()
+        elif self._force_release:
+            done = conn.release()
+        else:
+            done = None
+
+        def resolve(f=None):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(message)
+
+        if done is None:
+            resolve()
+        else:
+            done.add_done_callback(resolve)
+
+    def _start_deadline(self, graph, timeout):
+        self._graph = graph
+        self._timer = graph.call_later(timeout, self._expire, timeout)
+
+    def _cancel_deadline(self):
+        if self._timer is not None:
+            self._graph.cancel_call(self._timer)
+            self._timer = None
+
+    def close(self):
+        """
+        Stop reading the response before its end. A multiplexed
+        connection drops the remaining frames, other connections are closed
+        since frames may still be on their way. A force release connection
+        goes back to its pool. Further reads fail. Does nothing once the
+        response was read.
+        """
+        if self._closed:
+            return
+        self._cancel_deadline()
+        self._give_up(GremlinConnectionError("Stream has been closed"))
+
+    def _expire(self, timeout):
+        self._timer = None
+        if self._closed:
+            return
+        self._give_up(RequestTimeoutError(
+            "No complete response within {} seconds".format(timeout)))
+
+    def _give_up(self, error):
+        self._expired = error
+        self._closed = True
+        conn, self._conn = self._conn, None
+        conn._abandon(self._request_id, self._force_close,
+                      self._force_release)
+        if conn._tracer is not None:
+            conn._tracer.on_complete(self._request_id, error)
+        pending, self._pending = self._pending, None
+        if pending is not None and not pending.done():
+            pending.set_exception(error)
+
+    def _trace_frame(self, tracer, status_code):
+        if not self._traced:
+            self._traced = True
+            tracer.on_first_frame(self._request_id)
+        if status_code == 206:
+            tracer.on_partial(self._request_id)
+        elif status_code != 407:
+            tracer.on_status(self._request_id, status_code)
+
     def _process(self, message):
         if self._handlers:
-            message = message.data
+            # handlers only see the data, no need for a Message
+            data = message["result"]["data"]
             for handler in self._handlers:
-                message = handler(message)
-        return message
+                data = handler(data)
+            return data
+        return Message._from_frame(message)
@@ -0,0 +1,115 @@
+class PoolError(RuntimeError):
+    """Base class for errors raised by :py:class:`gremlinclient.pool.Pool`"""
+
+
+class PoolExhaustedError(PoolError):
+    """Raised by :py:meth:`gremlinclient.pool.Pool.acquire` when the pool is
+    full and ``max_waiters`` callers are already waiting"""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised by :py:meth:`gremlinclient.pool.Pool.acquire` when no connection
+    becomes available within the timeout"""
+
+
+class NoHostAvailableError(PoolError):
+    """Raised by :py:meth:`gremlinclient.cluster.ClusterPool.acquire` when
+    every host is down or failed to provide a connection"""
+
+
+class GremlinConnectionError(RuntimeError):
+    """Raised when the connection to the Gremlin Server can't be opened or
+    is lost. The request may or may not have run on the server"""
+    retryable = True
+
+
+class RequestTimeoutError(RuntimeError):
+    """Raised when a response isn't fully read within the request's
+    deadline. The request may or may not have run on the server"""
+    retryable = True
+
+
+class GremlinServerError(RuntimeError):
+    """Raised when the Gremlin Server answers with an error status. Use
+    :py:func:`error_for_status` to get the subclass matching a status code.
+
+    :param int status_code: Gremlin Server status code
+    :param str message: Status message sent by the server
+    """
+    #: Whether sending the request again may succeed
+    retryable = False
+
+    def __init__(self, status_code, message):
+        super(GremlinServerError, self).__init__(
+            "{0} {1}".format(status_code, message))
+        self.status_code = status_code
+        self.status_message = message
+
+
+class UnauthorizedError(GremlinServerError):
+    """401: the credentials were rejected"""
+
+
+class ForbiddenError(GremlinServerError):
+    """403: the request is not allowed for these credentials"""
+
+
+class TooManyRequestsError(GremlinServerError):
+    """429: the server is throttling requests"""
+    retryable = True
+
+
+class MalformedRequestError(GremlinServerError):
+    """498: the request message could not be parsed"""
+
+
+class InvalidRequestArgumentsError(GremlinServerError):
+    """499: the request arguments are invalid"""
+
+
+class ServerError(GremlinServerError):
+    """500: generic server error"""
+
+
+class TemporaryServerError(GremlinServerError):
+    """596: transient server error, the request may be sent again"""
+    retryable = True
+
+
+class ScriptEvaluationError(GremlinServerError):
+    """597: the script failed to evaluate"""
+
+
+class ServerTimeoutError(GremlinServerError):
+    """598: the script exceeded the server's evaluation timeout"""
+    retryable = True
+
+
+class ServerSerializationError(GremlinServerError):
+    """599: the server could not serialize the result"""
+
+
+_STATUS_ERRORS = {
+    401: UnauthorizedError,
+    403: ForbiddenError,
+    429: TooManyRequestsError,
+    498: MalformedRequestError,
+    499: InvalidRequestArgumentsError,
+    500: ServerError,
+    596: TemporaryServerError,
+    597: ScriptEvaluationError,
+    598: ServerTimeoutError,
+    599: ServerSerializationError}
+
+
+def error_for_status(status_code, message):
+    """
+    Build the exception for a Gremlin Server error status.
+
+    :param int status_code: Gremlin Server status code
+    :param str message: Status message sent by the server
+
+    :returns: :py:class:`GremlinServerError` subclass instance
+    """
+    cls = _STATUS_ERRORS.get(status_code, GremlinServerError)
+    return cls(status_code, message)
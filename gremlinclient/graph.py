@@ -2,8 +2,13 @@ import socket
 import sys
 import textwrap
 
-from gremlinclient.connection import Connection, Session
+from gremlinclient.connection import (
+    Connection, Session, DECODE_THRESHOLD)
+from gremlinclient.ids import RequestIdGenerator
+from gremlinclient.parameterize import Parameterizer
 from gremlinclient.response import Response
+from gremlinclient.serializer import (
+    JSONSerializer, Serializer, get_serializer)
 
 
 PY_33 = sys.version_info >= (3, 3)
@@ -24,13 +29,42 @@ class GraphDatabase(object):
     :param class future_class: type of Future -
         :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
         :py:class:`tornado.concurrent.Future`
+    :param bool multiplex: Share each websocket between concurrent requests.
+        False by default
+    :param gremlinclient.serializer.Serializer serializer: Serializer for
+        requests and responses, or the mime type of a registered serializer.
+        JSON by default
+    :param decode_executor: :py:class:`concurrent.futures.Executor` used to
+        decode large response frames off the event loop (optional)
+    :param int decode_threshold: Minimum frame size in bytes decoded with
+        ``decode_executor``. 1 MiB by default
+    :param gremlinclient.tracing.Tracer tracer: Receives timing hooks for
+        every request (optional)
+    :param parameterize: Move the literals of Groovy scripts to bindings so
+        the server can reuse compiled scripts. ``True`` or a
+        :py:class:`gremlinclient.parameterize.Parameterizer`. False by
+        default
+    :param float request_timeout: Default deadline in seconds for reading a
+        whole response, also sent as ``scriptEvaluationTimeout``
+        (optional). Overridden by the ``timeout`` of
+        :py:meth:`gremlinclient.connection.Connection.send`
+    :param request_ids: Factory called for each connection, returning a
+        callable that generates its request ids (optional). Defaults to
+        :py:class:`gremlinclient.ids.RequestIdGenerator`
+    :param bool skip_meta: Leave the result meta out of responses, see
+        :py:class:`gremlinclient.connection.Connection`. False by default
     """
 
     def __init__(self, url, timeout=None, username="",
                  password="", loop=None, validate_cert=False,
-                 future_class=None, session_class=Session):
+                 future_class=None, session_class=Session, multiplex=False,
+                 serializer=None, decode_executor=None,
+                 decode_threshold=DECODE_THRESHOLD, tracer=None,
+                 parameterize=False, request_timeout=None,
+                 request_ids=None, skip_meta=False):
         self._url = url
         self._timeout = timeout
+        self._request_timeout = request_timeout
         self._username = username
         self._password = password
         self._loop = loop
@@ -38,11 +72,64 @@ class GraphDatabase(object):
         # Hmmm
         self._future_class = future_class
         self._session_class = session_class
+        self._multiplex = multiplex
+        if serializer is None:
+            serializer = JSONSerializer()
+        elif not isinstance(serializer, Serializer):
+            serializer = get_serializer(serializer)
+        self._serializer = serializer
+        self._decode_executor = decode_executor
+        self._decode_threshold = decode_threshold
+        self._tracer = tracer
+        if parameterize is True:
+            parameterize = Parameterizer()
+        self._parameterizer = parameterize or None
+        if request_ids is None:
+            request_ids = RequestIdGenerator
+        self._request_ids = request_ids
+        self._skip_meta = skip_meta
+
+    @property
+    def url(self):
+        """
+        Url of the Gremlin Server
+
+        :returns: str
+        """
+        return self._url
 
     @property
     def future_class(self):
         return self._future_class
 
+    @property
+    def loop(self):
+        """
+        Event loop used for timers
+
+        :returns: event loop
+        """
+        return self._loop
+
+    @property
+    def parameterizer(self):
+        """
+        Parameterizer shared by the connections of this graph, with the
+        count of distinct script shapes sent. ``None`` if disabled
+
+        :returns: :py:class:`gremlinclient.parameterize.Parameterizer`
+        """
+        return self._parameterizer
+
+    @property
+    def multiplex(self):
+        """
+        Whether connections created by this graph are multiplexed
+
+        :returns: bool
+        """
+        return self._multiplex
+
     def connect(self,
                 session=None,
                 force_close=False,
@@ -82,6 +169,31 @@ class GraphDatabase(object):
         return self._connect(
             Session, session, force_close, force_release, pool)
 
+    def call_later(self, delay, callback, *args):
+        """
+        Schedule ``callback`` to run on the event loop after ``delay``
+        seconds.
+
+        :param float delay: Delay in seconds
+        :param callback: Callable to run
+
+        :returns: Handle that can be passed to :py:meth:`cancel_call`
+        """
+        return self.loop.call_later(delay, callback, *args)
+
+    def cancel_call(self, handle):
+        """
+        Cancel a callback scheduled with :py:meth:`call_later`.
+
+        :param handle: Handle returned by :py:meth:`call_later`
+        """
+        remove_timeout = getattr(self.loop, "remove_timeout", None)
+        if remove_timeout is not None:
+            # tornado.ioloop.IOLoop
+            remove_timeout(handle)
+        else:
+            handle.cancel()
+
     def _connect(self,
                  conn_type,
                  session,
@@ -89,3 +201,19 @@ class GraphDatabase(object):
                  force_release,
                  pool):
         raise NotImplementedError
+
+    def _make_connection(self, conn_type, resp, session, force_close,
+                         force_release, pool):
+        return conn_type(resp, self._future_class, self._timeout,
+                         self._username, self._password, self._loop,
+                         force_close, pool, force_release, session,
+                         multiplex=self._multiplex,
+                         serializer=self._serializer,
+                         decode_executor=self._decode_executor,
+                         decode_threshold=self._decode_threshold,
+                         tracer=self._tracer,
+                         parameterizer=self._parameterizer,
+                         request_timeout=self._request_timeout,
+                         graph=self,
+                         request_ids=self._request_ids(),
+                         skip_meta=self._skip_meta)
@@ -0,0 +1,45 @@
+import itertools
+import uuid
+
+
+# The counter fills the last 12 hex digits of the id
+_MAX_COUNT = 16 ** 12 - 1
+
+
+class RequestIdGenerator(object):
+    """
+    Request ids for one connection: a random uuid4 prefix followed by a
+    counter, so an id costs a string format instead of reading
+    :py:func:`os.urandom`. Ids keep the uuid format required by the server
+    and by binary serializers. The random part (74 bits) keeps them unique
+    across connections and processes; a new prefix is drawn once the
+    counter runs out.
+    """
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # "xxxxxxxx-xxxx-4xxx-yxxx-"
+        self._prefix = str(uuid.uuid4())[:24]
+        self._counter = itertools.count()
+
+    def __call__(self):
+        """
+        :returns: str
+        """
+        count = next(self._counter)
+        if count > _MAX_COUNT:
+            self._reset()
+            count = next(self._counter)
+        return "%s%012x" % (self._prefix, count)
+
+
+class UUID4Generator(object):
+    """
+    Fully random request ids, as :py:func:`uuid.uuid4`
+    """
+    def __call__(self):
+        """
+        :returns: str
+        """
+        return str(uuid.uuid4())
@@ -0,0 +1,158 @@
+import collections
+import re
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_NUMBER = re.compile(r"\d+(\.\d+)?([eE][+-]?\d+)?")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f",
+            "\\": "\\", "'": "'", '"': '"'}
+
+
+def _literals(gremlin):
+    # Yield (start, end, value) for each string and integer literal of a
+    # Groovy script that can safely be replaced by a binding
+    n = len(gremlin)
+    i = 0
+    while i < n:
+        c = gremlin[i]
+        if c in "'\"":
+            if gremlin.startswith(c * 3, i):
+                # multiline string, left alone
+                end = gremlin.find(c * 3, i + 3)
+                i = n if end < 0 else end + 3
+                continue
+            j = i + 1
+            chars = []
+            plain = True
+            while j < n and gremlin[j] != c:
+                if gremlin[j] == "\\":
+                    escaped = _ESCAPES.get(gremlin[j + 1:j + 2])
+                    if escaped is None:
+                        plain = False
+                    else:
+                        chars.append(escaped)
+                    j += 2
+                else:
+                    if c == '"' and gremlin[j] == "$":
+                        # GString interpolation
+                        plain = False
+                    chars.append(gremlin[j])
+                    j += 1
+            if j >= n:
+                return
+            # map keys such as ['name': 1] must stay literals
+            rest = gremlin[j + 1:].lstrip()
+            if plain and not rest.startswith(":"):
+                yield i, j + 1, "".join(chars)
+            i = j + 1
+        elif c == "/" and gremlin.startswith("//", i):
+            end = gremlin.find("\n", i)
+            i = n if end < 0 else end
+        elif c == "/" and gremlin.startswith("/*", i):
+            end = gremlin.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif c.isdigit():
+            match = _NUMBER.match(gremlin, i)
+            end = match.end()
+            # decimals are BigDecimal literals in Groovy and typed literals
+            # such as 1L have a suffix: keep both as they are
+            integer = not (match.group(1) or match.group(2))
+            suffixed = end < n and (gremlin[end].isalpha() or
+                                    gremlin[end] == "_")
+            # a digit after a dot is a property, unless it ends a range
+            attribute = (gremlin[i - 1:i] == "." and
+                         gremlin[i - 2:i] != "..")
+            if integer and not suffixed and not attribute:
+                yield i, end, int(gremlin[i:end])
+            i = end
+        elif c.isalpha() or c in "_$":
+            i = _IDENTIFIER.match(gremlin, i).end()
+        else:
+            i += 1
+
+
+def parameterize(gremlin, bindings=None, prefix="_p"):
+    """
+    Replace the string and integer literals of a Groovy script by bindings
+    named ``_p0``, ``_p1``... in order of appearance, so scripts that only
+    differ by their literals have the same text and share the server's
+    compiled script cache. Decimal, typed and interpolated literals, and
+    map keys, are left in place.
+
+    :param str gremlin: Gremlin script
+    :param dict bindings: Existing bindings, kept as they are
+    :param str prefix: Prefix of the generated binding names
+
+    :returns: ``(script, bindings)`` tuple
+    """
+    parts = []
+    bindings = dict(bindings or {})
+    last = 0
+    index = 0
+    for start, end, value in _literals(gremlin):
+        name = "{}{}".format(prefix, index)
+        while name in bindings:
+            index += 1
+            name = "{}{}".format(prefix, index)
+        index += 1
+        bindings[name] = value
+        parts.append(gremlin[last:start])
+        parts.append(name)
+        last = end
+    if not parts:
+        return gremlin, bindings
+    parts.append(gremlin[last:])
+    return "".join(parts), bindings
+
+
+class Parameterizer(object):
+    """
+    Parameterizes scripts with :py:func:`parameterize` and counts the
+    distinct script shapes sent.
+
+    :param int max_shapes: Number of distinct shapes counted individually.
+        Later shapes are only added to :py:attr:`untracked`. 10000 by
+        default
+    """
+    def __init__(self, max_shapes=10000):
+        self._max_shapes = max_shapes
+        self._shapes = collections.Counter()
+        self._untracked = 0
+
+    @property
+    def distinct(self):
+        """
+        Number of distinct script shapes sent. Untracked scripts each count
+        as a new shape, so past ``max_shapes`` this is an upper bound
+
+        :returns: int
+        """
+        return len(self._shapes) + self._untracked
+
+    @property
+    def untracked(self):
+        """
+        Scripts whose shape was not tracked because ``max_shapes`` was
+        reached
+
+        :returns: int
+        """
+        return self._untracked
+
+    def most_common(self, n=None):
+        """
+        The most frequently sent shapes
+
+        :param int n: Number of shapes. All by default
+
+        :returns: list of ``(script, count)`` tuples
+        """
+        return self._shapes.most_common(n)
+
+    def __call__(self, gremlin, bindings=None):
+        script, bindings = parameterize(gremlin, bindings)
+        if script in self._shapes or len(self._shapes) < self._max_shapes:
+            self._shapes[script] += 1
+        else:
+            self._untracked += 1
+        return script, bindings
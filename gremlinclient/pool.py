@@ -1,11 +1,48 @@
 import collections
+import heapq
+import itertools
 import sys
 import textwrap
 
 from logging import WARNING
 
+from gremlinclient.connection import _now
+from gremlinclient.exceptions import PoolExhaustedError, PoolTimeoutError
 from gremlinclient.graph import GraphDatabase
 from gremlinclient.log import pool_logger
+from gremlinclient.response import _copy_future
+from gremlinclient.stats import PoolStats
+
+
+class _WaiterQueue(object):
+    # Futures waiting for a connection. Lower priorities are served first,
+    # FIFO within a priority. Waiters that gave up are dropped lazily.
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        # waiters still in the heap that didn't give up
+        self._queued = set()
+
+    def append(self, future, priority=0):
+        heapq.heappush(self._heap, (priority, next(self._counter), future))
+        self._queued.add(future)
+
+    def discard(self, future):
+        self._queued.discard(future)
+
+    def popleft(self):
+        # Return the next live waiter, or None
+        while self._heap:
+            future = heapq.heappop(self._heap)[-1]
+            if future in self._queued:
+                self._queued.remove(future)
+                if not future.done():
+                    return future
+        return None
+
+    def __len__(self):
+        return len(self._queued)
 
 
 class Pool(object):
@@ -25,19 +62,65 @@ class Pool(object):
     :param class future_class: type of Future -
         :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
         :py:class:`tornado.concurrent.Future`
+    :param int max_inflight: If the graph is multiplexed, maximum number of
+        concurrent acquisitions of a single connection.
+    :param int minsize: Number of idle connections the pool keeps open.
+        Opened by :py:meth:`warm` and replenished in the background
+    :param float max_idle: Close connections left idle for longer than this
+        many seconds (optional)
+    :param float max_lifetime: Close connections open for longer than this
+        many seconds once they are released (optional)
+    :param float ping_after: Ping connections idle for longer than this many
+        seconds before handing them out (optional)
+    :param float ping_timeout: Seconds to wait for a ping before discarding
+        the connection. 5 by default
+    :param float reap_interval: Seconds between sweeps closing expired idle
+        connections. 30 by default
+    :param int max_waiters: Maximum number of callers waiting for a
+        connection when the pool is full. Further calls to :py:meth:`acquire`
+        fail with :py:class:`gremlinclient.exceptions.PoolExhaustedError`.
+        Unbounded by default
+    :param gremlinclient.retry.RetryPolicy retry_policy: Default policy of
+        :py:meth:`submit` (optional). No retries by default
     """
     def __init__(self, graph, maxsize=256, loop=None, force_release=False,
-                 future_class=None):
+                 future_class=None, max_inflight=128, minsize=0,
+                 max_idle=None, max_lifetime=None, ping_after=None,
+                 ping_timeout=5, reap_interval=30, max_waiters=None,
+                 retry_policy=None):
         self._graph = graph
         self._maxsize = maxsize
+        self._minsize = minsize
+        # connections being opened in the background to reach minsize
+        self._replenishing = 0
         self._pool = collections.deque()
-        self._waiters = collections.deque()
+        self._waiters = _WaiterQueue()
+        self._max_waiters = max_waiters
+        # waiter -> acquire timeout handle
+        self._waiter_timers = {}
         self._acquired = set()
         self._acquiring = 0
         self._closed = False
         self._loop = loop
         self._force_release = force_release
         self._future_class = self._graph.future_class
+        self._multiplex = self._graph.multiplex
+        self._max_inflight = max_inflight
+        # conn -> number of outstanding acquisitions (multiplex only)
+        self._leases = collections.Counter()
+        self._max_idle = max_idle
+        self._max_lifetime = max_lifetime
+        self._ping_after = ping_after
+        self._ping_timeout = ping_timeout
+        self._reap_interval = reap_interval
+        # conn -> time it was returned to the pool
+        self._idle_since = {}
+        self._reaper = None
+        # conn -> time it was checked out
+        self._in_use_since = {}
+        self._stats = PoolStats(self)
+        self._listeners = []
+        self._retry_policy = retry_policy
 
     @property
     def freesize(self):
@@ -57,6 +140,29 @@ class Pool(object):
         """
         return len(self._acquired) + self._acquiring + self.freesize
 
+    @property
+    def outstanding(self):
+        """
+        Number of acquisitions not yet released, including callers waiting
+        for a connection
+
+        :returns: int
+        """
+        if self._multiplex:
+            held = sum(self._leases.values())
+        else:
+            held = len(self._acquired)
+        return held + self._acquiring - self._replenishing + len(self._waiters)
+
+    @property
+    def minsize(self):
+        """
+        Minimum number of idle connections
+
+        :returns: int
+        """
+        return self._minsize
+
     @property
     def maxsize(self):
         """
@@ -93,6 +199,15 @@ class Pool(object):
         """
         return self._closed or self._graph is None
 
+    @property
+    def stats(self):
+        """
+        Counters and histograms describing pool usage
+
+        :returns: :py:class:`gremlinclient.stats.PoolStats`
+        """
+        return self._stats
+
     @property
     def future_class(self):
         """
@@ -101,47 +216,72 @@ class Pool(object):
         """
         return self._future_class
 
-    def acquire(self):
-        # maybe have max connection open time here
+    def acquire(self, timeout=None, priority=0):
         """
         Acquire a connection from the Pool
 
+        :param float timeout: Seconds to wait for a connection when the pool
+            is full before failing with
+            :py:class:`gremlinclient.exceptions.PoolTimeoutError` (optional)
+        :param int priority: When the pool is full, waiters with lower
+            values are served first. 0 by default
+
         :returns: Future -
             :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
             :py:class:`tornado.concurrent.Future`
         """
+        start = _now()
+        future = self._acquire(timeout, priority)
+
+        def on_acquire(f):
+            if f.cancelled() or f.exception() is not None:
+                return
+            wait = _now() - start
+            self._stats.acquired += 1
+            self._stats.acquire_wait.observe(wait)
+            self._emit("acquire", wait)
+
+        if future.done():
+            on_acquire(future)
+        else:
+            future.add_done_callback(on_acquire)
+        return future
+
+    def _acquire(self, timeout, priority):
         future = self._future_class()
-        if self._pool:
-            while self._pool:
-                conn = self._pool.popleft()
-                if not conn.closed:
-                    pool_logger.debug("Reusing connection: {}".format(conn))
-                    future.set_result(conn)
-                    self._acquired.add(conn)
-                    break
-                else:
-                    pool_logger.debug(
-                        "Discarded closed connection: {}".format(conn))
+        self._start_reaper()
+        conn, idle = self._pop_idle()
+        shared = conn is None and self._multiplex and self._least_leased()
+        if conn is not None:
+            if self._ping_after is not None and idle >= self._ping_after:
+                self._check(conn, future, timeout, priority)
+            else:
+                pool_logger.debug("Reusing connection: %s", conn)
+                self._checkout(conn)
+                future.set_result(conn)
+            self._replenish()
+        elif shared:
+            pool_logger.debug("Sharing connection: %s", shared)
+            self._leases[shared] += 1
+            future.set_result(shared)
         elif self.size < self.maxsize:
-            self._acquiring += 1
-            conn_future = self.graph.connect(
-                force_release=self._force_release, pool=self)
-            def cb(f):
-                try:
-                    conn = f.result()
-                except Exception as e:
-                    future.set_exception(e)
-                else:
-                    pool_logger.debug("Got new connection {}".format(conn))
-                    self._acquired.add(conn)
-                    future.set_result(conn)
-                finally:
-                    self._acquiring -= 1
-            conn_future.add_done_callback(cb)
+            self._open(future)
+        elif (self._max_waiters is not None and
+                len(self._waiters) >= self._max_waiters):
+            self._stats.rejected += 1
+            self._emit("rejected", len(self._waiters))
+            future.set_exception(PoolExhaustedError(
+                "Pool is full and {} callers are already waiting".format(
+                    len(self._waiters))))
         else:
             pool_logger.debug(
-                "Waiting for available conn on future: {}...".format(future))
-            self._waiters.append(future)
+                "Waiting for available conn on future: %s...", future)
+            self._waiters.append(future, priority)
+            # a caller may cancel the future instead of waiting
+            future.add_done_callback(self._on_waiter_done)
+            if timeout:
+                self._waiter_timers[future] = self._graph.call_later(
+                    timeout, self._on_acquire_timeout, future, timeout)
         return future
 
     def release(self, conn):
@@ -152,38 +292,513 @@ class Pool(object):
             released
         """
         future = self._future_class()
-        if self.size <= self.maxsize:
-            if conn.closed:
-                # conn has been closed
+        if self._leases[conn] and conn not in self._acquired:
+            # a shared connection already discarded by another holder
+            self._leases[conn] -= 1
+            if not self._leases[conn]:
+                del self._leases[conn]
+            future.set_result(None)
+        elif self._leases[conn] > 1 and not conn.closed:
+            # conn is still in use by other holders
+            waiter = self._pop_waiter()
+            if waiter is not None:
+                waiter.set_result(conn)
+            else:
+                self._leases[conn] -= 1
+            future.set_result(None)
+        elif self.size <= self.maxsize:
+            leases = self._leases.pop(conn, 0)
+            self._checkin(conn)
+            if conn.closed or self._outlived(conn):
+                # conn has been closed or is due for recycling
                 pool_logger.info(
                     "Released closed connection: {}".format(conn))
-                self._acquired.remove(conn)
+                self._discarded(conn)
+                self._acquired.discard(conn)
+                if leases > 1:
+                    # the other holders only drop their lease
+                    self._leases[conn] = leases - 1
+                if not conn.closed:
+                    conn.close()
                 conn = None
-            elif self._waiters:
-                waiter = self._waiters.popleft()
-                waiter.set_result(conn)
-                pool_logger.debug(
-                    "Completeing future with connection: {}".format(conn))
+                waiter = None
+                if self.size < self.maxsize:
+                    waiter = self._pop_waiter()
+                if waiter is not None:
+                    self._open(waiter)
+                else:
+                    self._replenish()
             else:
-                self._pool.append(conn)
-                self._acquired.remove(conn)
+                waiter = self._pop_waiter()
+                if waiter is not None:
+                    self._checkout(conn)
+                    waiter.set_result(conn)
+                    pool_logger.debug(
+                        "Completeing future with connection: %s", conn)
+                else:
+                    self._put_idle(conn)
+                    self._acquired.remove(conn)
             future.set_result(None)
         else:
+            self._leases.pop(conn, None)
+            self._checkin(conn)
             future_conn = conn.close()
             future_conn.add_done_callback(
                 lambda f: future.set_result(f.result()))
         return future
 
+    def submit(self, gremlin, bindings=None, lang="gremlin-groovy",
+               aliases=None, op="eval", processor="", timeout=None,
+               handler=None, priority=0, idempotent=False,
+               retry_policy=None):
+        """
+        Send a script on a pooled connection, read the whole response and
+        release the connection. Failed attempts are retried on a fresh
+        acquisition as allowed by the retry policy.
+
+        :param str gremlin: Gremlin script to submit to server.
+        :param dict bindings: A mapping of bindings for Gremlin script.
+        :param str lang: Language of scripts submitted to the server.
+            "gremlin-groovy" by default
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str op: Gremlin Server op argument. "eval" by default.
+        :param str processor: Gremlin Server processor argument. "" by default.
+        :param float timeout: Seconds to wait for a connection when the pool
+            is full (optional)
+        :param handler: Handler function to process server response
+        :param int priority: When the pool is full, waiters with lower
+            values are served first. 0 by default
+        :param bool idempotent: The script may safely run more than once,
+            so it can be sent again after it reached the server. False by
+            default
+        :param gremlinclient.retry.RetryPolicy retry_policy: Overrides the
+            pool's policy (optional)
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to the list of
+            messages
+        """
+        future = self._future_class()
+        policy = retry_policy or self._retry_policy
+
+        def fail(error, attempt, sent):
+            if (policy is not None and not self._closed and
+                    policy.should_retry(error, attempt, sent, idempotent)):
+                delay = policy.delay(attempt)
+                self._stats.retries += 1
+                self._emit("retry", delay)
+                pool_logger.debug("Retrying in %s seconds: %s", delay, error)
+                self._graph.call_later(delay, send, attempt + 1)
+                return
+            if attempt:
+                self._stats.retry_failures += 1
+            future.set_exception(error)
+
+        def send(attempt):
+            def on_acquire(f):
+                try:
+                    conn = f.result()
+                except Exception as e:
+                    fail(e, attempt, False)
+                    return
+
+                def on_read(f):
+                    # a force-release connection was released by its
+                    # stream, before a retry is scheduled
+                    if not conn._force_release:
+                        self.release(conn)
+                    try:
+                        messages = f.result()
+                    except Exception as e:
+                        fail(e, attempt, True)
+                    else:
+                        future.set_result(messages)
+
+                try:
+                    stream = conn.send(gremlin, bindings=bindings, lang=lang,
+                                       aliases=aliases, op=op,
+                                       processor=processor, handler=handler)
+                except Exception as e:
+                    # no stream to release it
+                    self.release(conn)
+                    fail(e, attempt, False)
+                else:
+                    stream.read_all().add_done_callback(on_read)
+
+            self.acquire(timeout, priority).add_done_callback(on_acquire)
+
+        send(0)
+        return future
+
+    def submit_many(self, items, lang="gremlin-groovy", aliases=None,
+                    op="eval", processor="", timeout=None, priority=0):
+        """
+        Send many small scripts over one pooled connection with
+        :py:meth:`gremlinclient.connection.Connection.send_batch`, then
+        release the connection.
+
+        :param list items: ``(gremlin, bindings)`` pairs or bare scripts
+        :param str lang: Language of scripts submitted to the server.
+            "gremlin-groovy" by default
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str op: Gremlin Server op argument. "eval" by default.
+        :param str processor: Gremlin Server processor argument. "" by default.
+        :param float timeout: Seconds to wait for a connection when the pool
+            is full (optional)
+        :param int priority: When the pool is full, waiters with lower
+            values are served first. 0 by default
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a list of
+            :py:class:`gremlinclient.connection.BatchResult`, in submission
+            order
+        """
+        future = self._future_class()
+
+        def on_acquire(f):
+            try:
+                conn = f.result()
+            except Exception as e:
+                future.set_exception(e)
+                return
+
+            def on_batch(f):
+                if not conn._force_release:
+                    self.release(conn)
+                _copy_future(f, future)
+
+            conn.send_batch(items, lang=lang, aliases=aliases, op=op,
+                            processor=processor).add_done_callback(on_batch)
+
+        self.acquire(timeout, priority).add_done_callback(on_acquire)
+        return future
+
+    def warm(self):
+        """
+        Open connections concurrently until the pool holds
+        :py:attr:`minsize` idle connections.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolved once the new
+            connections are open. Fails with the first connection error.
+        """
+        future = self._future_class()
+        self._start_reaper()
+        pending = self._replenish()
+        if not pending:
+            future.set_result(None)
+            return future
+        remaining = [len(pending)]
+        errors = []
+
+        def on_connect(f):
+            try:
+                f.result()
+            except Exception as e:
+                errors.append(e)
+            remaining[0] -= 1
+            if not remaining[0]:
+                if errors:
+                    future.set_exception(errors[0])
+                else:
+                    future.set_result(None)
+
+        for f in pending:
+            f.add_done_callback(on_connect)
+        return future
+
+    def _replenish(self):
+        # Open enough connections in the background to keep minsize idle
+        # connections, without exceeding maxsize.
+        pending = []
+        if self.closed:
+            return pending
+        while (self.freesize + self._replenishing < self._minsize and
+               self.size < self.maxsize):
+            self._acquiring += 1
+            self._replenishing += 1
+            conn_future = self._connect()
+            conn_future.add_done_callback(self._on_replenish)
+            pending.append(conn_future)
+        return pending
+
+    def _on_replenish(self, f):
+        self._acquiring -= 1
+        self._replenishing -= 1
+        try:
+            conn = f.result()
+        except Exception as e:
+            pool_logger.warning(
+                "Could not open connection for pool: {}".format(e))
+            return
+        if self.closed:
+            conn.close()
+            return
+        waiter = self._pop_waiter()
+        if waiter is not None:
+            self._checkout(conn)
+            waiter.set_result(conn)
+        else:
+            self._put_idle(conn)
+
+    def _pop_waiter(self):
+        waiter = self._waiters.popleft()
+        timer = self._waiter_timers.pop(waiter, None)
+        if timer is not None:
+            self._graph.cancel_call(timer)
+        return waiter
+
+    def _on_waiter_done(self, future):
+        self._waiters.discard(future)
+        timer = self._waiter_timers.pop(future, None)
+        if timer is not None and self._graph is not None:
+            self._graph.cancel_call(timer)
+
+    def _on_acquire_timeout(self, future, timeout):
+        self._waiter_timers.pop(future, None)
+        if not future.done():
+            self._waiters.discard(future)
+            self._stats.timeouts += 1
+            self._emit("timeout", timeout)
+            future.set_exception(PoolTimeoutError(
+                "Timed out after {} seconds waiting for a connection".format(
+                    timeout)))
+
+    def _cancel_waiters(self):
+        waiter = self._pop_waiter()
+        while waiter is not None:
+            waiter.cancel()
+            waiter = self._pop_waiter()
+
+    def _connect(self):
+        # Open a connection for the pool, recording how long it took
+        start = _now()
+        conn_future = self.graph.connect(
+            force_release=self._force_release, pool=self)
+
+        def on_connect(f):
+            if f.cancelled() or f.exception() is not None:
+                self._stats.connect_errors += 1
+                return
+            elapsed = _now() - start
+            self._stats.created += 1
+            self._stats.connect_time.observe(elapsed)
+            self._emit("connect", elapsed)
+
+        conn_future.add_done_callback(on_connect)
+        return conn_future
+
+    def _open(self, future):
+        # Open a new connection and hand it to future
+        if self.size >= self.maxsize:
+            future.set_exception(PoolExhaustedError(
+                "Pool already holds {} connections".format(self.maxsize)))
+            return
+        self._acquiring += 1
+        conn_future = self._connect()
+        def cb(f):
+            try:
+                conn = f.result()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                pool_logger.debug("Got new connection %s", conn)
+                self._stats.opened += 1
+                self._checkout(conn)
+                future.set_result(conn)
+            finally:
+                self._acquiring -= 1
+        conn_future.add_done_callback(cb)
+
+    def _check(self, conn, future, timeout, priority):
+        # Ping a connection that sat idle before handing it out. If it
+        # fails or times out, discard it and acquire another one.
+        self._acquiring += 1
+        state = {"done": False, "timer": None}
+
+        def finish(ok):
+            state["done"] = True
+            self._acquiring -= 1
+            if ok and not self.closed:
+                pool_logger.debug("Reusing connection: %s", conn)
+                self._checkout(conn)
+                future.set_result(conn)
+                return
+            pool_logger.info("Discarded unhealthy connection: {}".format(conn))
+            self._discarded(conn)
+            conn.close()
+            if self.closed:
+                future.cancel()
+            else:
+                retry = self._acquire(timeout, priority)
+                retry.add_done_callback(lambda f: _copy_future(f, future))
+
+        def on_timeout():
+            if not state["done"]:
+                finish(False)
+
+        def on_ping(f):
+            if state["done"]:
+                return
+            if state["timer"] is not None:
+                self._graph.cancel_call(state["timer"])
+            finish(f.exception() is None)
+
+        ping = conn.ping()
+        if not ping.done() and self._ping_timeout:
+            state["timer"] = self._graph.call_later(
+                self._ping_timeout, on_timeout)
+        ping.add_done_callback(on_ping)
+
+    def _put_idle(self, conn):
+        self._idle_since[conn] = _now()
+        self._pool.append(conn)
+
+    def _pop_idle(self):
+        # Return the next usable idle connection and how long it sat idle
+        now = _now()
+        while self._pool:
+            conn = self._pool.popleft()
+            idle = now - self._idle_since.pop(conn, now)
+            if conn.closed:
+                pool_logger.debug("Discarded closed connection: %s", conn)
+                self._discarded(conn)
+            elif self._expired(conn, idle, now):
+                pool_logger.debug("Recycled expired connection: %s", conn)
+                self._discarded(conn)
+                conn.close()
+            else:
+                return conn, idle
+        return None, 0
+
+    def _expired(self, conn, idle, now):
+        return ((self._max_idle is not None and idle >= self._max_idle) or
+                self._outlived(conn, now))
+
+    def _outlived(self, conn, now=None):
+        if self._max_lifetime is None:
+            return False
+        if now is None:
+            now = _now()
+        return now - conn.created >= self._max_lifetime
+
+    def _start_reaper(self):
+        if (self._reaper is None and not self.closed and
+                self._reap_interval and
+                (self._max_idle is not None or
+                 self._max_lifetime is not None)):
+            self._reaper = self._graph.call_later(
+                self._reap_interval, self._reap)
+
+    def _stop_reaper(self):
+        if self._reaper is not None and self._graph is not None:
+            self._graph.cancel_call(self._reaper)
+        self._reaper = None
+
+    def _reap(self):
+        # Periodically close expired idle connections, then top the pool
+        # back up to minsize
+        self._reaper = None
+        if self.closed:
+            return
+        now = _now()
+        for conn in list(self._pool):
+            idle = now - self._idle_since.get(conn, now)
+            if conn.closed or self._expired(conn, idle, now):
+                pool_logger.debug("Reaped idle connection: %s", conn)
+                self._discarded(conn)
+                self._pool.remove(conn)
+                self._idle_since.pop(conn, None)
+                if not conn.closed:
+                    conn.close()
+        self._replenish()
+        self._start_reaper()
+
+    def add_listener(self, listener):
+        """
+        Subscribe to pool events, for example to feed an exporter.
+        ``listener(pool, event, value)`` is called synchronously with one of
+        these events:
+
+        * ``"acquire"``: a connection was acquired, value is the wait in
+          seconds
+        * ``"connect"``: a connection was opened, value is the connect time
+          in seconds
+        * ``"release"``: a connection was released, value is the time it was
+          in use in seconds
+        * ``"discard"``: a closed, expired or unhealthy connection was
+          dropped, value is the connection
+        * ``"timeout"``: an acquire timed out, value is the timeout
+        * ``"rejected"``: an acquire was rejected because ``max_waiters`` was
+          reached, value is the number of waiters
+        * ``"retry"``: :py:meth:`submit` will send a request again, value is
+          the delay in seconds
+
+        :param listener: Callable taking ``(pool, event, value)``
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unsubscribe a listener added with :py:meth:`add_listener`
+
+        :param listener: The listener to remove
+        """
+        self._listeners.remove(listener)
+
+    def _emit(self, event, value):
+        for listener in self._listeners:
+            try:
+                listener(self, event, value)
+            except Exception:
+                pool_logger.exception("Pool listener failed")
+
+    def _checkout(self, conn):
+        self._acquired.add(conn)
+        self._lease(conn)
+        self._in_use_since[conn] = _now()
+
+    def _checkin(self, conn):
+        since = self._in_use_since.pop(conn, None)
+        if since is not None:
+            in_use = _now() - since
+            self._stats.time_in_use.observe(in_use)
+            self._emit("release", in_use)
+
+    def _discarded(self, conn):
+        self._stats.discarded += 1
+        self._emit("discard", conn)
+
+    def _lease(self, conn):
+        if self._multiplex:
+            self._leases[conn] = 1
+
+    def _least_leased(self):
+        # Pick the open, acquired connection with the fewest holders that
+        # still has room for another request.
+        best = None
+        for conn in self._acquired:
+            leases = self._leases[conn]
+            if (not conn.closed and leases < self._max_inflight and
+                    (best is None or leases < self._leases[best])):
+                best = conn
+        return best
+
     def close(self):
         """
         Close pool
         """
+        self._stop_reaper()
+        self._idle_since.clear()
         while self.pool:
             conn = self.pool.popleft()
             conn.close()
-        while self._waiters:
-            f = self._waiters.popleft()
-            f.cancel()
+        self._cancel_waiters()
         self._graph = None
         self._closed = True
         pool_logger.info(
@@ -47,3 +47,38 @@ class Response(object):
         :returns: :py:class:`tornado.concurrent.Future`
         """
         raise NotImplementedError
+
+    def run_in_executor(self, executor, func, *args):
+        """
+        Run a function in an executor.
+
+        :param executor: :py:class:`concurrent.futures.Executor`
+        :param func: Function to run. Must be picklable for process pools.
+
+        :returns: Future resolved on the event loop with the result
+        """
+        future = self._future_class()
+        call_soon_threadsafe = self._get_call_soon_threadsafe()
+
+        def on_done(f):
+            # runs in the worker, hop back onto the loop
+            call_soon_threadsafe(_copy_future, f, future)
+
+        executor.submit(func, *args).add_done_callback(on_done)
+        return future
+
+    def _get_call_soon_threadsafe(self):
+        """
+        Get a function that schedules a callback on the event loop from
+        any thread. Called from the event loop thread.
+        """
+        raise NotImplementedError
+
+
+def _copy_future(source, target):
+    try:
+        result = source.result()
+    except Exception as e:
+        target.set_exception(e)
+    else:
+        target.set_result(result)
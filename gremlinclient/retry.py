@@ -0,0 +1,66 @@
+import random
+
+from gremlinclient.exceptions import GremlinConnectionError, PoolError
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is sent again, and when.
+
+    Errors raised before the request was written, such as a failure to
+    connect, are always retried. Once the request was written it may have
+    run on the server, so only errors marked ``retryable`` (connection lost,
+    server busy or timed out) are retried, and only for requests flagged
+    idempotent. Pool errors such as an acquire timeout are never retried.
+
+    Delays grow exponentially from ``backoff`` up to ``max_backoff``. With
+    ``jitter``, each delay is drawn uniformly between 0 and that bound so
+    clients failing together don't retry together.
+
+    :param int retries: Maximum number of times a request is sent again.
+        3 by default
+    :param float backoff: Seconds before the first retry. 0.1 by default
+    :param float max_backoff: Upper bound for the delay in seconds. 5 by
+        default
+    :param bool jitter: Randomize delays. True by default
+    """
+    def __init__(self, retries=3, backoff=0.1, max_backoff=5, jitter=True):
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+
+    @property
+    def retries(self):
+        """
+        :returns: int
+        """
+        return self._retries
+
+    def should_retry(self, error, attempt, sent=True, idempotent=False):
+        """
+        :param Exception error: The error of the last attempt
+        :param int attempt: Number of retries already made
+        :param bool sent: Whether the request was written to the server
+        :param bool idempotent: Whether the request is safe to run twice
+
+        :returns: bool
+        """
+        if attempt >= self._retries or isinstance(error, PoolError):
+            return False
+        if not sent:
+            return isinstance(error, GremlinConnectionError)
+        return idempotent and getattr(error, "retryable", False)
+
+    def delay(self, attempt):
+        """
+        Seconds to wait before the next retry
+
+        :param int attempt: Number of retries already made
+
+        :returns: float
+        """
+        delay = min(self._backoff * 2 ** attempt, self._max_backoff)
+        if self._jitter:
+            delay = random.uniform(0, delay)
+        return delay
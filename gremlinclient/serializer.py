@@ -0,0 +1,613 @@
+import json
+import struct
+import sys
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+PY_36 = sys.version_info >= (3, 6)
+
+
+# Only orjson parses bytes and memoryviews in place. json and ujson take
+# bytes too, but decode them to text internally.
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    _loads_buffer = True
+elif ujson is not None:
+    def _dumps(obj):
+        return ujson.dumps(obj).encode("utf-8")
+    _loads = ujson.loads
+    _loads_buffer = False
+else:
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+    if PY_36 or sys.version_info < (3,):
+        _loads = json.loads
+    else:
+        def _loads(data):
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            return json.loads(data)
+    _loads_buffer = False
+
+
+_serializers = {}
+
+
+def register_serializer(serializer_class):
+    """
+    Register a serializer class under its mime type so it can be selected
+    by name, e.g. ``GraphDatabase(url, serializer="application/json")``.
+    Can be used as a class decorator.
+
+    :param class serializer_class: Subclass of
+        :py:class:`gremlinclient.serializer.Serializer`
+
+    :returns: serializer_class
+    """
+    _serializers[serializer_class.mime_type] = serializer_class
+    return serializer_class
+
+
+def get_serializer(mime_type):
+    """
+    Get a serializer instance for a mime type.
+
+    :param str mime_type: A registered mime type
+
+    :returns: :py:class:`gremlinclient.serializer.Serializer`
+    """
+    try:
+        serializer_class = _serializers[mime_type]
+    except KeyError:
+        raise ValueError("Unknown mime type.")
+    return serializer_class()
+
+
+class Serializer(object):
+    """
+    Base class for request/response serializers. A serializer turns request
+    messages into the bytes written to the websocket, including the mime
+    type header expected by the Gremlin Server, and parses response frames
+    back into message dicts.
+    """
+
+    mime_type = None
+
+    def __init__(self):
+        mime_type = self.mime_type.encode("utf-8")
+        self._header = struct.pack(">B", len(mime_type)) + mime_type
+
+    @property
+    def header(self):
+        """
+        Mime type header that prefixes every request.
+
+        :returns: bytes
+        """
+        return self._header
+
+    def serialize_message(self, message):
+        """
+        Serialize a request message.
+
+        :param dict message: The request message.
+
+        :returns: bytes
+        """
+        raise NotImplementedError
+
+    def serialize_request(self, request_id, op, processor, gremlin, bindings,
+                          lang, aliases, session=None,
+                          evaluation_timeout=None):
+        """
+        Serialize a script request. Subclasses can override this to avoid
+        building the message dict.
+
+        :param str request_id: Request id. Typically a uuid
+        :param str op: Gremlin Server op argument.
+        :param str processor: Gremlin Server processor argument.
+        :param str gremlin: Gremlin script.
+        :param dict bindings: A mapping of bindings for Gremlin script.
+        :param str lang: Language of the script.
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str session: Session id (optional). Typically a uuid
+        :param int evaluation_timeout: Milliseconds the server may spend
+            evaluating the script, sent as ``scriptEvaluationTimeout``
+            (optional)
+
+        :returns: bytes
+        """
+        args = {
+            "gremlin": gremlin,
+            "bindings": bindings,
+            "language":  lang,
+            "aliases": aliases
+        }
+        if session is not None:
+            args["session"] = session
+        if evaluation_timeout is not None:
+            args["scriptEvaluationTimeout"] = evaluation_timeout
+        return self.serialize_message({
+            "requestId": request_id,
+            "op": op,
+            "processor": processor,
+            "args": args
+        })
+
+    def deserialize_message(self, data, skip_meta=False):
+        """
+        Parse a response frame.
+
+        :param data: The frame read off the websocket, as :py:class:`bytes`,
+            :py:class:`memoryview` or, for text frames, :py:class:`str`.
+        :param bool skip_meta: Leave the result meta out of the message.
+            Serializers that can should skip it without decoding it. False
+            by default
+
+        :returns: dict
+        """
+        raise NotImplementedError
+
+    def envelope(self):
+        """
+        Get an envelope for the script requests of one connection.
+
+        :returns: :py:class:`gremlinclient.serializer.Envelope`
+        """
+        return Envelope(self)
+
+
+class Envelope(object):
+    """
+    Request message allocated once per connection. Each script request
+    swaps its values into the same message dict before serializing it,
+    instead of building new dicts. Serializers that override
+    :py:meth:`Serializer.serialize_request` are called directly.
+
+    :param gremlinclient.serializer.Serializer serializer: Serializer of the
+        connection
+    """
+    def __init__(self, serializer):
+        self._serializer = serializer
+        serialize_request = type(serializer).serialize_request
+        self._custom = getattr(serialize_request, "__func__",
+                               serialize_request) is not _serialize_request
+        self._args = {
+            "gremlin": None,
+            "bindings": None,
+            "language": None,
+            "aliases": None
+        }
+        self._message = {
+            "requestId": None,
+            "op": None,
+            "processor": None,
+            "args": self._args
+        }
+
+    def request(self, request_id, op, processor, gremlin, bindings, lang,
+                aliases, session=None, evaluation_timeout=None):
+        """
+        Serialize a script request. Takes the parameters of
+        :py:meth:`Serializer.serialize_request`.
+
+        :returns: bytes
+        """
+        if self._custom:
+            return self._serializer.serialize_request(
+                request_id, op, processor, gremlin, bindings, lang, aliases,
+                session=session, evaluation_timeout=evaluation_timeout)
+        args = self._args
+        args["gremlin"] = gremlin
+        args["bindings"] = bindings
+        args["language"] = lang
+        args["aliases"] = aliases
+        if session is not None:
+            args["session"] = session
+        else:
+            args.pop("session", None)
+        if evaluation_timeout is not None:
+            args["scriptEvaluationTimeout"] = evaluation_timeout
+        else:
+            args.pop("scriptEvaluationTimeout", None)
+        message = self._message
+        message["requestId"] = request_id
+        message["op"] = op
+        message["processor"] = processor
+        try:
+            return self._serializer.serialize_message(message)
+        finally:
+            # don't keep the request's bindings alive
+            args["gremlin"] = args["bindings"] = None
+
+
+_serialize_request = Serializer.__dict__["serialize_request"]
+
+
+@register_serializer
+class JSONSerializer(Serializer):
+    """
+    Serializer for ``application/json``. Uses :py:mod:`orjson` or
+    :py:mod:`ujson` if installed, falling back to :py:mod:`json`. Only
+    :py:mod:`orjson` parses frames without copying them to text first.
+
+    :param func dumps: Encode an object to JSON ``bytes`` (optional)
+    :param func loads: Decode JSON ``bytes`` or ``str`` to an object
+        (optional)
+    """
+
+    mime_type = "application/json"
+
+    def __init__(self, dumps=None, loads=None):
+        super(JSONSerializer, self).__init__()
+        self._dumps = dumps or _dumps
+        self._loads = loads or _loads
+        self._loads_buffer = loads is None and _loads_buffer
+
+    def serialize_message(self, message):
+        return b"".join([self._header, self._dumps(message)])
+
+    def deserialize_message(self, data, skip_meta=False):
+        if isinstance(data, memoryview) and not self._loads_buffer:
+            # decode the buffer to text once, rather than copying it to
+            # bytes that the parser decodes again
+            data = (data.tobytes() if sys.version_info < (3,) else
+                    str(data, "utf-8"))
+        message = self._loads(data)
+        if skip_meta:
+            # JSON has to be parsed whole, the meta can only be dropped
+            message["result"].pop("meta", None)
+        return message
+
+
+class TemplateJSONSerializer(JSONSerializer):
+    """
+    JSON serializer that caches the encoded parts of script requests that
+    rarely change (op, processor, language, aliases and session). Only
+    ``requestId``, ``gremlin`` and ``bindings`` are encoded per request, and
+    the pieces are joined into a single buffer.
+
+    :param func dumps: Encode an object to JSON ``bytes`` (optional)
+    :param func loads: Decode JSON to an object (optional)
+    :param int max_templates: Number of templates to cache before the cache
+        is reset.
+    """
+
+    def __init__(self, dumps=None, loads=None, max_templates=256):
+        super(TemplateJSONSerializer, self).__init__(dumps=dumps, loads=loads)
+        self._max_templates = max_templates
+        self._templates = {}
+
+    def serialize_request(self, request_id, op, processor, gremlin, bindings,
+                          lang, aliases, session=None,
+                          evaluation_timeout=None):
+        key = (op, processor, lang, session,
+               tuple(sorted(aliases.items())) if aliases else (),
+               evaluation_timeout)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._compile(op, processor, lang, aliases, session,
+                                     evaluation_timeout)
+            if len(self._templates) >= self._max_templates:
+                self._templates.clear()
+            self._templates[key] = template
+        prefix, middle, bindings_key, suffix = template
+        dumps = self._dumps
+        return b"".join([prefix, dumps(request_id), middle, dumps(gremlin),
+                         bindings_key, dumps(bindings), suffix])
+
+    def _compile(self, op, processor, lang, aliases, session,
+                 evaluation_timeout):
+        dumps = self._dumps
+        prefix = self._header + b'{"requestId":'
+        middle = b"".join([b',"op":', dumps(op),
+                           b',"processor":', dumps(processor),
+                           b',"args":{"gremlin":'])
+        bindings_key = b',"bindings":'
+        suffix = [b',"language":', dumps(lang),
+                  b',"aliases":', dumps(aliases or {})]
+        if session is not None:
+            suffix.extend([b',"session":', dumps(session)])
+        if evaluation_timeout is not None:
+            suffix.extend([b',"scriptEvaluationTimeout":',
+                           dumps(evaluation_timeout)])
+        suffix.append(b"}}")
+        return prefix, middle, bindings_key, b"".join(suffix)
+
+
+@register_serializer
+class GraphBinarySerializer(Serializer):
+    """
+    Serializer for ``application/vnd.graphbinary-v1.0``. Responses are
+    parsed straight from the received bytes without decoding them to text,
+    and a skipped result meta is stepped over without being decoded.
+
+    Supports the core GraphBinary types: null, booleans, numbers, strings,
+    uuids, dates, lists, sets, maps, bytes and the graph elements. Elements
+    are returned as dicts, e.g. ``{"id": 1, "label": "person",
+    "type": "vertex"}``.
+    """
+
+    mime_type = "application/vnd.graphbinary-v1.0"
+
+    VERSION = 0x81
+
+    def serialize_message(self, message):
+        buf = bytearray(self._header)
+        buf.append(self.VERSION)
+        buf.extend(uuid.UUID(message["requestId"]).bytes)
+        _write_string(buf, message["op"])
+        _write_string(buf, message["processor"])
+        _write_map(buf, message["args"])
+        return bytes(buf)
+
+    def deserialize_message(self, data, skip_meta=False):
+        buf = memoryview(data)
+        if struct.unpack_from(">B", buf, 0)[0] != self.VERSION:
+            raise ValueError("Unsupported GraphBinary version.")
+        request_id = None
+        offset = 1
+        if not _is_null(buf, offset):
+            request_id = str(uuid.UUID(
+                bytes=buf[offset + 1:offset + 17].tobytes()))
+            offset += 16
+        offset += 1
+        code, = struct.unpack_from(">i", buf, offset)
+        offset += 4
+        message = None
+        if not _is_null(buf, offset):
+            message, offset = _read_string(buf, offset + 1)
+        else:
+            offset += 1
+        attributes, offset = _read_map(buf, offset)
+        if skip_meta:
+            offset = _skip_map(buf, offset)
+        else:
+            meta, offset = _read_map(buf, offset)
+        result, offset = _read(buf, offset)
+        message = {
+            "requestId": request_id,
+            "status": {
+                "code": code,
+                "message": message,
+                "attributes": attributes
+            },
+            "result": {
+                "data": result
+            }
+        }
+        if not skip_meta:
+            message["result"]["meta"] = meta
+        return message
+
+
+# GraphBinary type codes
+INT = 0x01
+LONG = 0x02
+STRING = 0x03
+DATE = 0x04
+TIMESTAMP = 0x05
+DOUBLE = 0x07
+FLOAT = 0x08
+LIST = 0x09
+MAP = 0x0a
+SET = 0x0b
+UUID = 0x0c
+EDGE = 0x0d
+PROPERTY = 0x0f
+VERTEX = 0x11
+VERTEX_PROPERTY = 0x12
+TRAVERSER = 0x21
+BYTE = 0x24
+BYTE_BUFFER = 0x25
+SHORT = 0x26
+BOOLEAN = 0x27
+UNSPECIFIED_NULL = 0xfe
+
+_NULL = 0x01
+
+try:
+    _text_type = unicode
+    _int_types = (int, long)
+except NameError:
+    _text_type = str
+    _int_types = (int,)
+
+
+def _write_string(buf, value):
+    value = value.encode("utf-8")
+    buf.extend(struct.pack(">i", len(value)))
+    buf.extend(value)
+
+
+def _write_map(buf, value):
+    buf.extend(struct.pack(">i", len(value)))
+    for key, item in value.items():
+        _write(buf, key)
+        _write(buf, item)
+
+
+def _write(buf, value):
+    # Fully qualified: {type_code}{value_flag}{value}
+    if value is None:
+        buf.append(UNSPECIFIED_NULL)
+        buf.append(_NULL)
+    elif isinstance(value, bool):
+        buf.extend(struct.pack(">BB?", BOOLEAN, 0, value))
+    elif isinstance(value, _int_types):
+        if -2 ** 31 <= value < 2 ** 31:
+            buf.extend(struct.pack(">BBi", INT, 0, value))
+        else:
+            buf.extend(struct.pack(">BBq", LONG, 0, value))
+    elif isinstance(value, float):
+        buf.extend(struct.pack(">BBd", DOUBLE, 0, value))
+    elif isinstance(value, (_text_type, str)):
+        buf.extend(struct.pack(">BB", STRING, 0))
+        _write_string(buf, value)
+    elif isinstance(value, dict):
+        buf.extend(struct.pack(">BB", MAP, 0))
+        _write_map(buf, value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        type_code = LIST if isinstance(value, (list, tuple)) else SET
+        buf.extend(struct.pack(">BBi", type_code, 0, len(value)))
+        for item in value:
+            _write(buf, item)
+    elif isinstance(value, uuid.UUID):
+        buf.extend(struct.pack(">BB", UUID, 0))
+        buf.extend(value.bytes)
+    else:
+        raise TypeError(
+            "Cannot serialize {} to GraphBinary".format(type(value)))
+
+
+def _is_null(buf, offset):
+    return struct.unpack_from(">B", buf, offset)[0] == _NULL
+
+
+def _read_string(buf, offset):
+    length, = struct.unpack_from(">i", buf, offset)
+    offset += 4
+    end = offset + length
+    return buf[offset:end].tobytes().decode("utf-8"), end
+
+
+def _read_items(buf, offset):
+    length, = struct.unpack_from(">i", buf, offset)
+    offset += 4
+    items = []
+    for _ in range(length):
+        item, offset = _read(buf, offset)
+        items.append(item)
+    return items, offset
+
+
+def _read_map(buf, offset):
+    length, = struct.unpack_from(">i", buf, offset)
+    offset += 4
+    value = {}
+    for _ in range(length):
+        key, offset = _read(buf, offset)
+        item, offset = _read(buf, offset)
+        if isinstance(key, list):
+            key = tuple(key)
+        value[key] = item
+    return value, offset
+
+
+_scalars = {
+    INT: struct.Struct(">i"),
+    LONG: struct.Struct(">q"),
+    DATE: struct.Struct(">q"),
+    TIMESTAMP: struct.Struct(">q"),
+    DOUBLE: struct.Struct(">d"),
+    FLOAT: struct.Struct(">f"),
+    BYTE: struct.Struct(">b"),
+    SHORT: struct.Struct(">h"),
+    BOOLEAN: struct.Struct(">?"),
+}
+
+
+def _read(buf, offset):
+    # Read a fully qualified value, returns (value, new offset)
+    type_code, flag = struct.unpack_from(">BB", buf, offset)
+    offset += 2
+    if flag & _NULL:
+        return None, offset
+    scalar = _scalars.get(type_code)
+    if scalar is not None:
+        return scalar.unpack_from(buf, offset)[0], offset + scalar.size
+    if type_code == STRING:
+        return _read_string(buf, offset)
+    if type_code == LIST:
+        return _read_items(buf, offset)
+    if type_code == SET:
+        return _read_items(buf, offset)
+    if type_code == MAP:
+        return _read_map(buf, offset)
+    if type_code == UUID:
+        value = uuid.UUID(bytes=buf[offset:offset + 16].tobytes())
+        return value, offset + 16
+    if type_code == BYTE_BUFFER:
+        length, = struct.unpack_from(">i", buf, offset)
+        offset += 4
+        return buf[offset:offset + length].tobytes(), offset + length
+    if type_code == VERTEX:
+        vid, offset = _read(buf, offset)
+        label, offset = _read_string(buf, offset)
+        _, offset = _read(buf, offset)
+        return {"id": vid, "label": label, "type": "vertex"}, offset
+    if type_code == EDGE:
+        eid, offset = _read(buf, offset)
+        label, offset = _read_string(buf, offset)
+        in_v, offset = _read(buf, offset)
+        in_v_label, offset = _read_string(buf, offset)
+        out_v, offset = _read(buf, offset)
+        out_v_label, offset = _read_string(buf, offset)
+        _, offset = _read(buf, offset)
+        _, offset = _read(buf, offset)
+        return {"id": eid, "label": label, "type": "edge",
+                "inV": in_v, "inVLabel": in_v_label,
+                "outV": out_v, "outVLabel": out_v_label}, offset
+    if type_code == VERTEX_PROPERTY:
+        pid, offset = _read(buf, offset)
+        label, offset = _read_string(buf, offset)
+        value, offset = _read(buf, offset)
+        _, offset = _read(buf, offset)
+        _, offset = _read(buf, offset)
+        return {"id": pid, "label": label, "value": value}, offset
+    if type_code == PROPERTY:
+        key, offset = _read_string(buf, offset)
+        value, offset = _read(buf, offset)
+        _, offset = _read(buf, offset)
+        return {"key": key, "value": value}, offset
+    if type_code == TRAVERSER:
+        bulk, = struct.unpack_from(">q", buf, offset)
+        value, offset = _read(buf, offset + 8)
+        return {"bulk": bulk, "value": value}, offset
+    raise ValueError(
+        "Unsupported GraphBinary type code: {:#x}".format(type_code))
+
+
+def _skip_items(buf, offset, count):
+    for _ in range(count):
+        offset = _skip(buf, offset)
+    return offset
+
+
+def _skip_map(buf, offset):
+    length, = struct.unpack_from(">i", buf, offset)
+    return _skip_items(buf, offset + 4, 2 * length)
+
+
+def _skip(buf, offset):
+    # Step over a fully qualified value without decoding it, returns the
+    # new offset. Graph elements are rare in meta and are read instead.
+    type_code, flag = struct.unpack_from(">BB", buf, offset)
+    if flag & _NULL:
+        return offset + 2
+    scalar = _scalars.get(type_code)
+    if scalar is not None:
+        return offset + 2 + scalar.size
+    if type_code in (STRING, BYTE_BUFFER):
+        length, = struct.unpack_from(">i", buf, offset + 2)
+        return offset + 6 + length
+    if type_code in (LIST, SET):
+        length, = struct.unpack_from(">i", buf, offset + 2)
+        return _skip_items(buf, offset + 6, length)
+    if type_code == MAP:
+        return _skip_map(buf, offset + 2)
+    if type_code == UUID:
+        return offset + 18
+    return _read(buf, offset)[1]
@@ -0,0 +1,257 @@
+import collections
+
+from gremlinclient.cache import _request_session, _send, make_key
+
+
+class SharedStream(object):
+    """
+    One caller's view of a response shared by
+    :py:class:`gremlinclient.singleflight.SingleFlight`. Every caller reads
+    all messages of the response from the start, at its own pace.
+    Supports :py:meth:`read` and :py:meth:`read_all` like
+    :py:class:`gremlinclient.connection.Stream`.
+    """
+    def __init__(self, flight, future_class):
+        self._flight = flight
+        self._future_class = future_class
+        self._index = 0
+        self._pending = collections.deque()
+        flight.subscribers.append(self)
+
+    def read(self):
+        """
+        Read the next message, ``None`` once all were read.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future`
+        """
+        future = self._future_class()
+        self._pending.append(future)
+        self._deliver()
+        return future
+
+    def read_all(self):
+        """
+        Read all remaining messages.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a list of
+            messages
+        """
+        future = self._future_class()
+        messages = []
+
+        def on_read(f):
+            while True:
+                try:
+                    message = f.result()
+                except Exception as e:
+                    future.set_exception(e)
+                    return
+                if message is None:
+                    future.set_result(messages)
+                    return
+                messages.append(message)
+                f = self.read()
+                if not f.done():
+                    f.add_done_callback(on_read)
+                    return
+
+        f = self.read()
+        if f.done():
+            on_read(f)
+        else:
+            f.add_done_callback(on_read)
+        return future
+
+    def _deliver(self):
+        flight = self._flight
+        while self._pending:
+            if self._index < len(flight.messages):
+                self._index += 1
+                self._pending.popleft().set_result(
+                    flight.messages[self._index - 1])
+            elif flight.error is not None:
+                self._pending.popleft().set_exception(flight.error)
+            elif flight.finished:
+                self._pending.popleft().set_result(None)
+            else:
+                return
+
+
+class _Flight(object):
+    # One in flight request and the messages read from it so far
+
+    def __init__(self, on_finish):
+        self.messages = []
+        self.subscribers = []
+        self.finished = False
+        self.error = None
+        self._on_finish = on_finish
+
+    def fail(self, error):
+        self.error = error
+        self._finish()
+
+    def start(self, stream):
+        # Read the leader's stream eagerly, looping while reads complete
+        # immediately to avoid deep recursion
+        def on_read(f):
+            while True:
+                try:
+                    message = f.result()
+                except Exception as e:
+                    self.fail(e)
+                    return
+                if message is None:
+                    self._finish()
+                    return
+                self.messages.append(message)
+                for subscriber in self.subscribers:
+                    subscriber._deliver()
+                f = stream.read()
+                if not f.done():
+                    f.add_done_callback(on_read)
+                    return
+
+        f = stream.read()
+        if f.done():
+            on_read(f)
+        else:
+            f.add_done_callback(on_read)
+
+    def _finish(self):
+        self.finished = True
+        self._on_finish()
+        for subscriber in self.subscribers:
+            subscriber._deliver()
+
+
+def _target(conn):
+    # Requests are only shared between connections of the same pool, or
+    # of the same server for connections outside a pool
+    if conn._pool is not None:
+        return conn._pool
+    if conn._graph is not None:
+        return conn._graph.url
+    return conn
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical concurrent requests. While a request is in flight,
+    callers sending the same script with the same bindings, language,
+    aliases and session to the same pool or server don't go to the server:
+    they share the response of the first caller. Nothing is kept once the
+    response has been read, so requests sent afterwards go to the server
+    again.
+
+    Only use it for idempotent reads. Callers joining a request in flight
+    get the messages as processed by the first caller's handler.
+    """
+    def __init__(self):
+        # key -> _Flight
+        self._inflight = {}
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def send(self, conn, gremlin, bindings=None, lang="gremlin-groovy",
+             aliases=None, op="eval", processor="", session=None,
+             timeout=None, handler=None):
+        """
+        Send a message using a connection, unless an identical request is
+        already in flight.
+
+        :param gremlinclient.connection.Connection conn: Connection used if
+            no identical request is in flight. A
+            :py:class:`gremlinclient.connection.Session` sends with its own
+            processor and session
+        :param str gremlin: Gremlin script to submit to server.
+        :param dict bindings: A mapping of bindings for Gremlin script.
+        :param str lang: Language of scripts submitted to the server.
+            "gremlin-groovy" by default
+        :param dict aliases: Rebind ``Graph`` and ``TraversalSource``
+            objects to different variable names in the current request
+        :param str op: Gremlin Server op argument. "eval" by default.
+        :param str processor: Gremlin Server processor argument. "" by
+            default.
+        :param str session: Session id (optional). Typically a uuid
+        :param float timeout: Deadline in seconds for reading the whole
+            response (optional). Values ``0`` or ``None`` mean no deadline
+        :param handler: Handler function to process server response
+
+        :returns: :py:class:`gremlinclient.singleflight.SharedStream` object
+        """
+        processor, session = _request_session(conn, processor, session)
+        key = (_target(conn), make_key(gremlin, bindings, lang, aliases, op,
+                                       processor, session=session))
+        flight = self._inflight.get(key)
+        if flight is not None:
+            conn._finish()
+            return SharedStream(flight, conn._future_class)
+        stream = _send(conn, gremlin, bindings, lang, aliases, op, processor,
+                       session, timeout, handler)
+        flight = self._inflight[key] = _Flight(
+            lambda: self._inflight.pop(key, None))
+        shared = SharedStream(flight, conn._future_class)
+        flight.start(stream)
+        return shared
+
+    def submit(self, pool, gremlin, bindings=None, lang="gremlin-groovy",
+               aliases=None, op="eval", processor="", session=None,
+               timeout=None, handler=None):
+        """
+        Submit a script using a connection from ``pool``, unless an
+        identical request is already in flight. Only the first caller
+        acquires a connection; it is released once the response was read.
+
+        :param gremlinclient.pool.Pool pool: Pool to acquire from
+
+        Other parameters are the same as :py:meth:`send`.
+
+        :returns: Future -
+            :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+            :py:class:`tornado.concurrent.Future` resolving to a
+            :py:class:`gremlinclient.singleflight.SharedStream`
+        """
+        future_class = pool.future_class
+        future = future_class()
+        key = (pool, make_key(gremlin, bindings, lang, aliases, op,
+                              processor, session=session))
+        flight = self._inflight.get(key)
+        if flight is not None:
+            future.set_result(SharedStream(flight, future_class))
+            return future
+        acquired = []
+
+        def on_finish():
+            self._inflight.pop(key, None)
+            # a pool with force_release releases as the stream ends
+            if acquired and not acquired[0]._force_release:
+                pool.release(acquired[0])
+
+        flight = self._inflight[key] = _Flight(on_finish)
+        future.set_result(SharedStream(flight, future_class))
+
+        def on_acquire(f):
+            try:
+                conn = f.result()
+            except Exception as e:
+                flight.fail(e)
+                return
+            acquired.append(conn)
+            try:
+                stream = conn.send(gremlin, bindings=bindings, lang=lang,
+                                   aliases=aliases, op=op,
+                                   processor=processor, session=session,
+                                   timeout=timeout, handler=handler)
+            except Exception as e:
+                flight.fail(e)
+            else:
+                flight.start(stream)
+
+        pool.acquire().add_done_callback(on_acquire)
+        return future
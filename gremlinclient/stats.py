@@ -0,0 +1,165 @@
+import bisect
+
+
+# Upper bounds in seconds of the default histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(object):
+    """
+    Fixed bucket histogram of durations, cheap enough to update on every
+    acquire and release.
+
+    :param tuple buckets: Sorted bucket upper bounds in seconds
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._bounds = tuple(buckets)
+        # the last slot counts values above the highest bound
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    @property
+    def count(self):
+        """
+        Number of observations
+
+        :returns: int
+        """
+        return self._count
+
+    @property
+    def sum(self):
+        """
+        Sum of all observations in seconds
+
+        :returns: float
+        """
+        return self._sum
+
+    @property
+    def buckets(self):
+        """
+        Cumulative counts per upper bound, Prometheus style. The last bound
+        is ``float("inf")``
+
+        :returns: list of ``(upper_bound, count)`` tuples
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(self._bounds + (float("inf"),),
+                                self._counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def observe(self, value):
+        """
+        Record one observation
+
+        :param float value: Duration in seconds
+        """
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile as the upper bound of the bucket containing it
+
+        :param float q: Quantile between 0 and 1
+
+        :returns: float or ``None`` if nothing was observed
+        """
+        if not self._count:
+            return None
+        rank = q * self._count
+        for bound, total in self.buckets:
+            if total >= rank:
+                return bound
+
+    def as_dict(self):
+        return {"count": self._count,
+                "sum": self._sum,
+                "buckets": self.buckets}
+
+
+class PoolStats(object):
+    """
+    Counters and histograms collected by :py:class:`gremlinclient.pool.Pool`.
+    Read them through :py:attr:`gremlinclient.pool.Pool.stats`.
+
+    :param gremlinclient.pool.Pool pool: The pool being measured
+    """
+    def __init__(self, pool):
+        self._pool = pool
+        #: Time callers waited in :py:meth:`gremlinclient.pool.Pool.acquire`
+        self.acquire_wait = Histogram()
+        #: Time taken to open new connections
+        self.connect_time = Histogram()
+        #: Time each connection was held between acquire and release
+        self.time_in_use = Histogram()
+        #: Successful acquisitions
+        self.acquired = 0
+        #: Connections opened by the pool
+        self.created = 0
+        #: Acquisitions that had to open a new connection. Connections
+        #: opened by :py:meth:`gremlinclient.pool.Pool.warm` and to keep
+        #: ``minsize`` idle connections are not counted
+        self.opened = 0
+        #: Failed attempts to open a connection
+        self.connect_errors = 0
+        #: Closed, expired or unhealthy connections dropped by the pool
+        self.discarded = 0
+        #: Acquisitions that timed out waiting
+        self.timeouts = 0
+        #: Acquisitions rejected because ``max_waiters`` was reached
+        self.rejected = 0
+        #: Requests sent again by :py:meth:`gremlinclient.pool.Pool.submit`
+        self.retries = 0
+        #: Retried requests that still failed
+        self.retry_failures = 0
+
+    @property
+    def waiters(self):
+        """
+        Current number of callers waiting for a connection
+
+        :returns: int
+        """
+        return len(self._pool._waiters)
+
+    @property
+    def reuse_ratio(self):
+        """
+        Fraction of acquisitions served without opening a new connection
+
+        :returns: float
+        """
+        if not self.acquired:
+            return 0.0
+        return max(0.0, 1.0 - float(self.opened) / self.acquired)
+
+    def as_dict(self):
+        """
+        Snapshot of all stats, suitable for an exporter
+
+        :returns: dict
+        """
+        return {"size": self._pool.size,
+                "freesize": self._pool.freesize,
+                "waiters": self.waiters,
+                "acquired": self.acquired,
+                "created": self.created,
+                "opened": self.opened,
+                "connect_errors": self.connect_errors,
+                "discarded": self.discarded,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "retries": self.retries,
+                "retry_failures": self.retry_failures,
+                "reuse_ratio": self.reuse_ratio,
+                "acquire_wait": self.acquire_wait.as_dict(),
+                "connect_time": self.connect_time.as_dict(),
+                "time_in_use": self.time_in_use.as_dict()}
@@ -0,0 +1 @@
+from gremlinclient.testing.server import ConnectionState, FakeGremlinServer
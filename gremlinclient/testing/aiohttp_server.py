@@ -0,0 +1,79 @@
+import asyncio
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:
+    raise ImportError(
+        "Please install aiohttp to use the gremlinclient.testing."
+        "aiohttp_server module")
+
+from gremlinclient.testing.server import ConnectionState
+
+
+# asyncio.async is a syntax error on newer Pythons
+_ensure_future = getattr(asyncio, "ensure_future", None) or getattr(
+    asyncio, "async")
+
+
+def make_handler(server):
+    """
+    :param gremlinclient.testing.server.FakeGremlinServer server: The fake
+        server
+
+    :returns: aiohttp request handler serving ``server`` over a websocket.
+        Requests are answered concurrently
+    """
+    @asyncio.coroutine
+    def respond(ws, state, data):
+        latency, frames = server.handle(state, data)
+        if latency:
+            yield from asyncio.sleep(latency)
+        if frames is None:
+            yield from ws.close()
+            return
+        for frame in frames:
+            if ws.closed:
+                return
+            ws.send_str(frame)
+
+    @asyncio.coroutine
+    def handler(request):
+        ws = web.WebSocketResponse()
+        yield from ws.prepare(request)
+        state = ConnectionState()
+        while True:
+            msg = yield from ws.receive()
+            if msg.tp in (aiohttp.MsgType.binary, aiohttp.MsgType.text):
+                _ensure_future(respond(ws, state, msg.data),
+                               loop=request.app.loop)
+            else:
+                break
+        return ws
+
+    return handler
+
+
+@asyncio.coroutine
+def listen(server, port=0, host="127.0.0.1", loop=None):
+    """
+    Serve a fake server and set its ``url``.
+
+    :param gremlinclient.testing.server.FakeGremlinServer server: The fake
+        server
+    :param int port: Port to listen on. A free port by default
+    :param str host: Address to bind. "127.0.0.1" by default
+    :param loop: Event loop (optional)
+
+    :returns: :py:class:`asyncio.AbstractServer`, stop it with
+        :py:meth:`asyncio.AbstractServer.close`
+    """
+    loop = loop or asyncio.get_event_loop()
+    handler = make_handler(server)
+    app = web.Application(loop=loop)
+    app.router.add_route("GET", "/", handler)
+    app.router.add_route("GET", "/gremlin", handler)
+    srv = yield from loop.create_server(app.make_handler(), host, port)
+    port = srv.sockets[0].getsockname()[1]
+    server.url = "ws://{}:{}/".format(host, port)
+    return srv
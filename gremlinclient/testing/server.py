@@ -0,0 +1,181 @@
+import base64
+import json
+import struct
+
+
+class _Script(object):
+
+    def __init__(self, result, status_code, message, latency, drop):
+        self.result = result
+        self.status_code = status_code
+        self.message = message
+        self.latency = latency
+        self.drop = drop
+
+
+class ConnectionState(object):
+    """
+    Per websocket state kept by the server handlers: whether the client
+    authenticated, and the request waiting for the SASL exchange.
+    """
+    def __init__(self):
+        self.authenticated = False
+        self.pending = None
+
+
+class FakeGremlinServer(object):
+    """
+    In-process stand in for a Gremlin Server, speaking the websocket
+    request/response envelope with ``application/json``. It does not
+    evaluate Gremlin: scripts get the responses registered with
+    :py:meth:`script`. Serve it with
+    :py:func:`gremlinclient.testing.tornado_server.listen` or
+    :py:func:`gremlinclient.testing.aiohttp_server.listen`::
+
+        server = FakeGremlinServer(frame_size=2)
+        server.script("g.V().count()", [6])
+        server.script("x + x", lambda bindings: bindings["x"] * 2)
+        listen(server)
+        pool = Pool(server.url)
+
+    :param float latency: Seconds before the first frame of each response.
+        0 by default
+    :param int frame_size: Result items per frame, like the server's
+        ``resultIterationBatchSize``. Larger results are sent as 206
+        partial frames. 64 by default
+    :param str username: If set, every connection must authenticate with
+        SASL PLAIN: its first request gets a 407 challenge
+    :param str password: Password checked with ``username``
+    :param default: Callable taking ``(gremlin, bindings)`` for scripts
+        without a registered response (optional). By default they fail with
+        status 597
+    """
+    def __init__(self, latency=0, frame_size=64, username=None, password="",
+                 default=None):
+        self.latency = latency
+        self.frame_size = frame_size
+        self._username = username
+        self._password = password
+        self._default = default
+        self._scripts = {}
+        #: Requests received, as decoded message dicts
+        self.requests = []
+        #: Url of the listening server, set by ``listen``
+        self.url = None
+
+    def script(self, gremlin, result=None, status_code=200, message="",
+               latency=None, drop=False):
+        """
+        Register the response to a script.
+
+        :param str gremlin: Script, matched exactly
+        :param result: List of result items, a single item, or a callable
+            taking the bindings and returning either. An exception raised by
+            the callable is sent as a 597 error
+        :param int status_code: Status of the response. Error codes are sent
+            with ``message`` and no data
+        :param str message: Status message
+        :param float latency: Overrides the server's latency (optional)
+        :param bool drop: Close the websocket instead of answering, to
+            test lost connections
+        """
+        self._scripts[gremlin] = _Script(result, status_code, message,
+                                         latency, drop)
+
+    def handle(self, state, data):
+        """
+        Answer a request frame.
+
+        :param gremlinclient.testing.server.ConnectionState state: State of
+            the websocket the frame was read from
+        :param data: The request frame, :py:class:`bytes` or :py:class:`str`
+
+        :returns: ``(latency, frames)``, the seconds to wait before
+            answering and the list of response frames as :py:class:`str`.
+            ``frames`` is ``None`` if the websocket must be closed instead
+        """
+        request = self._decode(data)
+        self.requests.append(request)
+        request_id = request.get("requestId")
+        if self._username is not None and not state.authenticated:
+            if request.get("op") != "authentication":
+                state.pending = request
+                return 0, [self._frame(request_id, 407)]
+            if not self._check_sasl(request["args"].get("sasl", "")):
+                state.pending = None
+                return 0, [self._frame(request_id, 401,
+                                       "Username and/or password are "
+                                       "incorrect")]
+            state.authenticated = True
+            request, state.pending = state.pending, None
+            if request is None:
+                return 0, [self._frame(request_id, 204)]
+        script = self._scripts.get(request.get("args", {}).get("gremlin"))
+        latency = self.latency
+        if script is not None and script.latency is not None:
+            latency = script.latency
+        if script is not None and script.drop:
+            return latency, None
+        return latency, self._respond(request, script)
+
+    def _respond(self, request, script):
+        request_id = request.get("requestId")
+        args = request.get("args", {})
+        gremlin = args.get("gremlin")
+        bindings = args.get("bindings") or {}
+        try:
+            if script is not None:
+                if script.status_code not in (200, 204, 206):
+                    return [self._frame(request_id, script.status_code,
+                                        script.message)]
+                result = script.result
+                if callable(result):
+                    result = result(bindings)
+            elif self._default is not None:
+                result = self._default(gremlin, bindings)
+            else:
+                return [self._frame(request_id, 597,
+                                    "No response scripted for: {}".format(
+                                        gremlin))]
+        except Exception as e:
+            return [self._frame(request_id, 597, str(e))]
+        if result is None:
+            return [self._frame(request_id, 204)]
+        if not isinstance(result, list):
+            result = [result]
+        size = args.get("batchSize") or self.frame_size
+        chunks = [result[i:i + size] for i in range(0, len(result), size)]
+        if not chunks:
+            return [self._frame(request_id, 204)]
+        frames = [self._frame(request_id, 206, data=chunk)
+                  for chunk in chunks[:-1]]
+        frames.append(self._frame(request_id, 200, data=chunks[-1]))
+        return frames
+
+    def _check_sasl(self, sasl):
+        try:
+            auth = base64.b64decode(sasl).decode("utf-8")
+        except Exception:
+            return False
+        return auth.split("\x00")[1:] == [self._username, self._password]
+
+    @staticmethod
+    def _decode(data):
+        if isinstance(data, bytes):
+            # binary frames are prefixed by the length of the mime type
+            # and the mime type
+            length = struct.unpack_from(">B", data, 0)[0]
+            mime_type = data[1:1 + length].decode("utf-8")
+            if mime_type != "application/json":
+                raise ValueError(
+                    "Unsupported mime type: {}".format(mime_type))
+            data = data[1 + length:].decode("utf-8")
+        return json.loads(data)
+
+    @staticmethod
+    def _frame(request_id, status_code, message="", data=None):
+        return json.dumps({
+            "requestId": request_id,
+            "status": {"code": status_code, "message": message,
+                       "attributes": {}},
+            "result": {"data": data, "meta": {}}})
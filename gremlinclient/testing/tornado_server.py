@@ -0,0 +1,67 @@
+from __future__ import absolute_import
+
+from tornado import gen
+from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
+from tornado.web import Application
+from tornado.websocket import WebSocketHandler
+
+from gremlinclient.testing.server import ConnectionState
+
+
+class GremlinServerHandler(WebSocketHandler):
+    """
+    Tornado websocket handler serving a
+    :py:class:`gremlinclient.testing.server.FakeGremlinServer`. Requests are
+    answered concurrently, so multiplexed clients see interleaved responses
+    when latencies differ.
+    """
+
+    def initialize(self, server):
+        self._server = server
+        self._state = ConnectionState()
+
+    @gen.coroutine
+    def on_message(self, message):
+        latency, frames = self._server.handle(self._state, message)
+        if latency:
+            yield gen.sleep(latency)
+        if frames is None:
+            self.close()
+            return
+        for frame in frames:
+            if self.ws_connection is None:
+                return
+            self.write_message(frame)
+
+
+def make_app(server):
+    """
+    :param gremlinclient.testing.server.FakeGremlinServer server: The fake
+        server
+
+    :returns: :py:class:`tornado.web.Application` serving ``server`` on
+        ``/`` and ``/gremlin``
+    """
+    return Application([(r"/(?:gremlin)?", GremlinServerHandler,
+                         {"server": server})])
+
+
+def listen(server, port=0, address="127.0.0.1"):
+    """
+    Serve a fake server on the current IOLoop and set its ``url``.
+
+    :param gremlinclient.testing.server.FakeGremlinServer server: The fake
+        server
+    :param int port: Port to listen on. A free port by default
+    :param str address: Address to bind. "127.0.0.1" by default
+
+    :returns: :py:class:`tornado.httpserver.HTTPServer`, stop it with
+        :py:meth:`tornado.httpserver.HTTPServer.stop`
+    """
+    sockets = bind_sockets(port, address=address)
+    http_server = HTTPServer(make_app(server))
+    http_server.add_sockets(sockets)
+    port = sockets[0].getsockname()[1]
+    server.url = "ws://{}:{}/".format(address, port)
+    return http_server
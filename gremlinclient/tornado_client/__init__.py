@@ -1,3 +1,4 @@
 from gremlinclient.tornado_client.client import (
-    Response, GraphDatabase, Pool, submit, create_connection)
+    Response, GraphDatabase, Pool, ClusterPool, submit, close_default_pools,
+    create_connection)
 from gremlinclient.tornado_client.remote_connection import RemoteConnection
@@ -1,18 +1,28 @@
 from __future__ import absolute_import
 import functools
 import socket
+from datetime import timedelta
 from logging import WARNING
 
-from tornado import concurrent
+from tornado import concurrent, gen
 from tornado.gen import with_timeout
 from tornado.httpclient import HTTPRequest, HTTPError
+from tornado.ioloop import IOLoop
 from tornado.websocket import websocket_connect
 
-from gremlinclient.api import _submit, _create_connection
+from gremlinclient.api import (
+    DEFAULT_ACQUIRE_TIMEOUT, _DefaultPools, _submit, _create_connection)
+from gremlinclient.cluster import ClusterPool, LEAST_OUTSTANDING
+from gremlinclient.connection import DECODE_THRESHOLD
+from gremlinclient.exceptions import GremlinConnectionError
 from gremlinclient.graph import GraphDatabase
 from gremlinclient.log import pool_logger
 from gremlinclient.pool import Pool
-from gremlinclient.response import Response
+from gremlinclient.response import Response, _copy_future
+
+
+# pools behind submit
+_default_pools = _DefaultPools()
 
 
 class Response(Response):
@@ -68,7 +78,23 @@ class Response(Response):
             :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
             :py:class:`tornado.concurrent.Future`
         """
-        return self._conn.read_message(callback=callback)
+        future = self._future_class()
+        if callback is not None:
+            future.add_done_callback(callback)
+        # tornado < 5 runs read_message's callbacks before clearing the
+        # pending read, so a callback reading the next frame would fail.
+        # add_future resolves ours on the next loop iteration instead.
+        loop = self._loop
+        if not hasattr(loop, "add_future"):
+            loop = IOLoop.current()
+        loop.add_future(self._conn.read_message(),
+                        functools.partial(_copy_future, target=future))
+        return future
+
+    def _get_call_soon_threadsafe(self):
+        loop = self._loop or IOLoop.current()
+        # tornado's IOLoop or an asyncio loop when running on asyncio
+        return getattr(loop, "call_soon_threadsafe", None) or loop.add_callback
 
 
 class GraphDatabase(GraphDatabase):
@@ -86,18 +112,51 @@ class GraphDatabase(GraphDatabase):
         :py:class:`tornado.concurrent.Future`
     :param func connector: a factory for generating
         :py:class:`tornado.HTTPRequest` objects. used with ssl
+    :param bool multiplex: Share each websocket between concurrent requests.
+        False by default
+    :param gremlinclient.serializer.Serializer serializer: Serializer for
+        requests and responses, or the mime type of a registered serializer.
+        JSON by default
+    :param decode_executor: :py:class:`concurrent.futures.Executor` used to
+        decode large response frames off the event loop (optional)
+    :param int decode_threshold: Minimum frame size in bytes decoded with
+        ``decode_executor``. 1 MiB by default
+    :param gremlinclient.tracing.Tracer tracer: Receives timing hooks for
+        every request (optional)
+    :param parameterize: Move the literals of Groovy scripts to bindings.
+        ``True`` or a :py:class:`gremlinclient.parameterize.Parameterizer`.
+        False by default
+    :param float request_timeout: Default deadline in seconds for reading a
+        whole response, also sent as ``scriptEvaluationTimeout`` (optional)
+    :param request_ids: Factory called for each connection, returning a
+        callable that generates its request ids (optional). Defaults to
+        :py:class:`gremlinclient.ids.RequestIdGenerator`
+    :param bool skip_meta: Leave the result meta out of responses, see
+        :py:class:`gremlinclient.connection.Connection`. False by default
     """
     def __init__(self, url, timeout=None, username="", password="",
-                 loop=None, future_class=None, connector=None):
+                 loop=None, future_class=None, connector=None,
+                 multiplex=False, serializer=None, decode_executor=None,
+                 decode_threshold=DECODE_THRESHOLD, tracer=None,
+                 parameterize=False, request_timeout=None,
+                 request_ids=None, skip_meta=False):
         if future_class is None:
             future_class = concurrent.Future
         super(GraphDatabase, self).__init__(
             url, timeout=timeout, username=username, password=password,
-            loop=loop, future_class=future_class)
+            loop=loop, future_class=future_class, multiplex=multiplex,
+            serializer=serializer, decode_executor=decode_executor,
+            decode_threshold=decode_threshold, tracer=tracer,
+            parameterize=parameterize, request_timeout=request_timeout,
+            request_ids=request_ids, skip_meta=skip_meta)
         if connector is None:
             connector = HTTPRequest
         self._connector = connector
 
+    @property
+    def loop(self):
+        return self._loop or IOLoop.current()
+
     def _connect(self,
                  conn_type,
                  session,
@@ -107,28 +166,25 @@ class GraphDatabase(GraphDatabase):
         future = self._future_class()
         request = self._connector(self._url)
         if self._timeout:
-            future_conn = with_timeout(timeout, websocket_connect(request))
+            future_conn = with_timeout(timedelta(seconds=self._timeout),
+                                       websocket_connect(request))
         else:
             future_conn = websocket_connect(request)
 
         def get_conn(f):
             try:
                 conn = f.result()
-            except socket.error:
+            except (socket.error, socket.gaierror, gen.TimeoutError):
                 future.set_exception(
-                    RuntimeError("Could not connect to server."))
-            except socket.gaierror:
-                future.set_exception(
-                    RuntimeError("Could not connect to server."))
+                    GremlinConnectionError("Could not connect to server."))
             except HTTPError as e:
                 future.set_exception(e)
             except Exception as e:
                 future.set_exception(e)
             else:
                 resp = Response(conn, self._future_class, self._loop)
-                gc = conn_type(resp, self._future_class, self._timeout,
-                               self._username, self._password, self._loop,
-                               force_close, pool, force_release, session)
+                gc = self._make_connection(conn_type, resp, session,
+                                           force_close, force_release, pool)
                 future.set_result(gc)
         future_conn.add_done_callback(get_conn)
         return future
@@ -153,20 +209,135 @@ class Pool(Pool):
         :py:class:`tornado.concurrent.Future`
     :param func connector: a factory for generating
         :py:class:`tornado.HTTPRequest` objects. used with ssl
+    :param bool multiplex: Share each websocket between concurrent requests.
+        False by default
+    :param int max_inflight: If multiplexed, maximum number of concurrent
+        acquisitions of a single connection.
+    :param int minsize: Number of idle connections the pool keeps open.
+        Opened by :py:meth:`warm` and replenished in the background
+    :param float max_idle: Close connections left idle for longer than this
+        many seconds (optional)
+    :param float max_lifetime: Close connections open for longer than this
+        many seconds once they are released (optional)
+    :param float ping_after: Ping connections idle for longer than this many
+        seconds before handing them out (optional)
+    :param float ping_timeout: Seconds to wait for a ping before discarding
+        the connection. 5 by default
+    :param float reap_interval: Seconds between sweeps closing expired idle
+        connections. 30 by default
+    :param int max_waiters: Maximum number of callers waiting for a
+        connection when the pool is full. Unbounded by default
+    :param gremlinclient.serializer.Serializer serializer: Serializer for
+        requests and responses, or the mime type of a registered serializer.
+        JSON by default
+    :param decode_executor: :py:class:`concurrent.futures.Executor` used to
+        decode large response frames off the event loop (optional)
+    :param int decode_threshold: Minimum frame size in bytes decoded with
+        ``decode_executor``. 1 MiB by default
+    :param gremlinclient.tracing.Tracer tracer: Receives timing hooks for
+        every request (optional)
+    :param parameterize: Move the literals of Groovy scripts to bindings.
+        ``True`` or a :py:class:`gremlinclient.parameterize.Parameterizer`.
+        False by default
+    :param float request_timeout: Default deadline in seconds for reading a
+        whole response, also sent as ``scriptEvaluationTimeout`` (optional)
+    :param request_ids: Factory called for each connection, returning a
+        callable that generates its request ids (optional). Defaults to
+        :py:class:`gremlinclient.ids.RequestIdGenerator`
+    :param bool skip_meta: Leave the result meta out of responses, see
+        :py:class:`gremlinclient.connection.Connection`. False by default
+    :param gremlinclient.retry.RetryPolicy retry_policy: Default policy of
+        :py:meth:`submit` (optional). No retries by default
     """
     def __init__(self, url, graph=None, timeout=None, username="",
                  password="", maxsize=256, loop=None, force_release=False,
-                 future_class=None, connector=None):
+                 future_class=None, connector=None, multiplex=False,
+                 max_inflight=128, serializer=None, decode_executor=None,
+                 decode_threshold=DECODE_THRESHOLD, minsize=0,
+                 max_idle=None, max_lifetime=None, ping_after=None,
+                 ping_timeout=5, reap_interval=30, max_waiters=None,
+                 tracer=None, parameterize=False, retry_policy=None,
+                 request_timeout=None, request_ids=None,
+                 skip_meta=False):
         graph = GraphDatabase(url,
                               timeout=timeout,
                               username=username,
                               password=password,
                               future_class=future_class,
                               loop=loop,
-                              connector=connector)
+                              connector=connector,
+                              multiplex=multiplex,
+                              serializer=serializer,
+                              decode_executor=decode_executor,
+                              decode_threshold=decode_threshold,
+                              tracer=tracer,
+                              parameterize=parameterize,
+                              request_timeout=request_timeout,
+                              request_ids=request_ids,
+                              skip_meta=skip_meta)
         super(Pool, self).__init__(graph, maxsize=maxsize, loop=loop,
                                    force_release=force_release,
-                                   future_class=future_class)
+                                   future_class=future_class,
+                                   max_inflight=max_inflight,
+                                   minsize=minsize,
+                                   max_idle=max_idle,
+                                   max_lifetime=max_lifetime,
+                                   ping_after=ping_after,
+                                   ping_timeout=ping_timeout,
+                                   reap_interval=reap_interval,
+                                   max_waiters=max_waiters,
+                                   retry_policy=retry_policy)
+
+
+class ClusterPool(ClusterPool):
+    """
+    Balances connections over several Gremlin Servers, with one
+    :py:class:`gremlinclient.tornado_client.client.Pool` per server.
+
+    :param list urls: urls of the Gremlin Servers.
+    :param float timeout: timeout for establishing connection (optional).
+        Values ``0`` or ``None`` mean no timeout
+    :param str username: Username for SASL auth
+    :param str password: Password for SASL auth
+    :param int maxsize: Maximum number of connections per host.
+    :param loop: event loop
+    :param class future_class: type of Future -
+        :py:class:`asyncio.Future`, :py:class:`trollius.Future`, or
+        :py:class:`tornado.concurrent.Future`
+    :param func connector: a factory for generating
+        :py:class:`tornado.HTTPRequest` objects. used with ssl
+    :param bool multiplex: Share each websocket between concurrent requests.
+        False by default
+    :param int max_inflight: If multiplexed, maximum number of concurrent
+        acquisitions of a single connection.
+    :param int minsize: Number of idle connections kept open per host
+    :param str strategy: ``"least_outstanding"`` or ``"latency"``, see
+        :py:class:`gremlinclient.cluster.ClusterPool`
+    :param float backoff: Seconds a host stays down after its first
+        failure. 1 by default
+    :param float max_backoff: Upper bound for the backoff in seconds.
+        60 by default
+    """
+    def __init__(self, urls, timeout=None, username="", password="",
+                 maxsize=256, loop=None, force_release=False,
+                 future_class=None, connector=None, multiplex=False,
+                 max_inflight=128, minsize=0, strategy=LEAST_OUTSTANDING,
+                 backoff=1, max_backoff=60):
+        pools = [Pool(url,
+                      timeout=timeout,
+                      username=username,
+                      password=password,
+                      maxsize=maxsize,
+                      loop=loop,
+                      force_release=force_release,
+                      future_class=future_class,
+                      connector=connector,
+                      multiplex=multiplex,
+                      max_inflight=max_inflight,
+                      minsize=minsize) for url in urls]
+        super(ClusterPool, self).__init__(pools, strategy=strategy,
+                                          backoff=backoff,
+                                          max_backoff=max_backoff)
 
 
 def submit(url,
@@ -182,9 +353,16 @@ def submit(url,
            username="",
            password="",
            future_class=None,
-           connector=None):
+           connector=None,
+           acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT):
     """
-    Submit a script to the Gremlin Server.
+    Submit a script to the Gremlin Server. Connections come from a process
+    wide pool per url, credentials and event loop, and go back to it once
+    the stream was read or closed with
+    :py:meth:`gremlinclient.connection.Stream.close`, so repeated calls
+    skip the handshake. A stream left unread keeps its connection, and
+    once all are held :py:func:`submit` fails after ``acquire_timeout``.
+    Close these pools at shutdown with :py:func:`close_default_pools`.
 
     :param str url: url for Gremlin Server.
     :param str gremlin: Gremlin script to submit to server.
@@ -207,20 +385,34 @@ def submit(url,
         :py:class:`tornado.concurrent.Future`
     :param func connector: a factory for generating
         :py:class:`tornado.HTTPRequest` objects. used with ssl
+    :param float acquire_timeout: Seconds to wait for a connection of the
+        pool when all of them are in use, before failing with
+        :py:class:`gremlinclient.exceptions.PoolTimeoutError`. 30 by default
     :returns: :py:class:`gremlinclient.connection.Stream` object:
     """
-    graph = GraphDatabase(url,
-                          timeout=timeout,
-                          username=username,
-                          password=password,
-                          loop=loop,
-                          future_class=future_class,
-                          connector=connector)
-    return _submit(url, gremlin, graph, bindings=bindings, lang=lang,
+    loop = loop or IOLoop.current()
+    key = (url, timeout, username, password, future_class, connector)
+    pool = _default_pools.get(loop, key, lambda: Pool(
+        url,
+        timeout=timeout,
+        username=username,
+        password=password,
+        loop=loop,
+        force_release=True,
+        future_class=future_class,
+        connector=connector))
+    return _submit(pool, gremlin, bindings=bindings, lang=lang,
                    aliases=aliases, op=op, processor=processor,
-                   timeout=timeout, session=session, loop=loop,
-                   username=username, password=password,
-                   future_class=future_class)
+                   session=session, acquire_timeout=acquire_timeout)
+
+
+def close_default_pools():
+    """
+    Close the pools used by :py:func:`submit`. Later calls to
+    :py:func:`submit` open new pools.
+    """
+    for key, pool in _default_pools.pop_all():
+        pool.close()
 
 
 def create_connection(url, timeout=None, username="", password="",
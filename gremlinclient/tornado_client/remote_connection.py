@@ -9,14 +9,27 @@ except ImportError:
 
 
 class RemoteConnection(RemoteConnection):
+    """
+    Synchronous remote connection for the Gremlin-Python GLV.
 
-    def __init__(self, url, loop=None):
+    :param str url: url for Gremlin Server.
+    :param loop: If param is ``None``, `tornado.ioloop.IOLoop.current`
+        is used for getting default event loop (optional)
+    :param bool stream: If ``True``, :py:meth:`submit` returns a generator
+        that reads one response message at a time instead of collecting
+        all results up front. False by default
+    """
+
+    def __init__(self, url, loop=None, stream=False):
         if loop is None:
             loop = IOLoop.current()
         self._loop = loop
+        self._stream = stream
         self._pool = Pool(url, force_release=True, loop=self._loop)
 
     def submit(self, script_engine, script, bindings):
+        if self._stream:
+            return self._iterate(script_engine, script, bindings)
         results = self._loop.run_sync(lambda:
             self._execute(script_engine, script, bindings))
         return results
@@ -34,5 +47,24 @@ class RemoteConnection(RemoteConnection):
                 results.append(Traverser(obj, 1))
         raise gen.Return(iter(results))
 
+    def _iterate(self, script_engine, script, bindings):
+        conn = self._loop.run_sync(self._pool.acquire)
+        stream = conn.send(script, bindings=bindings, lang=script_engine)
+        final = False
+        try:
+            while not final:
+                msg = self._loop.run_sync(stream.read)
+                if msg is None or msg.data is None:
+                    break
+                final = msg.status_code != 206
+                for obj in msg.data:
+                    yield Traverser(obj, 1)
+        except GeneratorExit:
+            if not final:
+                # frames are still outstanding, conn can't be reused
+                conn.close()
+                self._pool.release(conn)
+            raise
+
     def close(self):
         self._pool.close()
@@ -0,0 +1,93 @@
+from gremlinclient.connection import _now
+
+
+class Tracer(object):
+    """
+    Base class for per request tracing hooks. Every hook receives the
+    ``requestId`` of the request it describes, so concurrent requests can
+    be told apart. The hooks do nothing by default: subclass and override
+    the ones you need, then pass an instance as ``tracer`` to
+    :py:class:`gremlinclient.graph.GraphDatabase` or a pool. No hook is
+    called when no tracer is set.
+    """
+    def on_prepare(self, request_id):
+        """Called before the request message is serialized."""
+
+    def on_write(self, request_id, size):
+        """Called after the request was written to the websocket.
+
+        :param int size: Size of the request message in bytes
+        """
+
+    def on_first_frame(self, request_id):
+        """Called when the first response frame has been decoded."""
+
+    def on_partial(self, request_id):
+        """Called for each partial (206) response frame."""
+
+    def on_status(self, request_id, status_code):
+        """Called with the final status code of the response."""
+
+    def on_complete(self, request_id, error):
+        """Called once the final frame went through the result handlers.
+
+        :param Exception error: The error the request failed with, or
+            ``None``
+        """
+
+
+class TimingTracer(Tracer):
+    """
+    Tracer that timestamps each hook and reports all of them when the
+    request completes.
+
+    ``callback(request_id, timings)`` receives a dict with the seconds
+    elapsed since ``on_prepare`` for ``"write"``, ``"first_frame"``,
+    ``"status"`` and ``"complete"``, a list of ``"partials"``, as well as
+    the final ``"status_code"`` and ``"error"``.
+
+    :param callback: Callable taking ``(request_id, timings)``
+    """
+    def __init__(self, callback):
+        self._callback = callback
+        # request id -> (start time, timings)
+        self._pending = {}
+
+    def on_prepare(self, request_id):
+        self._pending[request_id] = (_now(), {"partials": [],
+                                              "status_code": None,
+                                              "error": None})
+
+    def _mark(self, request_id, event):
+        try:
+            start, timings = self._pending[request_id]
+        except KeyError:
+            return
+        timings[event] = _now() - start
+        return timings
+
+    def on_write(self, request_id, size):
+        timings = self._mark(request_id, "write")
+        if timings is not None:
+            timings["size"] = size
+
+    def on_first_frame(self, request_id):
+        self._mark(request_id, "first_frame")
+
+    def on_partial(self, request_id):
+        entry = self._pending.get(request_id)
+        if entry is not None:
+            entry[1]["partials"].append(_now() - entry[0])
+
+    def on_status(self, request_id, status_code):
+        timings = self._mark(request_id, "status")
+        if timings is not None:
+            timings["status_code"] = status_code
+
+    def on_complete(self, request_id, error):
+        timings = self._mark(request_id, "complete")
+        if timings is None:
+            return
+        del self._pending[request_id]
+        timings["error"] = error
+        self._callback(request_id, timings)
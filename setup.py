@@ -1,6 +1,14 @@
+import sys
+
 from setuptools import setup
 
 
+# the offline tests resolve plain concurrent.futures futures
+tests_require = []
+if sys.version_info < (3,):
+    tests_require.append("futures")
+
+
 setup(
     name="gremlinclient",
     version="0.2.8",
@@ -11,10 +19,12 @@ setup(
     description="Python driver for TP3 Gremlin Server",
     long_description=open("README.txt").read(),
     packages=["gremlinclient", "gremlinclient.aiohttp_client",
-              "gremlinclient.tornado_client", "tests"],
+              "gremlinclient.tornado_client", "gremlinclient.testing",
+              "tests"],
     install_requires=[
         "tornado==4.3"
     ],
+    tests_require=tests_require,
     test_suite="tests",
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -26,6 +26,13 @@ class RemoteConnectionTest(unittest.TestCase):
         result = list(result)
         self.assertEqual(result[0].object, 2)
 
+    def test_submit_stream(self):
+        conn = RemoteConnection("ws://localhost:8182/", stream=True)
+        result = conn.submit("gremlin-groovy", "1..100", bindings={})
+        self.assertEqual(next(result).object, 1)
+        self.assertEqual([t.object for t in result], list(range(2, 101)))
+        conn.close()
+
     def test_traversal(self):
         g = PythonGraphTraversalSource(GroovyTranslator("g"),
                                        remote_connection=self.conn)
@@ -0,0 +1,106 @@
+import unittest
+from concurrent.futures import Future
+
+from gremlinclient.cache import ResultCache, make_key
+from gremlinclient.connection import Connection, Message, Session
+from gremlinclient.testing import FakeGremlinServer
+
+from tests.test_fake_server import LoopbackResponse
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = ResultCache(maxsize=2, ttl=10, clock=self.clock)
+
+    def test_ttl(self):
+        self.cache.set("a", [1])
+        self.cache.set("b", [2], ttl=20)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), [2])
+        self.clock.now = 20
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru(self):
+        self.cache.set("a", [1])
+        self.cache.set("b", [2])
+        self.cache.get("a")
+        self.cache.set("c", [3])
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    def test_copies(self):
+        messages = [Message(200, [1], "", {})]
+        self.cache.set("a", messages)
+        messages[0].data.append(2)
+        self.cache.get("a")[0].data.append(3)
+        self.assertEqual(self.cache.get("a"), [(200, [1], "", {})])
+
+    def test_keys(self):
+        key = make_key("x", {"x": 1}, session="a", prefix="person:")
+        self.assertTrue(key.startswith("person:"))
+        self.assertNotEqual(key, make_key("x", {"x": 1}, session="b",
+                                          prefix="person:"))
+        self.cache.set(key, [1])
+        self.cache.invalidate_prefix("person:")
+        self.assertEqual(len(self.cache), 0)
+
+
+class ResultCacheSendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeGremlinServer()
+        self.server.script("x + x", lambda bindings: bindings["x"] * 2)
+        self.conn = Connection(LoopbackResponse(self.server), Future)
+        self.cache = ResultCache()
+
+    def read_all(self, stream):
+        return stream.read_all().result(timeout=1)
+
+    def test_send(self):
+        for i in range(2):
+            messages = self.read_all(
+                self.cache.send(self.conn, "x + x", bindings={"x": 1}))
+            self.assertEqual(messages[0].data, [2])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_session(self):
+        session = Session(LoopbackResponse(self.server), Future)
+        for conn in (session, session, self.conn):
+            messages = self.read_all(
+                self.cache.send(conn, "x + x", bindings={"x": 1}))
+            self.assertEqual(messages[0].data, [2])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        self.assertEqual(self.server.requests[0]["processor"], "session")
+        self.assertEqual(self.server.requests[0]["args"]["session"],
+                         session._session)
+        stream = self.cache.send(session, "x + x", bindings={"x": 2},
+                                 handler=lambda data: data[0])
+        self.assertEqual(self.read_all(stream), [4])
+
+    def test_handler_bypass(self):
+        for i in range(2):
+            messages = self.read_all(self.cache.send(
+                self.conn, "x + x", bindings={"x": 1},
+                handler=lambda data: data[0] + i))
+            self.assertEqual(messages, [2 + i])
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
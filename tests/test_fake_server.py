@@ -0,0 +1,134 @@
+import collections
+import unittest
+from concurrent.futures import Future
+
+from gremlinclient.connection import Connection, Message
+from gremlinclient.exceptions import (
+    ScriptEvaluationError, ServerTimeoutError, UnauthorizedError)
+from gremlinclient.response import Response
+from gremlinclient.testing import ConnectionState, FakeGremlinServer
+
+
+class LoopbackResponse(Response):
+    """Hands requests straight to a fake server, in place of a websocket."""
+
+    def __init__(self, server):
+        super(LoopbackResponse, self).__init__(None, Future)
+        self._server = server
+        self._state = ConnectionState()
+        self._frames = collections.deque()
+        self._closed = False
+        self.latencies = []
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        self._closed = True
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def send(self, msg, binary=True):
+        latency, frames = self._server.handle(self._state, msg)
+        self.latencies.append(latency)
+        if frames is None:
+            self._closed = True
+        else:
+            self._frames.extend(frames)
+
+    def receive(self, callback=None):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        # like websockets, a closed connection reads None
+        future.set_result(self._frames.popleft() if self._frames else None)
+        return future
+
+
+class FakeGremlinServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeGremlinServer(frame_size=2)
+
+    def connect(self, **kwargs):
+        return Connection(LoopbackResponse(self.server), Future, **kwargs)
+
+    def read_all(self, stream):
+        return stream.read_all().result(timeout=1)
+
+    def test_partial_frames(self):
+        self.server.script("1..5", [1, 2, 3, 4, 5])
+        messages = self.read_all(self.connect().send("1..5"))
+        self.assertEqual([m.status_code for m in messages], [206, 206, 200])
+        self.assertEqual([m.data for m in messages], [[1, 2], [3, 4], [5]])
+
+    def test_bindings(self):
+        self.server.script("x + x", lambda bindings: bindings["x"] * 2)
+        messages = self.read_all(self.connect().send("x + x", {"x": 2}))
+        self.assertEqual(messages[0].data, [4])
+        self.assertEqual(self.server.requests[0]["args"]["bindings"],
+                         {"x": 2})
+
+    def test_no_content(self):
+        self.server.script("g.V().drop()")
+        messages = self.read_all(self.connect().send("g.V().drop()"))
+        self.assertEqual(messages[0].status_code, 204)
+
+    def test_errors(self):
+        self.server.script("slow", status_code=598, message="timed out")
+        with self.assertRaises(ServerTimeoutError):
+            self.read_all(self.connect().send("slow"))
+        with self.assertRaises(ScriptEvaluationError):
+            self.read_all(self.connect().send("unknown"))
+
+    def test_default(self):
+        server = FakeGremlinServer(default=lambda gremlin, bindings: gremlin)
+        conn = Connection(LoopbackResponse(server), Future)
+        self.assertEqual(self.read_all(conn.send("g"))[0].data, ["g"])
+
+    def test_message(self):
+        self.server.script("1", [1])
+        message = self.read_all(self.connect().send("1"))[0]
+        self.assertEqual(message, (200, [1], "", {}))
+        self.assertEqual(message, Message(200, [1], "", {}))
+        status_code, data, _, metadata = message
+        self.assertEqual((status_code, data, metadata), (200, [1], {}))
+        self.assertEqual(message[1], [1])
+        self.assertEqual(message._asdict()["message"], "")
+        self.assertTrue(repr(message).startswith(
+            "Message(status_code=200, data=[1], message="))
+        message = self.read_all(self.connect(skip_meta=True).send("1"))[0]
+        self.assertEqual(message, (200, [1], "", None))
+
+    def test_latency(self):
+        self.server.latency = 0.5
+        self.server.script("fast", [1], latency=0)
+        conn = self.connect()
+        self.server.script("slow", [1])
+        self.read_all(conn.send("fast"))
+        self.read_all(conn.send("slow"))
+        self.assertEqual(conn.conn.latencies, [0, 0.5])
+
+    def test_sasl(self):
+        server = FakeGremlinServer(username="stephen", password="password")
+        server.script("1 + 1", [2])
+        conn = Connection(LoopbackResponse(server), Future,
+                          username="stephen", password="password")
+        self.assertEqual(self.read_all(conn.send("1 + 1"))[0].data, [2])
+        self.assertEqual([r["op"] for r in server.requests],
+                         ["eval", "authentication"])
+        self.assertEqual(self.read_all(conn.send("1 + 1"))[0].data, [2])
+        self.assertEqual(len(server.requests), 3)
+
+    def test_sasl_rejected(self):
+        server = FakeGremlinServer(username="stephen", password="password")
+        conn = Connection(LoopbackResponse(server), Future,
+                          username="stephen", password="wrong")
+        with self.assertRaises(UnauthorizedError):
+            self.read_all(conn.send("1 + 1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
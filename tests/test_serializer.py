@@ -0,0 +1,259 @@
+import collections
+import json
+import struct
+import unittest
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from gremlinclient.connection import Connection
+from gremlinclient.ids import RequestIdGenerator
+from gremlinclient.response import Response
+from gremlinclient.serializer import (
+    GraphBinarySerializer, JSONSerializer, TemplateJSONSerializer,
+    get_serializer, _read, _skip, _write, _write_map)
+
+
+class JSONSerializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = JSONSerializer()
+
+    def test_header(self):
+        self.assertEqual(self.serializer.header, b"\x10application/json")
+
+    def test_serialize_request(self):
+        message = self.serializer.serialize_request(
+            "1234", "eval", "", "x + x", {"x": 1}, "gremlin-groovy", {})
+        self.assertTrue(message.startswith(b"\x10application/json"))
+        message = json.loads(message[17:].decode("utf-8"))
+        self.assertEqual(message["requestId"], "1234")
+        self.assertEqual(message["args"]["gremlin"], "x + x")
+        self.assertEqual(message["args"]["bindings"], {"x": 1})
+        self.assertNotIn("session", message["args"])
+
+    def test_deserialize_message(self):
+        message = self.serializer.deserialize_message(
+            b'{"requestId": "1234", "status": {"code": 200}}')
+        self.assertEqual(message["status"]["code"], 200)
+
+    def test_deserialize_buffer(self):
+        frame = b'{"requestId": "1234", "result": {"data": ["\xc3\xa9"]}}'
+        for data in (frame, memoryview(frame), frame.decode("utf-8")):
+            message = self.serializer.deserialize_message(data)
+            self.assertEqual(message["result"]["data"], [u"\xe9"])
+
+
+class EnvelopeTest(unittest.TestCase):
+
+    def test_reuse(self):
+        serializer = JSONSerializer()
+        envelope = serializer.envelope()
+        for args, kwargs in [
+                (("1", "eval", "session", "x", {"x": 1}, "gremlin-groovy",
+                  {}), {"session": "abc", "evaluation_timeout": 500}),
+                (("2", "eval", "", "1 + 1", None, "gremlin-groovy",
+                  {"g": "g1"}), {})]:
+            self.assertEqual(envelope.request(*args, **kwargs),
+                             serializer.serialize_request(*args, **kwargs))
+
+    def test_custom_serialize_request(self):
+        serializer = TemplateJSONSerializer()
+        envelope = serializer.envelope()
+        envelope.request("1", "eval", "", "x", None, "gremlin-groovy", {})
+        self.assertEqual(len(serializer._templates), 1)
+
+
+class RequestIdGeneratorTest(unittest.TestCase):
+
+    def test_ids(self):
+        generate = RequestIdGenerator()
+        ids = [generate() for i in range(3)]
+        self.assertEqual(len(set(ids)), 3)
+        for request_id in ids:
+            self.assertEqual(str(uuid.UUID(request_id)), request_id)
+        self.assertNotEqual(RequestIdGenerator()(), ids[0])
+        generate._counter = iter([16 ** 12])
+        prefix = generate._prefix
+        self.assertTrue(generate().endswith("000000000000"))
+        self.assertNotEqual(generate._prefix, prefix)
+
+
+class TemplateJSONSerializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = TemplateJSONSerializer(max_templates=2)
+        self.plain = JSONSerializer()
+
+    def assertSameMessage(self, *args, **kwargs):
+        expected = self.plain.serialize_request(*args, **kwargs)
+        message = self.serializer.serialize_request(*args, **kwargs)
+        self.assertEqual(message[:17], expected[:17])
+        self.assertEqual(json.loads(message[17:].decode("utf-8")),
+                         json.loads(expected[17:].decode("utf-8")))
+
+    def test_serialize_request(self):
+        self.assertSameMessage("1234", "eval", "", 'g.V().has("name", x)',
+                               {"x": "marko"}, "gremlin-groovy", {})
+
+    def test_serialize_session_aliases(self):
+        self.assertSameMessage("1234", "eval", "session", "1 + 1", None,
+                               "gremlin-groovy", {"g": "g1"}, session="abc")
+
+    def test_serialize_evaluation_timeout(self):
+        self.assertSameMessage("1234", "eval", "", "1 + 1", None,
+                               "gremlin-groovy", {}, evaluation_timeout=500)
+        message = self.serializer.serialize_request(
+            "1234", "eval", "", "1 + 1", None, "gremlin-groovy", {},
+            evaluation_timeout=500)
+        args = json.loads(message[17:].decode("utf-8"))["args"]
+        self.assertEqual(args["scriptEvaluationTimeout"], 500)
+
+    def test_template_reuse(self):
+        for i in range(3):
+            self.assertSameMessage(str(i), "eval", "", "x", {"x": i},
+                                   "gremlin-groovy", {})
+        self.assertEqual(len(self.serializer._templates), 1)
+        for i in range(3):
+            self.assertSameMessage("1", "eval", "session", "x", None,
+                                   "gremlin-groovy", {}, session=str(i))
+        self.assertTrue(len(self.serializer._templates) <= 2)
+
+
+def canned_frame(request_id, code, data, meta=None):
+    # GraphBinary response holding a list of ints, built by hand
+    frame = bytearray(b"\x81\x00")
+    frame.extend(uuid.UUID(request_id).bytes)
+    frame.extend(struct.pack(">i", code))
+    frame.extend(b"\x00" + struct.pack(">i", 0))  # status message ""
+    frame.extend(struct.pack(">i", 0))  # status attributes
+    _write_map(frame, meta or {})  # result meta
+    frame.extend(struct.pack(">BBi", 0x09, 0, len(data)))
+    for item in data:
+        frame.extend(struct.pack(">BBi", 0x01, 0, item))
+    return bytes(frame)
+
+
+class CannedResponse(Response):
+    """Echoes canned binary frames for each request, in place of a server."""
+
+    def __init__(self, batches):
+        super(CannedResponse, self).__init__(None, Future)
+        self._batches = batches
+        self._frames = collections.deque()
+        self.sent = []
+
+    @property
+    def closed(self):
+        return False
+
+    def send(self, msg, binary=True):
+        self.sent.append(msg)
+        header_len = struct.unpack_from(">B", msg)[0] + 1
+        request_id = str(uuid.UUID(bytes=msg[header_len + 1:
+                                              header_len + 17]))
+        for i, batch in enumerate(self._batches):
+            code = 206 if i < len(self._batches) - 1 else 200
+            self._frames.append(canned_frame(request_id, code, batch))
+
+    def receive(self, callback=None):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        future.set_result(self._frames.popleft())
+        return future
+
+    def _get_call_soon_threadsafe(self):
+        # concurrent.futures futures can be resolved from any thread
+        return lambda callback, *args: callback(*args)
+
+
+class GraphBinarySerializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.serializer = get_serializer("application/vnd.graphbinary-v1.0")
+
+    def test_registry(self):
+        self.assertIsInstance(self.serializer, GraphBinarySerializer)
+        self.assertIsInstance(get_serializer("application/json"),
+                              JSONSerializer)
+        with self.assertRaises(ValueError):
+            get_serializer("application/unknown")
+
+    def test_serialize_request(self):
+        request_id = str(uuid.uuid4())
+        message = self.serializer.serialize_request(
+            request_id, "eval", "", "x + x", {"x": 1}, "gremlin-groovy", {})
+        header = self.serializer.header
+        self.assertTrue(message.startswith(header))
+        body = message[len(header):]
+        self.assertEqual(body[:1], b"\x81")
+        self.assertEqual(body[1:17], uuid.UUID(request_id).bytes)
+        self.assertEqual(body[17:29], b"\x00\x00\x00\x04eval\x00\x00\x00\x00")
+
+    def test_deserialize_message(self):
+        request_id = str(uuid.uuid4())
+        message = self.serializer.deserialize_message(
+            canned_frame(request_id, 200, [1, 2, 3]))
+        self.assertEqual(message["requestId"], request_id)
+        self.assertEqual(message["status"]["code"], 200)
+        self.assertEqual(message["status"]["message"], "")
+        self.assertEqual(message["result"]["data"], [1, 2, 3])
+        self.assertEqual(message["result"]["meta"], {})
+
+    def test_round_trip_values(self):
+        buf = bytearray()
+        value = {"name": u"marko", "age": 29, "big": 2 ** 40,
+                 "weight": 0.5, "ok": True, "none": None,
+                 "tags": [1, "a"], "id": uuid.uuid4()}
+        _write(buf, value)
+        self.assertEqual(_read(memoryview(bytes(buf)), 0),
+                         (value, len(buf)))
+        self.assertEqual(_skip(memoryview(bytes(buf)), 0), len(buf))
+
+    def test_skip_meta(self):
+        request_id = str(uuid.uuid4())
+        frame = canned_frame(request_id, 200, [1, 2],
+                             meta={"host": u"/127.0.0.1", "n": [1, None],
+                                   "id": uuid.uuid4(), "t": 0.5})
+        message = self.serializer.deserialize_message(frame)
+        self.assertEqual(message["result"]["meta"]["n"], [1, None])
+        message = self.serializer.deserialize_message(frame, skip_meta=True)
+        self.assertEqual(message["result"], {"data": [1, 2]})
+
+    def test_connection(self):
+        conn = Connection(CannedResponse([[1, 2], [3]]), Future,
+                          serializer=self.serializer)
+        stream = conn.send("1..3")
+        self.assertTrue(conn.conn.sent[0].startswith(self.serializer.header))
+        results = []
+        while True:
+            msg = stream.read().result()
+            if msg is None:
+                break
+            results.extend(msg.data)
+        self.assertEqual(results, [1, 2, 3])
+
+
+class DecodeExecutorTest(unittest.TestCase):
+
+    def test_large_frames_use_executor(self):
+        serializer = GraphBinarySerializer()
+        calls = []
+
+        class Executor(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                calls.append(len(args[0]))
+                return super(Executor, self).submit(fn, *args)
+
+        with Executor(max_workers=1) as executor:
+            conn = Connection(CannedResponse([list(range(100)), [1]]),
+                              Future, serializer=serializer,
+                              decode_executor=executor,
+                              decode_threshold=100)
+            stream = conn.send("x")
+            msg = stream.read().result(timeout=1)
+            self.assertEqual(msg.data, list(range(100)))
+            msg = stream.read().result(timeout=1)
+            self.assertEqual(msg.data, [1])
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(calls[0] >= 100)
@@ -5,12 +5,27 @@ from datetime import timedelta
 import tornado
 from tornado import gen
 from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
 from tornado.websocket import WebSocketClientConnection
-from tornado.testing import gen_test, AsyncTestCase
-
-from gremlinclient.connection import Stream
+from tornado.testing import bind_unused_port, gen_test, AsyncTestCase
+
+from gremlinclient.api import _DefaultPools, _submit
+from gremlinclient.bulk import BULK_SCRIPT, BulkLoader
+from gremlinclient.cache import ResultCache
+from gremlinclient.connection import BatchResult, Stream
+from gremlinclient.exceptions import (
+    GremlinConnectionError, NoHostAvailableError, PoolExhaustedError,
+    PoolTimeoutError, RequestTimeoutError, ScriptEvaluationError)
+from gremlinclient.parameterize import parameterize
+from gremlinclient.retry import RetryPolicy
+from gremlinclient.singleflight import SingleFlight
+from gremlinclient.testing import FakeGremlinServer
+from gremlinclient.testing.tornado_server import listen
+from gremlinclient.tracing import TimingTracer
 from gremlinclient.tornado_client import (
-    submit, GraphDatabase, Pool, create_connection, Response, RemoteConnection)
+    submit, GraphDatabase, Pool, ClusterPool, create_connection, Response,
+    RemoteConnection, close_default_pools)
+from gremlinclient.tornado_client.client import _default_pools
 
 from gremlin_python import PythonGraphTraversalSource, GroovyTranslator
 
@@ -30,6 +45,13 @@ class RemoteConnectionTest(unittest.TestCase):
         result = list(result)
         self.assertEqual(result[0].object, 2)
 
+    def test_submit_stream(self):
+        conn = RemoteConnection("ws://localhost:8182/", stream=True)
+        result = conn.submit("gremlin-groovy", "1..100", bindings={})
+        self.assertEqual(next(result).object, 1)
+        self.assertEqual([t.object for t in result], list(range(2, 101)))
+        conn.close()
+
     def test_traversal(self):
         g = PythonGraphTraversalSource(GroovyTranslator("g"),
                                        remote_connection=self.conn)
@@ -94,6 +116,17 @@ class TornadoFactoryConnectTest(AsyncTestCase):
 
         connection.conn.close()
 
+    @gen_test
+    def test_fetch_next(self):
+        connection = yield self.graph.connect()
+        resp = connection.send("1..100")
+        items = []
+        while (yield resp.fetch_next):
+            items.append(resp.next_item())
+        self.assertEqual(items, list(range(1, 101)))
+        self.assertIsNone(resp.next_item())
+        connection.conn.close()
+
     @gen_test
     def test_handler(self):
         connection = yield self.graph.connect()
@@ -125,6 +158,26 @@ class TornadoFactoryConnectTest(AsyncTestCase):
         with self.assertRaises(RuntimeError):
             msg = yield resp.read()
 
+    @gen_test
+    def test_script_error(self):
+        connection = yield self.graph.connect()
+        resp = connection.send("throw new Exception('boom')")
+        with self.assertRaises(ScriptEvaluationError) as cm:
+            yield resp.read()
+        self.assertEqual(cm.exception.status_code, 597)
+        self.assertFalse(cm.exception.retryable)
+        connection.close()
+
+    @gen_test
+    def test_request_timeout(self):
+        connection = yield self.graph.connect()
+        resp = connection.send("Thread.sleep(2000); 1", timeout=0.2)
+        with self.assertRaises(RequestTimeoutError):
+            yield resp.read()
+        self.assertTrue(connection.closed)
+        with self.assertRaises(RequestTimeoutError):
+            yield resp.read()
+
     @gen_test
     def test_null_read_on_closed(self):
         connection = yield self.graph.connect()
@@ -158,6 +211,101 @@ class TornadoFactoryConnectTest(AsyncTestCase):
             self.assertEqual(msg.data[0], 2)
         self.assertTrue(connection.conn.closed)
 
+    @gen_test
+    def test_multiplex_send(self):
+        graph = GraphDatabase("ws://localhost:8182/",
+                              username="stephen",
+                              password="password",
+                              multiplex=True)
+        connection = yield graph.connect()
+        streams = [connection.send("x + x", bindings={"x": i})
+                   for i in range(10)]
+        self.assertEqual(connection.inflight, 10)
+        for i, stream in reversed(list(enumerate(streams))):
+            while True:
+                msg = yield stream.read()
+                if msg is None:
+                    break
+                self.assertEqual(msg.data[0], i * 2)
+        self.assertEqual(connection.inflight, 0)
+        connection.close()
+
+    @gen_test
+    def test_send_batch(self):
+        for multiplex in (False, True):
+            graph = GraphDatabase("ws://localhost:8182/",
+                                  username="stephen",
+                                  password="password",
+                                  multiplex=multiplex)
+            connection = yield graph.connect()
+            results = yield connection.send_batch(
+                [("x + 1", {"x": 1}), "[1, 2, 3]", "1/0"])
+            self.assertEqual(results[0], BatchResult([2], None))
+            self.assertEqual(results[1].data, [1, 2, 3])
+            self.assertIsNone(results[2].data)
+            self.assertIsInstance(results[2].error, RuntimeError)
+            connection.close()
+
+    @gen_test
+    def test_result_cache(self):
+        cache = ResultCache(maxsize=8, ttl=60)
+        graph = GraphDatabase("ws://localhost:8182/",
+                              username="stephen",
+                              password="password")
+        connection = yield graph.connect()
+        stream = cache.send(connection, "x + x", bindings={"x": 1},
+                            tags=["numbers"])
+        first = yield stream.read_all()
+        self.assertEqual(first[0].data[0], 2)
+        stream = cache.send(connection, "x + x", bindings={"x": 1})
+        second = yield stream.read_all()
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.invalidate_tag("numbers")
+        self.assertEqual(len(cache), 0)
+        connection.close()
+
+    @gen_test
+    def test_tracer(self):
+        traces = []
+        graph = GraphDatabase("ws://localhost:8182/",
+                              username="stephen",
+                              password="password",
+                              tracer=TimingTracer(
+                                  lambda rid, timings: traces.append(
+                                      (rid, timings))))
+        connection = yield graph.connect()
+        stream = connection.send("1 + 1", request_id=str(uuid.uuid4()))
+        yield stream.read_all()
+        rid, timings = traces[0]
+        self.assertEqual(rid, stream._request_id)
+        self.assertEqual(timings["status_code"], 200)
+        self.assertIsNone(timings["error"])
+        self.assertTrue(timings["write"] <= timings["first_frame"] <=
+                        timings["complete"])
+        connection.close()
+
+    @gen_test
+    def test_parameterize(self):
+        script, bindings = parameterize("g.V().has('name', 'marko').limit(2)")
+        self.assertEqual(script, "g.V().has(_p0, _p1).limit(_p2)")
+        self.assertEqual(bindings, {"_p0": "name", "_p1": "marko", "_p2": 2})
+        graph = GraphDatabase("ws://localhost:8182/",
+                              username="stephen",
+                              password="password",
+                              parameterize=True)
+        connection = yield graph.connect()
+        resp = connection.send("1 + 1")
+        msg = yield resp.read()
+        self.assertEqual(msg.data[0], 2)
+        connection = yield graph.connect()
+        resp = connection.send("1 + 2")
+        msg = yield resp.read()
+        self.assertEqual(msg.data[0], 3)
+        self.assertEqual(graph.parameterizer.distinct, 1)
+        self.assertEqual(graph.parameterizer.most_common(),
+                         [("_p0 + _p1", 2)])
+
 class TornadoPoolTest(AsyncTestCase):
 
     @gen_test
@@ -344,6 +492,85 @@ class TornadoPoolTest(AsyncTestCase):
         self.assertTrue(hasattr(pool, 'future_class'))
         self.assertEqual(pool.future_class, Future)
 
+    @gen_test
+    def test_submit_many(self):
+        pool = Pool("ws://localhost:8182/",
+                    maxsize=2,
+                    username="stephen",
+                    password="password")
+        results = yield pool.submit_many(
+            [("x * 2", {"x": i}) for i in range(100)])
+        self.assertEqual([r.data[0] for r in results],
+                         [i * 2 for i in range(100)])
+        self.assertEqual(pool.freesize, 1)
+        pool.close()
+
+    @gen_test
+    def test_submit_retry(self):
+        pool = Pool("ws://localhost:8182/",
+                    maxsize=2,
+                    username="stephen",
+                    password="password",
+                    retry_policy=RetryPolicy(retries=2, backoff=0.01))
+        messages = yield pool.submit("1 + 1", idempotent=True)
+        self.assertEqual(messages[0].data[0], 2)
+        self.assertEqual(pool.stats.retries, 0)
+        with self.assertRaises(ScriptEvaluationError):
+            yield pool.submit("throw new Exception('boom')", idempotent=True)
+        self.assertEqual(pool.stats.retries, 0)
+        pool.close()
+        pool = Pool("ws://localhost:8183/",
+                    retry_policy=RetryPolicy(retries=2, backoff=0.01))
+        with self.assertRaises(GremlinConnectionError):
+            yield pool.submit("1 + 1")
+        self.assertEqual(pool.stats.retries, 2)
+        self.assertEqual(pool.stats.retry_failures, 1)
+        pool.close()
+
+    @gen_test
+    def test_stats(self):
+        pool = Pool("ws://localhost:8182/",
+                    maxsize=2,
+                    username="stephen",
+                    password="password")
+        events = []
+        pool.add_listener(lambda p, event, value: events.append(event))
+        c1 = yield pool.acquire()
+        yield pool.release(c1)
+        c2 = yield pool.acquire()
+        yield pool.release(c2)
+        stats = pool.stats
+        self.assertEqual(stats.acquired, 2)
+        self.assertEqual(stats.created, 1)
+        self.assertEqual(stats.opened, 1)
+        self.assertEqual(stats.reuse_ratio, 0.5)
+        self.assertEqual(stats.acquire_wait.count, 2)
+        self.assertEqual(stats.time_in_use.count, 2)
+        self.assertEqual(stats.as_dict()["waiters"], 0)
+        self.assertEqual(events, ["connect", "acquire", "release",
+                                  "acquire", "release"])
+        pool.close()
+
+    @gen_test
+    def test_multiplex_acquire(self):
+        pool = Pool("ws://localhost:8182/",
+                    maxsize=2,
+                    username="stephen",
+                    password="password",
+                    multiplex=True,
+                    max_inflight=2)
+        c1 = yield pool.acquire()
+        c2 = yield pool.acquire()
+        c3 = yield pool.acquire()
+        self.assertEqual(c1, c2)
+        self.assertNotEqual(c1, c3)
+        self.assertEqual(pool.size, 2)
+        yield pool.release(c1)
+        self.assertEqual(len(pool.pool), 0)
+        yield pool.release(c2)
+        self.assertEqual(len(pool.pool), 1)
+        c3.close()
+
 
 # class TornadoCtxtMngrTest(AsyncTestCase):
     #
@@ -387,6 +614,337 @@ class TornadoPoolTest(AsyncTestCase):
     #             self.assertFalse(conn.closed)
 
 
+class TornadoFakeServerPoolTest(AsyncTestCase):
+
+    def setUp(self):
+        super(TornadoFakeServerPoolTest, self).setUp()
+        self.server = FakeGremlinServer(username="stephen",
+                                        password="password")
+        self.server.script("1", 1)
+        self.http_server = listen(self.server)
+
+    def tearDown(self):
+        self.http_server.stop()
+        super(TornadoFakeServerPoolTest, self).tearDown()
+
+    @gen_test
+    def test_warm(self):
+        pool = Pool(self.server.url,
+                    maxsize=4,
+                    minsize=2,
+                    username="stephen",
+                    password="password")
+        yield pool.warm()
+        self.assertEqual(pool.freesize, 2)
+        c1 = yield pool.acquire()
+        # the idle connection is replaced in the background
+        yield gen.sleep(0.5)
+        self.assertEqual(pool.freesize, 2)
+        self.assertEqual(pool.size, 3)
+        c2 = yield pool.acquire()
+        # both reused a connection opened in advance
+        self.assertEqual(pool.stats.opened, 0)
+        self.assertEqual(pool.stats.reuse_ratio, 1.0)
+        yield pool.release(c1)
+        yield pool.release(c2)
+        pool.close()
+
+    @gen_test
+    def test_ping_idle(self):
+        pool = Pool(self.server.url,
+                    maxsize=2,
+                    username="stephen",
+                    password="password",
+                    ping_after=0)
+        c1 = yield pool.acquire()
+        messages = yield c1.ping()
+        self.assertEqual(messages[-1].status_code, 200)
+        yield pool.release(c1)
+        c2 = yield pool.acquire()
+        self.assertIs(c1, c2)
+        # a dead idle connection is replaced
+        yield pool.release(c2)
+        c2.conn.close()
+        c3 = yield pool.acquire()
+        self.assertIsNot(c2, c3)
+        self.assertFalse(c3.closed)
+        yield pool.release(c3)
+        pool.close()
+
+    @gen_test
+    def test_acquire_timeout(self):
+        pool = Pool(self.server.url,
+                    maxsize=1,
+                    username="stephen",
+                    password="password",
+                    max_waiters=2)
+        c1 = yield pool.acquire()
+        waiter = pool.acquire(timeout=0.1)
+        low = pool.acquire(priority=1)
+        with self.assertRaises(PoolExhaustedError):
+            yield pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            yield waiter
+        high = pool.acquire(priority=0)
+        yield pool.release(c1)
+        c2 = yield high
+        self.assertIs(c1, c2)
+        self.assertFalse(low.done())
+        yield pool.release(c2)
+        c3 = yield low
+        yield pool.release(c3)
+        pool.close()
+
+    @gen_test
+    def test_max_lifetime(self):
+        pool = Pool(self.server.url,
+                    maxsize=2,
+                    username="stephen",
+                    password="password",
+                    max_lifetime=0)
+        c1 = yield pool.acquire()
+        yield pool.release(c1)
+        self.assertTrue(c1.closed)
+        self.assertEqual(pool.size, 0)
+        pool.close()
+
+    @gen_test
+    def test_abandoned_waiters(self):
+        pool = Pool(self.server.url,
+                    maxsize=1,
+                    username="stephen",
+                    password="password",
+                    max_waiters=2)
+        c1 = yield pool.acquire()
+        for i in range(2):
+            # the caller gives up, e.g. on its own timeout
+            waiter = pool.acquire(timeout=10)
+            waiter.set_exception(gen.TimeoutError())
+        self.assertEqual(pool.outstanding, 1)
+        waiter = pool.acquire()
+        yield pool.release(c1)
+        c2 = yield waiter
+        self.assertIs(c1, c2)
+        yield pool.release(c2)
+        pool.close()
+
+    @gen_test
+    def test_release_dead_shared(self):
+        pool = Pool(self.server.url,
+                    maxsize=1,
+                    username="stephen",
+                    password="password",
+                    multiplex=True,
+                    max_inflight=3)
+        conns = []
+        for i in range(3):
+            conn = yield pool.acquire()
+            conns.append(conn)
+        self.assertEqual(len(set(conns)), 1)
+        waiter = pool.acquire()
+        conns[0].conn.close()
+        for conn in conns:
+            yield pool.release(conn)
+        c2 = yield waiter
+        self.assertIsNot(c2, conns[0])
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(pool.stats.discarded, 1)
+        self.assertEqual(pool.outstanding, 1)
+        yield pool.release(c2)
+        self.assertEqual(pool.freesize, 1)
+        pool.close()
+
+
+class TornadoBulkLoaderTest(AsyncTestCase):
+
+    def setUp(self):
+        super(TornadoBulkLoaderTest, self).setUp()
+        self.server = FakeGremlinServer()
+        self.server.script(BULK_SCRIPT, lambda b: len(b["_items"]))
+        self.server.script("drop", drop=True)
+        self.http_server = listen(self.server)
+        self.pool = Pool(self.server.url, maxsize=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.http_server.stop()
+        super(TornadoBulkLoaderTest, self).tearDown()
+
+    def items(self, n):
+        return ({"label": "bulk", "properties": {"n": i}} for i in range(n))
+
+    @gen_test
+    def test_load(self):
+        progress = []
+        loader = BulkLoader(self.pool, chunk_size=10, concurrency=2,
+                            progress=lambda stats: progress.append(
+                                stats.items))
+        stats = yield loader.load(self.items(45))
+        self.assertEqual(stats.items, 45)
+        self.assertEqual(stats.chunks, 5)
+        self.assertEqual(stats.failed, 0)
+        self.assertEqual(sorted(progress)[-1], 45)
+        self.assertTrue(stats.rate > 0)
+        sizes = [len(r["args"]["bindings"]["_items"])
+                 for r in self.server.requests]
+        self.assertEqual(sorted(sizes), [5, 10, 10, 10, 10])
+
+    @gen_test
+    def test_no_retry(self):
+        # script errors are final, lost chunks may already be loaded
+        for script in ("boom", "drop"):
+            loader = BulkLoader(self.pool, chunk_size=10, script=script,
+                                retry_delay=0.01)
+            stats = yield loader.load(self.items(15))
+            self.assertEqual(stats.retries, 0)
+            self.assertEqual(stats.failed, 15)
+            self.assertEqual(len(stats.errors), 2)
+        self.assertIsInstance(stats.errors[0], GremlinConnectionError)
+
+    @gen_test
+    def test_retry_idempotent(self):
+        loader = BulkLoader(self.pool, chunk_size=10, script="drop",
+                            retries=2, retry_delay=0.01, idempotent=True)
+        stats = yield loader.load(self.items(5))
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.failed, 5)
+        self.assertEqual(self.pool.size, 0)
+
+    @gen_test
+    def test_progress_error(self):
+        def progress(stats):
+            raise ValueError("progress")
+        loader = BulkLoader(self.pool, chunk_size=10, progress=progress)
+        with self.assertRaises(ValueError):
+            yield loader.load(self.items(45))
+
+
+class TornadoSingleFlightTest(AsyncTestCase):
+
+    def setUp(self):
+        super(TornadoSingleFlightTest, self).setUp()
+        self.server = FakeGremlinServer(latency=0.05)
+        self.server.script("x + x", lambda bindings: bindings["x"] * 2)
+        self.http_server = listen(self.server)
+
+    def tearDown(self):
+        self.http_server.stop()
+        super(TornadoSingleFlightTest, self).tearDown()
+
+    @gen_test
+    def test_coalesce(self):
+        pool = Pool(self.server.url, maxsize=4)
+        flight = SingleFlight()
+        streams = []
+        for i in range(5):
+            stream = yield flight.submit(pool, "x + x", bindings={"x": 2})
+            streams.append(stream)
+        self.assertEqual(len(flight), 1)
+        results = []
+        for stream in streams:
+            messages = yield stream.read_all()
+            results.append(messages)
+        self.assertEqual(results[0][0].data[0], 4)
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(len(flight), 0)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(pool.size, 1)
+        pool.close()
+
+    @gen_test
+    def test_sessions(self):
+        pool = Pool(self.server.url, maxsize=4)
+        flight = SingleFlight()
+        streams = []
+        for session in (str(uuid.uuid4()), str(uuid.uuid4())):
+            stream = yield flight.submit(pool, "x + x", bindings={"x": 2},
+                                         session=session)
+            streams.append(stream)
+        self.assertEqual(len(flight), 2)
+        for stream in streams:
+            messages = yield stream.read_all()
+            self.assertEqual(messages[0].data[0], 4)
+        self.assertEqual(len(self.server.requests), 2)
+        pool.close()
+
+    @gen_test
+    def test_session_object(self):
+        graph = GraphDatabase(self.server.url)
+        session = yield graph.session()
+        flight = SingleFlight()
+        stream = flight.send(session, "x + x", bindings={"x": 2})
+        messages = yield stream.read_all()
+        self.assertEqual(messages[0].data[0], 4)
+        request = self.server.requests[0]
+        self.assertEqual(request["processor"], "session")
+        self.assertEqual(request["args"]["session"], session._session)
+        session.close()
+
+    @gen_test
+    def test_pools(self):
+        other = FakeGremlinServer(latency=0.05)
+        other.script("x + x", lambda bindings: bindings["x"] * 2)
+        http_server = listen(other)
+        pools = [Pool(self.server.url), Pool(other.url)]
+        flight = SingleFlight()
+        streams = []
+        for pool in pools:
+            stream = yield flight.submit(pool, "x + x", bindings={"x": 2})
+            streams.append(stream)
+        self.assertEqual(len(flight), 2)
+        for stream in streams:
+            messages = yield stream.read_all()
+            self.assertEqual(messages[0].data[0], 4)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(len(other.requests), 1)
+        for pool in pools:
+            pool.close()
+        http_server.stop()
+
+
+class TornadoClusterPoolTest(AsyncTestCase):
+
+    def setUp(self):
+        super(TornadoClusterPoolTest, self).setUp()
+        self.server = FakeGremlinServer(username="stephen",
+                                        password="password")
+        self.server.script("1 + 1", 2)
+        self.http_server = listen(self.server)
+        # a port nothing listens on
+        sock, port = bind_unused_port()
+        sock.close()
+        self.down_url = "ws://127.0.0.1:{}/".format(port)
+
+    def tearDown(self):
+        self.http_server.stop()
+        super(TornadoClusterPoolTest, self).tearDown()
+
+    @gen_test
+    def test_failover(self):
+        pool = ClusterPool([self.down_url, self.server.url],
+                           username="stephen",
+                           password="password",
+                           maxsize=2)
+        for i in range(2):
+            conn = yield pool.acquire()
+            stream = conn.send("1 + 1")
+            messages = yield stream.read_all()
+            self.assertEqual(messages[0].data[0], 2)
+            yield pool.release(conn)
+        stats = pool.stats()
+        self.assertFalse(stats[self.down_url]["up"])
+        self.assertTrue(stats[self.server.url]["up"])
+        self.assertIsNotNone(stats[self.server.url]["latency"])
+        pool.close()
+
+    @gen_test
+    def test_no_host_available(self):
+        pool = ClusterPool([self.down_url])
+        with self.assertRaises(NoHostAvailableError):
+            yield pool.acquire()
+        pool.close()
+
+
 class TornadoCallbackStyleTest(AsyncTestCase):
 
     def setUp(self):
@@ -483,6 +1041,123 @@ class TornadoAPITests(AsyncTestCase):
             yield stream.read()
 
 
+class TornadoFakeServerTest(AsyncTestCase):
+
+    def setUp(self):
+        super(TornadoFakeServerTest, self).setUp()
+        self.server = FakeGremlinServer(frame_size=2, username="stephen",
+                                        password="password")
+        self.server.script("1..3", [1, 2, 3])
+        self.http_server = listen(self.server)
+
+    def tearDown(self):
+        self.http_server.stop()
+        super(TornadoFakeServerTest, self).tearDown()
+
+    @gen_test
+    def test_submit(self):
+        pool = Pool(self.server.url, username="stephen",
+                    password="password", multiplex=True)
+        messages = yield pool.submit("1..3")
+        self.assertEqual([m.data for m in messages], [[1, 2], [3]])
+        self.assertEqual(self.server.requests[1]["op"], "authentication")
+        pool.close()
+
+    @gen_test
+    def test_submit_reuses_connection(self):
+        for i in range(3):
+            stream = yield submit(self.server.url, "1..3",
+                                  username="stephen", password="password")
+            messages = yield stream.read_all()
+            self.assertEqual(messages[-1].data, [3])
+        # one SASL handshake: the connection went back to the default pool
+        ops = [r["op"] for r in self.server.requests]
+        self.assertEqual(ops.count("authentication"), 1)
+        (pool,) = [p for k, p in _default_pools.pools()]
+        self.assertEqual(pool.freesize, 1)
+        close_default_pools()
+        self.assertTrue(pool.closed)
+        self.assertEqual(_default_pools.pools(), [])
+
+    @gen_test
+    def test_submit_retry_lost_connection(self):
+        self.server.script("drop", drop=True)
+        for force_release in (False, True):
+            pool = Pool(self.server.url, username="stephen",
+                        password="password", maxsize=1,
+                        force_release=force_release,
+                        retry_policy=RetryPolicy(retries=2, backoff=0.01))
+            with self.assertRaises(GremlinConnectionError):
+                yield pool.submit("drop", idempotent=True)
+            self.assertEqual(pool.stats.retries, 2)
+            self.assertEqual(pool.stats.retry_failures, 1)
+            # every attempt gave its slot back
+            self.assertEqual(pool.size, 0)
+            messages = yield pool.submit("1..3", timeout=1)
+            self.assertEqual(messages[-1].data, [3])
+            pool.close()
+
+    @gen_test
+    def test_submit_lost_connection(self):
+        self.server.script("drop", drop=True)
+        for i in range(3):
+            stream = yield submit(self.server.url, "drop",
+                                  username="stephen", password="password")
+            with self.assertRaises(GremlinConnectionError):
+                yield stream.read_all()
+        # the broken connections were dropped, not kept checked out
+        (pool,) = [p for k, p in _default_pools.pools()]
+        self.assertEqual(pool.size, 0)
+        stream = yield submit(self.server.url, "1..3",
+                              username="stephen", password="password")
+        messages = yield stream.read_all()
+        self.assertEqual(messages[-1].data, [3])
+        self.assertEqual(pool.size, 1)
+        close_default_pools()
+
+    @gen_test
+    def test_close_stream(self):
+        stream = yield submit(self.server.url, "1..3",
+                              username="stephen", password="password")
+        message = yield stream.read()
+        self.assertEqual(message.data, [1, 2])
+        stream.close()
+        with self.assertRaises(GremlinConnectionError):
+            yield stream.read()
+        # the connection went back and was dropped, frames were pending
+        (pool,) = [p for k, p in _default_pools.pools()]
+        self.assertEqual(pool.size, 0)
+        self.assertEqual(pool.stats.discarded, 1)
+        close_default_pools()
+
+    @gen_test
+    def test_submit_acquire_timeout(self):
+        pool = Pool(self.server.url, username="stephen",
+                    password="password", maxsize=1, force_release=True)
+        stream = yield _submit(pool, "1..3", acquire_timeout=0.05)
+        # the unread stream holds the only connection
+        with self.assertRaises(PoolTimeoutError):
+            yield _submit(pool, "1..3", acquire_timeout=0.05)
+        stream.close()
+        stream = yield _submit(pool, "1..3", acquire_timeout=0.05)
+        messages = yield stream.read_all()
+        self.assertEqual(messages[-1].data, [3])
+        pool.close()
+
+    def test_default_pools_closed_loop(self):
+        pools = _DefaultPools()
+        loop = IOLoop()
+        pools.get(loop, "key", lambda: Pool(self.server.url, loop=loop))
+        self.assertEqual(len(pools.pools()), 1)
+        loop.close()
+        pools.get(self.io_loop, "key",
+                  lambda: Pool(self.server.url, loop=self.io_loop))
+        # the closed loop's pool was forgotten
+        self.assertEqual(len(pools.pools()), 1)
+        for key, pool in pools.pop_all():
+            pool.close()
+
+
 # class TestDeserialization(AsyncTestCase):
 #
 #     @gen_test
@@ -110,6 +110,19 @@ class TornadoFactoryConnectTest(unittest.TestCase):
 
         self.loop.run_sync(go)
 
+    def test_async_for(self):
+
+        async def go():
+            connection = await self.graph.connect()
+            resp = connection.send("1..100")
+            items = []
+            async for item in resp:
+                items.append(item)
+            self.assertEqual(items, list(range(1, 101)))
+            connection.conn.close()
+
+        self.loop.run_sync(go)
+
     def test_handler(self):
 
         async def go():